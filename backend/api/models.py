@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel
 
@@ -72,6 +72,17 @@ class StrategyBacktestRequest(BaseModel):
     ma_window: int = 12
 
 
+class SweepRange(BaseModel):
+    start: float
+    stop: float
+    step: float
+
+
+class StrategySweepRequest(StrategyBacktestRequest):
+    # Parameter name -> explicit values or an inclusive start/stop/step range.
+    sweep: Dict[str, Union[List[float], SweepRange]]
+
+
 class CurrentRecommendationRequest(BaseModel):
     fund_codes: List[str]
     fund_fees: Dict[str, float] = {}
@@ -3,20 +3,32 @@ from datetime import date
 
 import numpy as np
 import pandas as pd
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
 from api.models import (
     AnalysisRequest,
     CurrentRecommendationRequest,
     StrategyBacktestRequest,
+    StrategySweepRequest,
+    SweepRange,
 )
 from core.backtest import (
+    SCENARIO_PARAMETERS,
     backtest_dca,
     backtest_kelly_dca,
     backtest_lump_sum,
+    scenario_frame,
     simulate_strategy_frontier,
 )
-from core.data import ensure_risk_free_column, get_fund_data, prepare_nav_for_analysis
+from core.data import (
+    ensure_risk_free_column,
+    get_fund_data_async,
+    get_fund_search_index,
+    get_nav_validation,
+    get_upstream_metrics,
+    prepare_nav_for_analysis,
+)
+from core.derived import get_reference_portfolio_nav
 from core.frontier import (
     append_frontier_stability_warnings,
     calculate_efficient_frontier,
@@ -34,10 +46,41 @@ from core.strategy import (
     infer_valuation_signal,
     validate_strategy_params,
 )
+from core.sweep import expand_sweep_grid, get_sweep_pool, sweep_table
 
 router = APIRouter()
 
 
+@router.get("/funds/search")
+def search_funds(
+    q: str = Query(..., min_length=1, max_length=32),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Look up funds by code prefix, name substring or pinyin initials."""
+    try:
+        index = get_fund_search_index()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to initialize fund list cache: {e}"
+        )
+    return {"query": q, "results": index.search(q, limit=limit)}
+
+
+@router.get("/funds/{code}/nav-quality")
+def fund_nav_quality(code: str):
+    """Validity mask summary and anomaly report computed at ingest."""
+    validation = get_nav_validation(code)
+    if validation is None:
+        raise HTTPException(status_code=404, detail=f"基金 {code} 尚无本地净值数据。")
+    return {"code": code, **validation.to_dict()}
+
+
+@router.get("/upstream/metrics")
+def upstream_metrics():
+    """Per-host pacing, queue depth and error counters of upstream calls."""
+    return get_upstream_metrics()
+
+
 @router.post("/analyze")
 async def analyze_portfolio(request: AnalysisRequest):
     if not request.fund_codes and request.risk_free_rate is None:
@@ -60,7 +103,7 @@ async def analyze_portfolio(request: AnalysisRequest):
             allow_auto_bounds=True,
         )
 
-        fund_df, fund_names, warnings = get_fund_data(
+        fund_df, fund_names, warnings = await get_fund_data_async(
             request.fund_codes,
             request.start_date,
             request.end_date,
@@ -178,7 +221,7 @@ async def get_current_recommendation(request: CurrentRecommendationRequest):
             end_date_obj.year - 2, end_date_obj.month, end_date_obj.day
         )
 
-        fund_df, fund_names, _ = get_fund_data(
+        fund_df, fund_names, _ = await get_fund_data_async(
             request.fund_codes,
             start_date_obj,
             end_date_obj,
@@ -202,8 +245,8 @@ async def get_current_recommendation(request: CurrentRecommendationRequest):
 
         # Kelly/VA strategy treats cash as the risk-free sleeve outside the risky basket.
         if has_risky_assets:
-            reference_portfolio_nav = adjusted_fund_df[risky_weights.index].dot(
-                risky_weights
+            reference_portfolio_nav = get_reference_portfolio_nav(
+                adjusted_fund_df, risky_weights
             )
         else:
             reference_portfolio_nav = pd.Series(1.0, index=fund_df.index, dtype=float)
@@ -548,6 +591,27 @@ async def get_current_recommendation(request: CurrentRecommendationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _strategy_nav_panel(request: StrategyBacktestRequest) -> pd.DataFrame:
+    """Fee-adjusted NAV panel (with RiskFree where needed) a strategy runs on."""
+    fund_df, _, _ = await get_fund_data_async(
+        request.fund_codes,
+        request.start_date,
+        request.end_date,
+        request.risk_free_rate,
+    )
+    fund_df, _ = ensure_risk_free_column(
+        fund_df,
+        {},
+        weights_dict=request.weights,
+        holdings_dict=request.initial_holdings,
+    )
+    return prepare_nav_for_analysis(
+        fund_df,
+        request.fund_fees,
+        apply_fund_fees_to_history=request.apply_fund_fees_to_history,
+    )
+
+
 @router.post("/backtest_strategies")
 async def run_strategy_backtests(request: StrategyBacktestRequest):
     try:
@@ -565,26 +629,9 @@ async def run_strategy_backtests(request: StrategyBacktestRequest):
             max_drawdown_limit=request.max_drawdown_limit,
         )
 
-        fund_df, _, _ = get_fund_data(
-            request.fund_codes,
-            request.start_date,
-            request.end_date,
-            request.risk_free_rate,
-        )
-        fund_df, _ = ensure_risk_free_column(
-            fund_df,
-            {},
-            weights_dict=request.weights,
-            holdings_dict=request.initial_holdings,
-        )
-
-        nav_adjusted = prepare_nav_for_analysis(
-            fund_df,
-            request.fund_fees,
-            apply_fund_fees_to_history=request.apply_fund_fees_to_history,
-        )
+        nav_adjusted = await _strategy_nav_panel(request)
 
-        num_months = len(fund_df)
+        num_months = len(nav_adjusted)
         total_lump_sum_investment = request.monthly_investment * num_months
         lump_sum_results = backtest_lump_sum(
             nav_adjusted,
@@ -637,3 +684,63 @@ async def run_strategy_backtests(request: StrategyBacktestRequest):
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/sweep")
+async def run_strategy_sweep(request: StrategySweepRequest):
+    """Value-averaging backtest over a grid of strategy parameters.
+
+    The panel is fetched once; the grid runs in batched chunks on the sweep
+    process pool. Returns one row of summary metrics per combination.
+    """
+    try:
+        options = dict(
+            strategy_mode=request.strategy_mode,
+            estimation_window=request.estimation_window,
+            minimum_cash_reserve=request.minimum_cash_reserve,
+            enable_cvar_constraint=request.enable_cvar_constraint,
+            cvar_confidence=request.cvar_confidence,
+            cvar_limit=request.cvar_limit,
+            enable_drawdown_constraint=request.enable_drawdown_constraint,
+            max_drawdown_limit=request.max_drawdown_limit,
+        )
+        base = {name: getattr(request, name) for name in SCENARIO_PARAMETERS}
+        names, scenarios = expand_sweep_grid(
+            {
+                name: spec.model_dump() if isinstance(spec, SweepRange) else spec
+                for name, spec in request.sweep.items()
+            },
+            base,
+        )
+        # Reject bad combinations before fetching anything.
+        scenario_frame(scenarios, **options)
+
+        nav_adjusted = await _strategy_nav_panel(request)
+        # Weight errors must surface here: raised in a worker they would
+        # come back as a generic failure instead of a 400.
+        decompose_selected_weights(request.weights, list(nav_adjusted.columns))
+        rows = await get_sweep_pool().run_async(
+            nav_adjusted,
+            request.weights,
+            request.monthly_investment,
+            scenarios,
+            initial_holdings=request.initial_holdings,
+            max_buy_multiplier=request.max_buy_multiplier,
+            buy_fee=request.buy_fee,
+            sell_fee=request.sell_fee,
+            risk_free_rate=request.risk_free_rate or 0.0,
+            initial_cash=request.initial_cash,
+            **options,
+        )
+
+        return {
+            "strategy_mode": request.strategy_mode,
+            "combinations": len(rows),
+            "total_invested": rows[0]["total_invested"] if rows else 0.0,
+            **sweep_table(names, rows),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,217 @@
+"""Value-averaging backtest: array kernel against the pandas reference.
+
+    python -m benchmarks.backtest_kernel                      # 20y x 30 funds
+    python -m benchmarks.backtest_kernel --panels 5 --funds 50
+    python -m benchmarks.backtest_kernel --skip-reference     # kernel only
+    python -m benchmarks.backtest_kernel --panels 0 --scenarios 500
+    python -m benchmarks.backtest_kernel --panels 0 --scenarios 0 --resume-months 1
+
+Each synthetic panel is run through ``backtest_kelly_dca`` (best of
+``--repeat``) and once through ``backtest_kelly_dca_reference``; the two
+results must be identical. ``--scenarios`` random parameter sets then go
+through ``backtest_kelly_dca_batch`` in one pass, timed against single
+kernel runs of a sample of them (extrapolated), whose metrics must agree.
+Finally the last ``--resume-months`` are appended with ``resume_kelly_dca``
+and timed against a full rerun, whose state and metrics must be identical.
+Exits 1 on any mismatch.
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from core.backtest import (
+    backtest_kelly_dca,
+    backtest_kelly_dca_batch,
+    backtest_kelly_dca_reference,
+    resume_kelly_dca,
+)
+
+STRATEGY_MODES = ("legacy_linear", "optimized_kelly")
+
+
+def synthetic_panel(funds: int, years: int, seed: int = 0) -> pd.DataFrame:
+    """Month-end NAVs of correlated random-walk funds plus a RiskFree column."""
+    rng = np.random.default_rng(seed)
+    months = years * 12
+    market = rng.normal(0.005, 0.045, months)
+    returns = market[:, None] * rng.uniform(0.5, 1.5, funds) + rng.normal(
+        0.0, 0.03, (months, funds)
+    )
+    dates = pd.date_range(end="2025-12-31", periods=months, freq="ME")
+    panel = pd.DataFrame(
+        np.cumprod(1 + returns, axis=0),
+        index=dates,
+        columns=[f"{i:06d}" for i in range(funds)],
+    )
+    panel["RiskFree"] = np.cumprod(np.full(months, 1 + 0.02 / 12))
+    return panel
+
+
+def _weights(panel: pd.DataFrame) -> Dict[str, float]:
+    funds = [code for code in panel.columns if code != "RiskFree"]
+    weights = {code: 0.7 / len(funds) for code in funds}
+    weights["RiskFree"] = 0.3
+    return weights
+
+
+def _best_time(run: Callable[[], dict], repeat: int):
+    best, result = float("inf"), None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def random_scenarios(count: int, seed: int = 0) -> List[Dict[str, float]]:
+    rng = np.random.default_rng(seed)
+    scenarios = []
+    for _ in range(count):
+        min_weight = float(rng.uniform(0.0, 0.6))
+        scenarios.append(
+            {
+                "kelly_fraction": float(rng.uniform(0.1, 1.0)),
+                "min_weight": min_weight,
+                "max_weight": float(rng.uniform(min_weight, 1.0)),
+                "ma_window": int(rng.integers(3, 25)),
+                "sell_threshold": float(rng.uniform(0.0, 0.1)),
+            }
+        )
+    return scenarios
+
+
+def _batch_mismatch(batch_row: dict, single: dict) -> bool:
+    return any(
+        abs(batch_row[key] - single[key]) > 1e-9 * max(1.0, abs(single[key]))
+        for key in ("final_value", "final_unit_nav", "max_drawdown")
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Time the array backtest kernel against the pandas reference."
+    )
+    parser.add_argument("--panels", type=int, default=3)
+    parser.add_argument("--funds", type=int, default=30)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--skip-reference",
+        action="store_true",
+        help="only time the kernel (the reference takes minutes per panel)",
+    )
+    parser.add_argument(
+        "--scenarios",
+        type=int,
+        default=500,
+        help="parameter sets for the batched pass (0 skips it)",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=10,
+        help="scenarios also run one by one to extrapolate the sequential time",
+    )
+    parser.add_argument(
+        "--resume-months",
+        type=int,
+        default=1,
+        help="months appended to a saved state in the resume pass (0 skips it)",
+    )
+    args = parser.parse_args(argv)
+
+    print(f"{args.funds} funds x {args.years * 12} months")
+    if args.panels > 0:
+        print(
+            f"{'mode':<15}{'panel':>6}{'kernel s':>11}{'reference s':>13}{'speedup':>9}"
+        )
+    mismatches = 0
+    for mode in STRATEGY_MODES:
+        for seed in range(args.panels):
+            panel = synthetic_panel(args.funds, args.years, seed)
+            weights = _weights(panel)
+
+            def run(backtest):
+                return backtest(panel, weights, 1000.0, strategy_mode=mode)
+
+            kernel_s, kernel_result = _best_time(
+                lambda: run(backtest_kelly_dca), args.repeat
+            )
+            if args.skip_reference:
+                print(f"{mode:<15}{seed:>6}{kernel_s:>11.3f}")
+                continue
+            reference_s, reference_result = _best_time(
+                lambda: run(backtest_kelly_dca_reference), 1
+            )
+            if kernel_result != reference_result:
+                mismatches += 1
+            print(
+                f"{mode:<15}{seed:>6}{kernel_s:>11.3f}{reference_s:>13.3f}"
+                f"{reference_s / kernel_s:>8.0f}x"
+            )
+
+    if args.scenarios > 0:
+        panel = synthetic_panel(args.funds, args.years)
+        weights = _weights(panel)
+        scenarios = random_scenarios(args.scenarios)
+        sample = scenarios[: max(1, min(args.sample, len(scenarios)))]
+        print(f"{'batched':<15}{'scenarios':>10}{'batch s':>10}{'sequential s':>14}")
+        for mode in STRATEGY_MODES:
+            batch_s, rows = _best_time(
+                lambda: backtest_kelly_dca_batch(
+                    panel, weights, 1000.0, scenarios, strategy_mode=mode
+                ),
+                1,
+            )
+            started = time.perf_counter()
+            for params, row in zip(sample, rows):
+                single = backtest_kelly_dca(
+                    panel, weights, 1000.0, strategy_mode=mode, **params
+                )
+                mismatches += _batch_mismatch(row, single)
+            sequential_s = (
+                (time.perf_counter() - started) * len(scenarios) / len(sample)
+            )
+            print(
+                f"{mode:<15}{len(scenarios):>10}{batch_s:>10.3f}"
+                f"{sequential_s:>14.1f}  ({sequential_s / batch_s:.0f}x)"
+            )
+
+    if args.resume_months > 0:
+        panel = synthetic_panel(args.funds, args.years)
+        weights = _weights(panel)
+        cut = len(panel) - args.resume_months
+        print(f"{'resume':<15}{'months':>10}{'resume s':>10}{'full rerun s':>14}")
+        for mode in STRATEGY_MODES:
+            state = backtest_kelly_dca(
+                panel.iloc[:cut], weights, 1000.0, strategy_mode=mode, return_state=True
+            )["state"]
+            resume_s, resumed = _best_time(
+                lambda: resume_kelly_dca(state, panel), args.repeat
+            )
+            full_s, full = _best_time(
+                lambda: backtest_kelly_dca(
+                    panel, weights, 1000.0, strategy_mode=mode, return_state=True
+                ),
+                args.repeat,
+            )
+            if resumed["state"] != full["state"]:
+                mismatches += 1
+            print(
+                f"{mode:<15}{args.resume_months:>10}{resume_s:>10.4f}"
+                f"{full_s:>14.3f}  ({full_s / resume_s:.0f}x)"
+            )
+
+    if mismatches:
+        print(f"FAIL: {mismatches} runs differ from their reference")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Cold-start import report for the API worker, with a regression budget.
+
+    python -m benchmarks.import_time                  # report and check budget
+    python -m benchmarks.import_time --budget-ms 900  # tighter budget
+
+Each run imports ``main`` in a fresh interpreter under ``-X importtime``; the
+fastest run is reported. Exits 1 when the import exceeds the budget or when
+a module that must stay lazy (akshare, SciPy) is imported at startup.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+IMPORT_TIME_BUDGET_MS = 1200
+# Only the code paths that call upstream or optimize may import these.
+LAZY_MODULES = ("akshare", "py_mini_racer", "scipy")
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ImportProfile:
+    """Per-module self and cumulative import times of one interpreter start."""
+
+    def __init__(self, rows: List[Dict[str, object]]):
+        self.rows = rows
+
+    @property
+    def total_ms(self) -> float:
+        return sum(row["self_us"] for row in self.rows) / 1000
+
+    @property
+    def modules(self) -> List[str]:
+        return [row["module"] for row in self.rows]
+
+    def lazy_violations(self) -> List[str]:
+        return sorted(
+            {
+                module.split(".")[0]
+                for module in self.modules
+                if module.split(".")[0] in LAZY_MODULES
+            }
+        )
+
+    def top(self, count: int, key: str = "cumulative_us", max_depth: int = 2):
+        rows = [row for row in self.rows if row["depth"] <= max_depth]
+        return sorted(rows, key=lambda row: row[key], reverse=True)[:count]
+
+
+def parse_importtime(stderr: str) -> ImportProfile:
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        stripped = name.lstrip()
+        rows.append(
+            {
+                "module": stripped,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                # importtime indents nested imports by two spaces per level.
+                "depth": (len(name) - len(stripped) - 1) // 2,
+            }
+        )
+    return ImportProfile(rows)
+
+
+def profile_import(module: str = "main") -> ImportProfile:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=_BACKEND_DIR,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Report API cold-start import time and enforce a budget."
+    )
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_TIME_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    profiles = [profile_import(args.module) for _ in range(max(1, args.runs))]
+    best = min(profiles, key=lambda profile: profile.total_ms)
+
+    print(f"{'module':<48}{'cumulative ms':>15}{'self ms':>10}")
+    for row in best.top(args.top):
+        name = "  " * row["depth"] + row["module"]
+        print(
+            f"{name:<48}{row['cumulative_us'] / 1000:>15.1f}"
+            f"{row['self_us'] / 1000:>10.1f}"
+        )
+    print(
+        f"import {args.module}: {best.total_ms:.0f} ms "
+        f"(best of {len(profiles)}, budget {args.budget_ms:.0f} ms)"
+    )
+
+    failed = False
+    violations = best.lazy_violations()
+    if violations:
+        print(f"FAIL: imported at startup but must stay lazy: {', '.join(violations)}")
+        failed = True
+    if best.total_ms > args.budget_ms:
+        print("FAIL: import time is over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
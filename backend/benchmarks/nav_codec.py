@@ -0,0 +1,221 @@
+"""On-disk size and cold-load time of the full NAV universe per format.
+
+    python -m benchmarks.nav_codec                    # the local NAV store
+    python -m benchmarks.nav_codec --synthetic 10000  # 10k synthetic funds
+
+Every format is written to a scratch directory, evicted from the page cache
+and then loaded back into per-fund NumPy arrays. Parquet is skipped when
+neither pyarrow nor fastparquet is installed.
+"""
+
+import argparse
+import os
+import struct
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.constants import NAV_STORE_PATH
+from core.nav_codec import decode_nav, encode_nav
+from core.nav_store import NavStore
+
+_ENTRY = struct.Struct("<6sI")  # fund code, blob length
+
+
+def synthetic_universe(funds: int, years: int, seed: int = 0) -> Dict[str, pd.Series]:
+    """Four-decimal random-walk NAVs on business days, like eastmoney data."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2025-12-31", periods=years * 252, name="净值日期")
+    universe = {}
+    for i in range(funds):
+        # Younger funds have shorter histories.
+        start = int(rng.integers(0, len(dates) - 20))
+        returns = rng.normal(0.0003, 0.012, len(dates) - start)
+        universe[f"{i:06d}"] = pd.Series(
+            np.round(np.cumprod(1 + returns), 4), index=dates[start:]
+        )
+    return universe
+
+
+def store_universe(path: str) -> Dict[str, pd.Series]:
+    store = NavStore(path)
+    universe = {}
+    for code in store.codes():
+        nav = store.load(code)
+        if nav is not None:
+            universe[code] = nav
+    return universe
+
+
+def _long_frame(universe: Dict[str, pd.Series]) -> pd.DataFrame:
+    return pd.concat(
+        [
+            pd.DataFrame({"code": code, "date": nav.index, "nav": nav.to_numpy()})
+            for code, nav in universe.items()
+        ],
+        ignore_index=True,
+    )
+
+
+def write_pack(universe: Dict[str, pd.Series], path: str) -> None:
+    with open(path, "wb") as f:
+        for code, nav in universe.items():
+            blob = encode_nav(nav)
+            f.write(_ENTRY.pack(code.encode(), len(blob)))
+            f.write(blob)
+
+
+def load_pack(path: str) -> Dict[str, tuple]:
+    with open(path, "rb") as f:
+        buffer = f.read()
+    universe = {}
+    offset = 0
+    while offset < len(buffer):
+        code, size = _ENTRY.unpack_from(buffer, offset)
+        offset += _ENTRY.size
+        universe[code.decode()] = decode_nav(buffer[offset : offset + size])
+        offset += size
+    return universe
+
+
+def _split_long_frame(frame: pd.DataFrame) -> Dict[str, tuple]:
+    codes = frame["code"].to_numpy()
+    dates = frame["date"].to_numpy(dtype="datetime64[D]")
+    navs = frame["nav"].to_numpy(dtype=np.float64)
+    bounds = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+    starts = np.concatenate([[0], bounds])
+    ends = np.concatenate([bounds, [len(codes)]])
+    return {codes[s]: (dates[s:e], navs[s:e]) for s, e in zip(starts, ends) if e > s}
+
+
+def write_csv(universe: Dict[str, pd.Series], path: str) -> None:
+    _long_frame(universe).to_csv(path, index=False, date_format="%Y-%m-%d")
+
+
+def load_csv(path: str) -> Dict[str, tuple]:
+    frame = pd.read_csv(path, dtype={"code": str}, parse_dates=["date"])
+    return _split_long_frame(frame)
+
+
+def parquet_engine() -> Optional[str]:
+    for engine in ("pyarrow", "fastparquet"):
+        try:
+            __import__(engine)
+        except ImportError:
+            continue
+        return engine
+    return None
+
+
+def write_parquet(universe: Dict[str, pd.Series], path: str) -> None:
+    _long_frame(universe).to_parquet(path, index=False, engine=parquet_engine())
+
+
+def load_parquet(path: str) -> Dict[str, tuple]:
+    return _split_long_frame(pd.read_parquet(path, engine=parquet_engine()))
+
+
+def load_store(path: str) -> Dict[str, tuple]:
+    store = NavStore(path)
+    universe = {}
+    for code in store.codes():
+        nav = store.load(code)
+        if nav is not None:
+            universe[code] = (nav.index.to_numpy(), nav.to_numpy())
+    return universe
+
+
+def write_store(universe: Dict[str, pd.Series], path: str) -> None:
+    store = NavStore(path)
+    checked_at = pd.Timestamp.now().to_pydatetime()
+    for code, nav in universe.items():
+        store.append(code, nav, checked_at=checked_at)
+
+
+def _evict(path: str) -> None:
+    """Drop ``path`` from the page cache so the next read hits the disk."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def _time_load(load: Callable[[str], Dict], path: str, repeat: int) -> tuple:
+    cold = []
+    for _ in range(repeat):
+        _evict(path)
+        started = time.perf_counter()
+        loaded = load(path)
+        cold.append(time.perf_counter() - started)
+    started = time.perf_counter()
+    load(path)
+    return min(cold), time.perf_counter() - started, len(loaded)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare NAV storage formats by size and cold-load time."
+    )
+    parser.add_argument("--store", default=NAV_STORE_PATH)
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        metavar="FUNDS",
+        help="benchmark a synthetic universe instead of the local store",
+    )
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--with-sqlite", action="store_true", help="also benchmark the NavStore file"
+    )
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        universe = synthetic_universe(args.synthetic, args.years)
+    elif os.path.exists(args.store):
+        universe = store_universe(args.store)
+    else:
+        print(f"No NAV store at {args.store}; pass --synthetic FUNDS.")
+        return 1
+    points = sum(len(nav) for nav in universe.values())
+    if not points:
+        print("The universe is empty.")
+        return 1
+    print(f"{len(universe)} funds, {points} daily NAVs")
+
+    formats = [("nav_codec", ".qnav", write_pack, load_pack)]
+    formats.append(("csv", ".csv", write_csv, load_csv))
+    if parquet_engine():
+        formats.append(("parquet", ".parquet", write_parquet, load_parquet))
+    else:
+        print("parquet: skipped (install pyarrow or fastparquet)")
+    if args.with_sqlite:
+        formats.append(("sqlite store", ".sqlite3", write_store, load_store))
+
+    print(
+        f"{'format':<14}{'size MB':>10}{'bytes/NAV':>11}{'cold load s':>13}"
+        f"{'warm load s':>13}"
+    )
+    with tempfile.TemporaryDirectory() as scratch:
+        for name, suffix, write, load in formats:
+            path = os.path.join(scratch, f"universe{suffix}")
+            write(universe, path)
+            size = os.path.getsize(path)
+            cold, warm, loaded = _time_load(load, path, args.repeat)
+            assert loaded == len(universe), f"{name} lost funds"
+            print(
+                f"{name:<14}{size / 1e6:>10.2f}{size / points:>11.2f}"
+                f"{cold:>13.3f}{warm:>13.3f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
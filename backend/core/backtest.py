@@ -1,8 +1,14 @@
-from typing import Dict
+from typing import Dict, List
 
 import numpy as np
 import pandas as pd
+from fastapi import HTTPException
 
+from core.backtest_kernel import (
+    RollingMean,
+    simulate_kelly_dca,
+    simulate_kelly_dca_batch,
+)
 from core.constants import (
     DEFAULT_CVAR_CONFIDENCE,
     DEFAULT_CVAR_LIMIT,
@@ -11,12 +17,13 @@ from core.constants import (
     DEFAULT_MAX_DRAWDOWN_LIMIT,
     DEFAULT_STRATEGY_MODE,
 )
+from core.derived import get_reference_portfolio_nav
 from core.portfolio import (
     decompose_selected_weights,
     normalize_weights,
     validate_weight_universe,
 )
-from core.risk import calculate_max_drawdown
+from core.risk import calculate_max_drawdown, calculate_max_drawdown_values
 from core.strategy import (
     calculate_target_ratio,
     calculate_target_ratio_optimized,
@@ -24,68 +31,85 @@ from core.strategy import (
     validate_strategy_params,
 )
 
+KELLY_DCA_STATE_VERSION = 1  # bump when the resumable state layout changes
+
+# Per-scenario parameters of ``backtest_kelly_dca_batch`` and their defaults,
+# the same as ``backtest_kelly_dca``'s.
+SCENARIO_PARAMETERS = {
+    "kelly_fraction": DEFAULT_KELLY_FRACTION,
+    "min_weight": 0.3,
+    "max_weight": 0.8,
+    "ma_window": 12,
+    "sell_threshold": 0.05,
+}
+
+
+def _annualized_return(index, growth: float) -> float:
+    """CAGR of a total ``growth`` multiple over the span of ``index``."""
+    days = (index[-1] - index[0]).days
+    years = days / 365.25 if days > 0 else 0
+    if years <= 0:
+        return 0.0
+    if growth > 0:
+        return growth ** (1 / years) - 1
+    return -1.0  # Lost everything
+
+
+def _month_labels(index) -> List[str]:
+    """``index.strftime("%Y-%m")`` without per-timestamp formatting."""
+    return np.datetime_as_string(
+        index.to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+    ).tolist()
+
+
+def _attribution(months, columns, asset_values: np.ndarray, cash_balance) -> Dict:
+    """Per-month ``{asset: value, "RiskFree", "Cash"}`` records of a baseline."""
+    idle = {} if "RiskFree" in columns else {"RiskFree": cash_balance}
+    return {
+        month: {**dict(zip(columns, row)), **idle, "Cash": cash_balance}
+        for month, row in zip(months, asset_values.tolist())
+    }
+
 
 def backtest_lump_sum(
     df_nav, weights_dict, total_investment, initial_holdings=None, initial_cash=0.0
 ):
     if initial_holdings is None:
         initial_holdings = {}
-    validate_weight_universe(weights_dict, list(df_nav.columns))
-    weights = normalize_weights(weights_dict, list(df_nav.columns))
-    initial_nav = df_nav.iloc[0]
-
-    # Calculate initial shares from both new investment and existing holdings
-    initial_shares = pd.Series(0.0, index=df_nav.columns)
+    columns = list(df_nav.columns)
+    validate_weight_universe(weights_dict, columns)
+    weights = normalize_weights(weights_dict, columns).to_numpy()
+    nav = df_nav.to_numpy(dtype=float)
     cash_balance = initial_cash
 
-    for code in df_nav.columns:
-        # Shares from initial holdings
-        if code in initial_holdings:
-            initial_shares[code] = initial_holdings[code] / initial_nav[code]
-        # plus shares from new lump sum cash
-        initial_shares[code] += (total_investment * weights[code]) / initial_nav[code]
+    # Shares from existing holdings plus the lump sum, all bought on day one.
+    held = np.array([initial_holdings.get(code, 0.0) for code in columns], float)
+    shares = held / nav[0] + (total_investment * weights) / nav[0]
 
-    # Total capital committed at start
-    initial_holdings_value = sum(initial_holdings.values())
-    total_committed = total_investment + initial_holdings_value + cash_balance
+    total_committed = total_investment + sum(initial_holdings.values()) + cash_balance
+    asset_values = nav * shares
+    values = nav @ shares + cash_balance
 
-    portfolio_history_values = df_nav.dot(initial_shares.T) + cash_balance
-    attribution_history = df_nav.multiply(initial_shares, axis="columns")
+    max_drawdown_value = calculate_max_drawdown_values(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        max_drawdown_nav = calculate_max_drawdown_values(values / total_committed)
 
-    portfolio_series = pd.Series(portfolio_history_values)
-    max_drawdown_value = calculate_max_drawdown(portfolio_series)
-    max_drawdown_nav = calculate_max_drawdown(portfolio_series / total_committed)
-
-    # Calculate Annualized Return (CAGR)
-    days = (df_nav.index[-1] - df_nav.index[0]).days
-    years = days / 365.25 if days > 0 else 0
     annualized_return = 0.0
-    if years > 0 and total_committed > 0:
-        final_value = portfolio_history_values.iloc[-1]
-        if final_value > 0:
-            annualized_return = (final_value / total_committed) ** (1 / years) - 1
-        else:
-            annualized_return = -1.0  # Lost everything
+    if total_committed > 0:
+        annualized_return = _annualized_return(
+            df_nav.index, values[-1] / total_committed
+        )
 
+    months = _month_labels(df_nav.index)
     return {
         "total_invested": total_committed,
-        "final_value": portfolio_history_values.iloc[-1],
+        "final_value": values[-1],
         "annualized_return": annualized_return,
-        "max_drawdown": float(max_drawdown_nav),
-        "max_drawdown_value": float(max_drawdown_value),
-        "max_drawdown_nav": float(max_drawdown_nav),
-        "history": {
-            date.strftime("%Y-%m"): value
-            for date, value in portfolio_history_values.to_dict().items()
-        },
-        "attribution": {
-            date.strftime("%Y-%m"): {
-                **row.to_dict(),
-                **({"RiskFree": cash_balance} if "RiskFree" not in row.index else {}),
-                "Cash": cash_balance,
-            }
-            for date, row in attribution_history.iterrows()
-        },
+        "max_drawdown": max_drawdown_nav,
+        "max_drawdown_value": max_drawdown_value,
+        "max_drawdown_nav": max_drawdown_nav,
+        "history": dict(zip(months, values.tolist())),
+        "attribution": _attribution(months, columns, asset_values, cash_balance),
     }
 
 
@@ -94,106 +118,59 @@ def backtest_dca(
 ):
     if initial_holdings is None:
         initial_holdings = {}
-    validate_weight_universe(weights_dict, list(df_nav.columns))
-    weights = normalize_weights(weights_dict, list(df_nav.columns))
-    initial_nav = df_nav.iloc[0]
-
-    total_shares = pd.Series(0.0, index=df_nav.columns)
-    # Initialize from existing holdings
-    for code in df_nav.columns:
-        if code in initial_holdings and initial_holdings[code] > 0:
-            total_shares[code] = initial_holdings[code] / initial_nav[code]
-
+    columns = list(df_nav.columns)
+    validate_weight_universe(weights_dict, columns)
+    weights = normalize_weights(weights_dict, columns).to_numpy()
+    nav = df_nav.to_numpy(dtype=float)
     cash_balance = initial_cash
-    initial_asset_value = sum(initial_holdings.values())
-    total_invested = initial_asset_value + cash_balance
-
-    portfolio_history = {}
-    attribution_history = {}
-    invested_history = {}
-
-    # Initialize "Strategy Unit" accounting
-    # We treat the strategy as a fund where new investments buy "units" of the strategy
-    # This allows correctly calculating Drawdown based on Unit Value, not (Value/Invested)
-    total_units = 0.0
-    if total_invested > 0:
-        total_units = total_invested  # Initial units at price 1.0
-
-    unit_nav_history = {}
-
-    for idx, (timestamp, nav_row) in enumerate(df_nav.iterrows()):
-        # 1. Calculate Portfolio Value BEFORE new investment (market impact on existing assets)
-        current_val_pre = (total_shares * nav_row).sum() + cash_balance
-
-        # 2. Derive Unit NAV
-        if total_units > 0:
-            unit_nav = current_val_pre / total_units
-        else:
-            unit_nav = 1.0
-
-        unit_nav_history[timestamp] = unit_nav
-
-        # 3. Add New Investment (Buying Strategy Units)
-        total_invested += monthly_investment
-        if unit_nav > 0:
-            new_units = monthly_investment / unit_nav
-            total_units += new_units
-
-        # 4. Execute Investment Logic (Buying Underlying Assets)
-        shares_bought = (monthly_investment * weights) / nav_row
-        total_shares += shares_bought
-
-        # 5. Record State
-        current_asset_values = total_shares * nav_row
-        attr = current_asset_values.to_dict()
-        if "RiskFree" not in current_asset_values.index:
-            attr["RiskFree"] = cash_balance
-        attr["Cash"] = cash_balance
-        attribution_history[timestamp] = attr
-        portfolio_history[timestamp] = current_asset_values.sum() + cash_balance
-        invested_history[timestamp] = total_invested
-
-    portfolio_series = pd.Series(portfolio_history)
-    unit_nav_series = pd.Series(unit_nav_history)
-    # invested_series = pd.Series(invested_history) # No longer used for DD
 
-    # Calculate Max Drawdown based on Unit NAV Series (True performance)
-    max_drawdown_nav = calculate_max_drawdown(unit_nav_series)
-    max_drawdown_value = calculate_max_drawdown(portfolio_series)
-
-    # Calculate Annualized Return (CAGR based on Strategy Unit NAV)
-    days = (df_nav.index[-1] - df_nav.index[0]).days
-    years = days / 365.25 if days > 0 else 0
-    annualized_return = 0.0
-
-    final_unit_nav = (
-        float(unit_nav_series.iloc[-1]) if not unit_nav_series.empty else 1.0
+    initial_shares = np.array(
+        [
+            initial_holdings[code] / nav[0, i]
+            if initial_holdings.get(code, 0) > 0
+            else 0.0
+            for i, code in enumerate(columns)
+        ]
     )
+    initial_value = sum(initial_holdings.values()) + cash_balance
+    total_invested = initial_value + monthly_investment * len(nav)
 
-    if years > 0:
-        if final_unit_nav > 0:
-            annualized_return = (final_unit_nav) ** (1 / years) - 1
-        else:
-            annualized_return = -1.0
-
+    # Row t + 1 holds the shares after month t's purchase.
+    shares = np.cumsum(
+        np.vstack([initial_shares, (monthly_investment * weights) / nav]), axis=0
+    )
+    asset_values = shares[1:] * nav
+    values = asset_values.sum(axis=1) + cash_balance
+    values_pre = (shares[:-1] * nav).sum(axis=1) + cash_balance
+
+    # Treat the strategy as a fund whose units new money buys at the current
+    # unit NAV: the unit NAV then compounds each month's return on the capital
+    # invested at the end of the previous month, independent of the inflows.
+    first_unit_nav = values_pre[0] / initial_value if initial_value > 0 else 1.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.where(values[:-1] > 0, values_pre[1:] / values[:-1], 1.0)
+    unit_navs = np.cumprod(np.concatenate([[first_unit_nav], growth]))
+
+    # Drawdown of the unit NAV is the true performance, not value / invested.
+    max_drawdown_nav = calculate_max_drawdown_values(unit_navs)
+    max_drawdown_value = calculate_max_drawdown_values(values)
+
+    final_unit_nav = float(unit_navs[-1])
+    months = _month_labels(df_nav.index)
     return {
         "total_invested": total_invested,
-        "final_value": list(portfolio_history.values())[-1],
+        "final_value": values[-1],
         "final_unit_nav": final_unit_nav,
-        "annualized_return": annualized_return,
-        "max_drawdown": float(max_drawdown_nav),
-        "max_drawdown_value": float(max_drawdown_value),
-        "max_drawdown_nav": float(max_drawdown_nav),
-        "history": {
-            date.strftime("%Y-%m"): value for date, value in portfolio_history.items()
-        },
-        "attribution": {
-            date.strftime("%Y-%m"): value for date, value in attribution_history.items()
-        },
+        "annualized_return": _annualized_return(df_nav.index, final_unit_nav),
+        "max_drawdown": max_drawdown_nav,
+        "max_drawdown_value": max_drawdown_value,
+        "max_drawdown_nav": max_drawdown_nav,
+        "history": dict(zip(months, values.tolist())),
+        "attribution": _attribution(months, columns, asset_values, cash_balance),
     }
 
 
-def backtest_kelly_dca(
+def backtest_kelly_dca_reference(
     df_nav,
     weights_dict,
     monthly_investment,
@@ -222,6 +199,9 @@ def backtest_kelly_dca(
     Note: Sometimes referred to as "Kelly DCA" in this codebase, but technically
     it implements Value Averaging by dynamically adjusting investment based on
     market valuation (Price vs MA bias).
+
+    Row-by-row pandas implementation, kept as the reference that
+    ``backtest_kelly_dca`` must match exactly.
     """
     validate_strategy_params(
         strategy_mode=strategy_mode,
@@ -276,7 +256,7 @@ def backtest_kelly_dca(
     invested_history = {}
 
     if has_risky_assets:
-        reference_portfolio_nav = df_nav[risky_columns].dot(risky_weights)
+        reference_portfolio_nav = get_reference_portfolio_nav(df_nav, risky_weights)
         ma_series = reference_portfolio_nav.rolling(
             window=ma_window, min_periods=1
         ).mean()
@@ -550,6 +530,620 @@ def backtest_kelly_dca(
     }
 
 
+def _kelly_dca_inputs(
+    df_nav,
+    weights_dict,
+    monthly_investment,
+    initial_holdings,
+    initial_cash,
+    buy_fee,
+    sell_fee,
+) -> Dict:
+    """Arrays and starting balances the value-averaging kernels run on."""
+    selected = decompose_selected_weights(weights_dict, list(df_nav.columns))
+    risky_weights = selected["risky_weights"]
+    base_risky_ratio = float(selected["base_risky_ratio"])
+    base_risk_free_ratio = float(selected["base_risk_free_ratio"])
+    risky_columns = list(risky_weights.index)
+    has_risky_assets = base_risky_ratio > 0 and float(risky_weights.sum()) > 0
+
+    if initial_holdings is None:
+        initial_holdings = {}
+    can_use_risk_free_asset = "RiskFree" in df_nav.columns and (
+        base_risk_free_ratio > 0 or initial_holdings.get("RiskFree", 0.0) > 0
+    )
+
+    nav = df_nav[risky_columns].to_numpy(dtype=float)
+    rf_nav = (
+        df_nav["RiskFree"].to_numpy(dtype=float) if can_use_risk_free_asset else None
+    )
+
+    shares = np.zeros(len(risky_columns))
+    for position, code in enumerate(risky_columns):
+        if code in initial_holdings and initial_holdings[code] > 0:
+            shares[position] = initial_holdings[code] / nav[0, position]
+    risk_free_shares = 0.0
+    if can_use_risk_free_asset and initial_holdings.get("RiskFree", 0.0) > 0:
+        risk_free_shares = initial_holdings["RiskFree"] / rf_nav[0]
+
+    accumulated_investment = sum(initial_holdings.values()) + initial_cash
+
+    if has_risky_assets:
+        reference_portfolio_nav = get_reference_portfolio_nav(df_nav, risky_weights)
+    else:
+        reference_portfolio_nav = pd.Series(1.0, index=df_nav.index, dtype=float)
+
+    return {
+        "nav": nav,
+        "rf_nav": rf_nav,
+        "weights": risky_weights.to_numpy(dtype=float),
+        "buy_fees": np.array(
+            [(buy_fee or {}).get(code, 0.0) for code in risky_columns], float
+        ),
+        "sell_fees": np.array(
+            [(sell_fee or {}).get(code, 0.0) for code in risky_columns], float
+        ),
+        "reference_nav": reference_portfolio_nav.to_numpy(dtype=float),
+        "shares": shares,
+        "risk_free_shares": risk_free_shares,
+        "cash_balance": initial_cash,
+        "accumulated_investment": accumulated_investment,
+        "total_units": accumulated_investment if accumulated_investment > 0 else 0.0,
+        "monthly_investment": monthly_investment,
+        "base_risky_ratio": base_risky_ratio,
+        "has_risky_assets": has_risky_assets,
+        "target_has_risk_free_asset": (
+            "RiskFree" in df_nav.columns and base_risk_free_ratio > 0
+        ),
+        "risky_weights": risky_weights,
+        "reference_portfolio_nav": reference_portfolio_nav,
+    }
+
+
+def backtest_kelly_dca(
+    df_nav,
+    weights_dict,
+    monthly_investment,
+    initial_holdings=None,
+    max_buy_multiplier=3.0,
+    sell_threshold=0.05,
+    min_weight=0.3,
+    max_weight=0.8,
+    buy_fee: Dict[str, float] = None,
+    sell_fee: Dict[str, float] = None,
+    ma_window: int = 12,
+    risk_free_rate: float = 0.0,
+    strategy_mode: str = DEFAULT_STRATEGY_MODE,
+    kelly_fraction: float = DEFAULT_KELLY_FRACTION,
+    estimation_window: int = DEFAULT_ESTIMATION_WINDOW,
+    minimum_cash_reserve: float = 0.0,
+    enable_cvar_constraint: bool = True,
+    cvar_confidence: float = DEFAULT_CVAR_CONFIDENCE,
+    cvar_limit: float = DEFAULT_CVAR_LIMIT,
+    enable_drawdown_constraint: bool = True,
+    max_drawdown_limit: float = DEFAULT_MAX_DRAWDOWN_LIMIT,
+    initial_cash: float = 0.0,
+    return_state: bool = False,
+):
+    """
+    Advanced Value Averaging (VA) Strategy on NumPy arrays.
+
+    Same parameters and result as ``backtest_kelly_dca_reference``, bit for
+    bit; the monthly loop runs in ``core.backtest_kernel.simulate_kelly_dca``.
+    Panels with missing NAVs go through the reference implementation.
+
+    With ``return_state`` the result also carries a JSON-ready ``state`` that
+    ``resume_kelly_dca`` continues over later months.
+    """
+    validate_strategy_params(
+        strategy_mode=strategy_mode,
+        min_weight=min_weight,
+        max_weight=max_weight,
+        kelly_fraction=kelly_fraction,
+        estimation_window=estimation_window,
+        minimum_cash_reserve=minimum_cash_reserve,
+        enable_cvar_constraint=enable_cvar_constraint,
+        cvar_confidence=cvar_confidence,
+        cvar_limit=cvar_limit,
+        enable_drawdown_constraint=enable_drawdown_constraint,
+        max_drawdown_limit=max_drawdown_limit,
+    )
+
+    if df_nav.isna().to_numpy().any():
+        if return_state:
+            raise HTTPException(
+                status_code=400, detail="Cannot resume a backtest over missing NAVs"
+            )
+        return backtest_kelly_dca_reference(
+            df_nav,
+            weights_dict,
+            monthly_investment,
+            initial_holdings=initial_holdings,
+            max_buy_multiplier=max_buy_multiplier,
+            sell_threshold=sell_threshold,
+            min_weight=min_weight,
+            max_weight=max_weight,
+            buy_fee=buy_fee,
+            sell_fee=sell_fee,
+            ma_window=ma_window,
+            risk_free_rate=risk_free_rate,
+            strategy_mode=strategy_mode,
+            kelly_fraction=kelly_fraction,
+            estimation_window=estimation_window,
+            minimum_cash_reserve=minimum_cash_reserve,
+            enable_cvar_constraint=enable_cvar_constraint,
+            cvar_confidence=cvar_confidence,
+            cvar_limit=cvar_limit,
+            enable_drawdown_constraint=enable_drawdown_constraint,
+            max_drawdown_limit=max_drawdown_limit,
+            initial_cash=initial_cash,
+        )
+
+    inputs = _kelly_dca_inputs(
+        df_nav,
+        weights_dict,
+        monthly_investment,
+        initial_holdings,
+        initial_cash,
+        buy_fee,
+        sell_fee,
+    )
+    reference_portfolio_nav = inputs.pop("reference_portfolio_nav")
+    risky_weights = inputs.pop("risky_weights")
+    if inputs["has_risky_assets"]:
+        ma_series = reference_portfolio_nav.rolling(
+            window=ma_window, min_periods=1
+        ).mean()
+    else:
+        ma_series = reference_portfolio_nav.copy()
+
+    settings = {
+        "max_buy_multiplier": max_buy_multiplier,
+        "sell_threshold": sell_threshold,
+        "min_weight": min_weight,
+        "max_weight": max_weight,
+        "strategy_mode": strategy_mode,
+        "kelly_fraction": kelly_fraction,
+        "estimation_window": estimation_window,
+        "risk_free_rate": risk_free_rate,
+        "minimum_cash_reserve": minimum_cash_reserve,
+        "enable_cvar_constraint": enable_cvar_constraint,
+        "cvar_confidence": cvar_confidence,
+        "cvar_limit": cvar_limit,
+        "enable_drawdown_constraint": enable_drawdown_constraint,
+        "max_drawdown_limit": max_drawdown_limit,
+    }
+    ma = ma_series.to_numpy(dtype=float)
+    state = simulate_kelly_dca(ma=ma, **settings, **inputs)
+
+    max_drawdown_nav = float(calculate_max_drawdown(pd.Series(state["unit_navs"])))
+    max_drawdown_value = float(calculate_max_drawdown(pd.Series(state["values"])))
+    result = _kelly_dca_result(
+        df_nav.index,
+        df_nav.index[0],
+        risky_weights,
+        strategy_mode,
+        state,
+        max_drawdown_nav,
+        max_drawdown_value,
+    )
+    if return_state:
+        rolling_mean = None
+        if inputs["has_risky_assets"]:
+            rolling_mean = RollingMean(ma_window)
+            for value in inputs["reference_nav"]:
+                rolling_mean.push(value)
+            rolling_mean = rolling_mean.state()
+        result["state"] = _kelly_dca_state(
+            {**settings, "ma_window": ma_window},
+            inputs,
+            risky_weights,
+            df_nav.index[0],
+            df_nav.index[-1],
+            state,
+            reference_nav=inputs["reference_nav"],
+            ma=ma,
+            rolling_mean=rolling_mean,
+            unit_nav_peak=float(state["unit_navs"].max()),
+            max_drawdown_nav=max_drawdown_nav,
+            value_peak=float(state["values"].max()),
+            max_drawdown_value=max_drawdown_value,
+        )
+    return result
+
+
+def _kelly_dca_result(
+    index,
+    start_date,
+    risky_weights,
+    strategy_mode,
+    state,
+    max_drawdown_nav,
+    max_drawdown_value,
+) -> Dict:
+    """``backtest_kelly_dca`` result from a kernel run over the months in ``index``.
+
+    ``start_date`` is the first month of the whole run, for the annualized return.
+    """
+    risky_columns = list(risky_weights.index)
+    final_unit_nav = float(state["unit_navs"][-1])
+
+    months = _month_labels(index)
+    attribution = {}
+    for month, asset_values, risk_free_value, cash in zip(
+        months, state["asset_values"].tolist(), state["risk_free_values"], state["cash"]
+    ):
+        record = dict(zip(risky_columns, asset_values))
+        record["RiskFree"] = float(risk_free_value)
+        record["Cash"] = float(cash)
+        attribution[month] = record
+
+    return {
+        "total_invested": state["accumulated_investment"],
+        "final_value": state["values"][-1],
+        "final_unit_nav": final_unit_nav,
+        "annualized_return": _annualized_return(
+            [start_date, index[-1]], final_unit_nav
+        ),
+        "max_drawdown": max_drawdown_nav,
+        "max_drawdown_value": max_drawdown_value,
+        "max_drawdown_nav": max_drawdown_nav,
+        "market_signal": state["market_signal"],
+        "allocation_signal": state["allocation_signal"],
+        "strategy_mode": strategy_mode,
+        "optimizer_info": state["optimizer_info"],
+        "effective_risky_weights": risky_weights.to_dict(),
+        "history": dict(zip(months, state["values"].tolist())),
+        "unit_nav_history": dict(zip(months, state["unit_navs"].tolist())),
+        "attribution": attribution,
+    }
+
+
+def _kelly_dca_state(
+    settings,
+    inputs,
+    risky_weights,
+    start_date,
+    last_date,
+    state,
+    *,
+    reference_nav,
+    ma,
+    rolling_mean,
+    unit_nav_peak,
+    max_drawdown_nav,
+    value_peak,
+    max_drawdown_value,
+) -> Dict:
+    """JSON-ready end-of-run state that ``resume_kelly_dca`` continues from.
+
+    Only the last ``max(ma_window, estimation_window + 1)`` reference NAVs are
+    kept, so the state has a fixed size whatever the length of the run.
+    """
+    tail = max(settings["ma_window"], settings["estimation_window"] + 1)
+    return {
+        "version": KELLY_DCA_STATE_VERSION,
+        "settings": {**settings, "monthly_investment": inputs["monthly_investment"]},
+        "risky_weights": {code: float(w) for code, w in risky_weights.items()},
+        "buy_fees": inputs["buy_fees"].tolist(),
+        "sell_fees": inputs["sell_fees"].tolist(),
+        "base_risky_ratio": inputs["base_risky_ratio"],
+        "has_risky_assets": inputs["has_risky_assets"],
+        "target_has_risk_free_asset": inputs["target_has_risk_free_asset"],
+        "uses_risk_free_asset": inputs["rf_nav"] is not None,
+        "start_date": pd.Timestamp(start_date).isoformat(),
+        "last_date": pd.Timestamp(last_date).isoformat(),
+        "shares": state["shares"].tolist(),
+        "risk_free_shares": float(state["risk_free_shares"]),
+        "cash_balance": float(state["cash_balance"]),
+        "accumulated_investment": float(state["accumulated_investment"]),
+        "total_units": float(state["total_units"]),
+        "reference_nav": np.asarray(reference_nav, dtype=float)[-tail:].tolist(),
+        "ma": np.asarray(ma, dtype=float)[-tail:].tolist(),
+        "rolling_mean": rolling_mean,
+        "unit_nav_peak": unit_nav_peak,
+        "max_drawdown_nav": max_drawdown_nav,
+        "value_peak": value_peak,
+        "max_drawdown_value": max_drawdown_value,
+    }
+
+
+def _continue_max_drawdown(values, peak: float, max_drawdown: float):
+    """``calculate_max_drawdown`` of a path extended by ``values``.
+
+    ``peak`` and ``max_drawdown`` summarize the path so far; returns both
+    updated, matching a rerun over the whole path.
+    """
+    peaks = np.maximum.accumulate(np.concatenate(([peak], values)))[1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdowns = (values - peaks) / peaks
+    drawdowns = drawdowns[~np.isnan(drawdowns)]
+    if not np.isnan(max_drawdown):
+        drawdowns = np.append(drawdowns, max_drawdown)
+    return float(peaks[-1]), float(drawdowns.min()) if drawdowns.size else np.nan
+
+
+def resume_kelly_dca(state: Dict, df_nav: pd.DataFrame) -> Dict:
+    """Continue a ``backtest_kelly_dca(..., return_state=True)`` run.
+
+    Rows of ``df_nav`` up to the state's last month are skipped. The summary
+    metrics, signals and the new ``state`` equal those of a full rerun over
+    the whole panel; ``history``, ``unit_nav_history`` and ``attribution``
+    cover only the new months. Cost is independent of the run's length.
+    """
+    if state.get("version") != KELLY_DCA_STATE_VERSION:
+        raise HTTPException(
+            status_code=400, detail="Unsupported backtest state version"
+        )
+    settings = dict(state["settings"])
+    ma_window = settings.pop("ma_window")
+    monthly_investment = settings.pop("monthly_investment")
+
+    df_new = df_nav[df_nav.index > pd.Timestamp(state["last_date"])]
+    if df_new.empty:
+        raise HTTPException(
+            status_code=400,
+            detail=f"No NAV rows after {state['last_date'][:10]} to resume over",
+        )
+    risky_weights = pd.Series(state["risky_weights"], dtype=float)
+    columns = list(risky_weights.index)
+    if state["uses_risk_free_asset"]:
+        columns.append("RiskFree")
+    missing = [code for code in columns if code not in df_new.columns]
+    if missing:
+        raise HTTPException(
+            status_code=400, detail=f"Panel is missing backtested assets: {missing}"
+        )
+    if df_new[columns].isna().to_numpy().any():
+        raise HTTPException(
+            status_code=400, detail="Cannot resume a backtest over missing NAVs"
+        )
+
+    if state["has_risky_assets"]:
+        reference_new = get_reference_portfolio_nav(df_new, risky_weights).to_numpy(
+            dtype=float
+        )
+        rolling_mean = RollingMean(ma_window, state["rolling_mean"])
+        ma_new = np.array([rolling_mean.push(value) for value in reference_new])
+        rolling_mean = rolling_mean.state()
+    else:
+        reference_new = np.ones(len(df_new))
+        ma_new = reference_new.copy()
+        rolling_mean = None
+    reference_nav = np.concatenate((state["reference_nav"], reference_new))
+    ma = np.concatenate((state["ma"], ma_new))
+
+    inputs = {
+        "nav": df_new[list(risky_weights.index)].to_numpy(dtype=float),
+        "rf_nav": (
+            df_new["RiskFree"].to_numpy(dtype=float)
+            if state["uses_risk_free_asset"]
+            else None
+        ),
+        "weights": risky_weights.to_numpy(dtype=float),
+        "buy_fees": np.array(state["buy_fees"], dtype=float),
+        "sell_fees": np.array(state["sell_fees"], dtype=float),
+        "shares": np.array(state["shares"], dtype=float),
+        "risk_free_shares": state["risk_free_shares"],
+        "cash_balance": state["cash_balance"],
+        "accumulated_investment": state["accumulated_investment"],
+        "total_units": state["total_units"],
+        "monthly_investment": monthly_investment,
+        "base_risky_ratio": state["base_risky_ratio"],
+        "has_risky_assets": state["has_risky_assets"],
+        "target_has_risk_free_asset": state["target_has_risk_free_asset"],
+    }
+    run = simulate_kelly_dca(
+        reference_nav=reference_nav,
+        ma=ma,
+        history_rows=len(state["reference_nav"]),
+        **settings,
+        **inputs,
+    )
+
+    unit_nav_peak, max_drawdown_nav = _continue_max_drawdown(
+        run["unit_navs"], state["unit_nav_peak"], state["max_drawdown_nav"]
+    )
+    value_peak, max_drawdown_value = _continue_max_drawdown(
+        run["values"], state["value_peak"], state["max_drawdown_value"]
+    )
+    result = _kelly_dca_result(
+        df_new.index,
+        pd.Timestamp(state["start_date"]),
+        risky_weights,
+        settings["strategy_mode"],
+        run,
+        max_drawdown_nav,
+        max_drawdown_value,
+    )
+    result["state"] = _kelly_dca_state(
+        {**settings, "ma_window": ma_window},
+        inputs,
+        risky_weights,
+        state["start_date"],
+        df_new.index[-1],
+        run,
+        reference_nav=reference_nav,
+        ma=ma,
+        rolling_mean=rolling_mean,
+        unit_nav_peak=unit_nav_peak,
+        max_drawdown_nav=max_drawdown_nav,
+        value_peak=value_peak,
+        max_drawdown_value=max_drawdown_value,
+    )
+    return result
+
+
+def _summary_metrics(index, total_invested, values, unit_navs) -> Dict[str, float]:
+    """Headline metrics of one value path and its unit NAV path."""
+    final_unit_nav = float(unit_navs[-1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        monthly_returns = unit_navs[1:] / unit_navs[:-1] - 1
+    volatility = (
+        float(monthly_returns.std() * np.sqrt(12)) if monthly_returns.size else 0.0
+    )
+    return {
+        "total_invested": float(total_invested),
+        "final_value": float(values[-1]),
+        "final_unit_nav": final_unit_nav,
+        "annualized_return": _annualized_return(index, final_unit_nav),
+        "max_drawdown": calculate_max_drawdown_values(unit_navs),
+        "max_drawdown_value": calculate_max_drawdown_values(values),
+        "volatility": volatility if np.isfinite(volatility) else 0.0,
+    }
+
+
+def scenario_frame(
+    scenarios,
+    *,
+    strategy_mode: str = DEFAULT_STRATEGY_MODE,
+    estimation_window: int = DEFAULT_ESTIMATION_WINDOW,
+    minimum_cash_reserve: float = 0.0,
+    enable_cvar_constraint: bool = True,
+    cvar_confidence: float = DEFAULT_CVAR_CONFIDENCE,
+    cvar_limit: float = DEFAULT_CVAR_LIMIT,
+    enable_drawdown_constraint: bool = True,
+    max_drawdown_limit: float = DEFAULT_MAX_DRAWDOWN_LIMIT,
+) -> pd.DataFrame:
+    """Validated ``SCENARIO_PARAMETERS`` matrix, one row per scenario.
+
+    Missing parameters take their defaults; unknown or invalid ones raise
+    the same 400 errors as a single backtest would.
+    """
+    frame = pd.DataFrame(scenarios)
+    unknown = sorted(set(frame.columns) - set(SCENARIO_PARAMETERS))
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown scenario parameters: {unknown}"
+        )
+    if frame.empty:
+        return pd.DataFrame(columns=list(SCENARIO_PARAMETERS))
+    for name, default in SCENARIO_PARAMETERS.items():
+        if name in frame.columns:
+            frame[name] = frame[name].fillna(default)
+        else:
+            frame[name] = default
+    frame = frame[list(SCENARIO_PARAMETERS)].astype(float)
+    frame["ma_window"] = frame["ma_window"].astype(int)
+
+    for params in frame.to_dict("records"):
+        validate_strategy_params(
+            strategy_mode=strategy_mode,
+            min_weight=params["min_weight"],
+            max_weight=params["max_weight"],
+            kelly_fraction=params["kelly_fraction"],
+            estimation_window=estimation_window,
+            minimum_cash_reserve=minimum_cash_reserve,
+            enable_cvar_constraint=enable_cvar_constraint,
+            cvar_confidence=cvar_confidence,
+            cvar_limit=cvar_limit,
+            enable_drawdown_constraint=enable_drawdown_constraint,
+            max_drawdown_limit=max_drawdown_limit,
+        )
+    if (frame["ma_window"] < 1).any():
+        raise HTTPException(status_code=400, detail="ma_window must be >= 1")
+    return frame
+
+
+def backtest_kelly_dca_batch(
+    df_nav,
+    weights_dict,
+    monthly_investment,
+    scenarios,
+    initial_holdings=None,
+    max_buy_multiplier=3.0,
+    buy_fee: Dict[str, float] = None,
+    sell_fee: Dict[str, float] = None,
+    risk_free_rate: float = 0.0,
+    strategy_mode: str = DEFAULT_STRATEGY_MODE,
+    estimation_window: int = DEFAULT_ESTIMATION_WINDOW,
+    minimum_cash_reserve: float = 0.0,
+    enable_cvar_constraint: bool = True,
+    cvar_confidence: float = DEFAULT_CVAR_CONFIDENCE,
+    cvar_limit: float = DEFAULT_CVAR_LIMIT,
+    enable_drawdown_constraint: bool = True,
+    max_drawdown_limit: float = DEFAULT_MAX_DRAWDOWN_LIMIT,
+    initial_cash: float = 0.0,
+) -> List[Dict[str, float]]:
+    """
+    Run ``backtest_kelly_dca`` for many parameter sets in one batched pass.
+
+    ``scenarios`` is the parameter matrix (see ``scenario_frame``): a
+    DataFrame or a list of dicts with any of the ``SCENARIO_PARAMETERS``
+    columns. Every other argument is shared. Returns
+    one row per scenario with its parameters and summary metrics (no
+    history), matching the single runs up to floating-point rounding.
+    """
+    frame = scenario_frame(
+        scenarios,
+        strategy_mode=strategy_mode,
+        estimation_window=estimation_window,
+        minimum_cash_reserve=minimum_cash_reserve,
+        enable_cvar_constraint=enable_cvar_constraint,
+        cvar_confidence=cvar_confidence,
+        cvar_limit=cvar_limit,
+        enable_drawdown_constraint=enable_drawdown_constraint,
+        max_drawdown_limit=max_drawdown_limit,
+    )
+    if frame.empty:
+        return []
+
+    inputs = _kelly_dca_inputs(
+        df_nav,
+        weights_dict,
+        monthly_investment,
+        initial_holdings,
+        initial_cash,
+        buy_fee,
+        sell_fee,
+    )
+    reference_portfolio_nav = inputs.pop("reference_portfolio_nav")
+    inputs.pop("risky_weights")
+
+    windows = frame["ma_window"].to_numpy()
+    ma = np.empty((len(df_nav), len(frame)))
+    for window in np.unique(windows):
+        ma[:, windows == window] = (
+            reference_portfolio_nav.rolling(window=int(window), min_periods=1)
+            .mean()
+            .to_numpy(dtype=float)[:, None]
+            if inputs["has_risky_assets"]
+            else reference_portfolio_nav.to_numpy(dtype=float)[:, None]
+        )
+
+    state = simulate_kelly_dca_batch(
+        ma=ma,
+        kelly_fraction=frame["kelly_fraction"].to_numpy(),
+        min_weight=frame["min_weight"].to_numpy(),
+        max_weight=frame["max_weight"].to_numpy(),
+        sell_threshold=frame["sell_threshold"].to_numpy(),
+        max_buy_multiplier=max_buy_multiplier,
+        strategy_mode=strategy_mode,
+        estimation_window=estimation_window,
+        risk_free_rate=risk_free_rate,
+        minimum_cash_reserve=minimum_cash_reserve,
+        enable_cvar_constraint=enable_cvar_constraint,
+        cvar_confidence=cvar_confidence,
+        cvar_limit=cvar_limit,
+        enable_drawdown_constraint=enable_drawdown_constraint,
+        max_drawdown_limit=max_drawdown_limit,
+        **inputs,
+    )
+
+    return [
+        {
+            **params,
+            **_summary_metrics(
+                df_nav.index,
+                state["accumulated_investment"],
+                state["values"][:, scenario],
+                state["unit_navs"][:, scenario],
+            ),
+        }
+        for scenario, params in enumerate(frame.to_dict("records"))
+    ]
+
+
 def simulate_strategy_frontier(
     frontier_points,
     nav_adjusted,
@@ -0,0 +1,849 @@
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+from core.constants import OPTIMIZED_SIGNAL_EPSILON, RISK_RATIO_GRID_STEP
+from core.strategy import (
+    _infer_signal_from_bounds,
+    calculate_target_ratio,
+    get_monthly_rf_return,
+    infer_valuation_signal,
+)
+
+# Every floating-point step below mirrors the pandas reference in
+# ``core.backtest`` / ``core.strategy`` operation for operation: sums the
+# reference accumulates in a Python loop use ``np.cumsum`` (sequential), the
+# ones pandas reduces with ``ndarray.sum`` use ``ndarray.sum`` on an array of
+# the same length and order, and quantiles go through ``np.percentile``
+# exactly as pandas calls it. That keeps results bit-for-bit identical.
+
+
+def _sequential_sum(values: np.ndarray) -> float:
+    """``total = 0.0; for v in values: total += v``, without the Python loop."""
+    return np.cumsum(values)[-1] if values.size else 0.0
+
+
+def _cvar_losses(returns: np.ndarray, confidence: float) -> np.ndarray:
+    """Row-wise ``risk.calculate_cvar_loss`` of a [scenarios, months] matrix."""
+    losses = -returns
+    var_losses = np.percentile(
+        losses, np.asarray([confidence]) * 100.0, axis=1, method="linear"
+    )[0]
+    cvar = np.empty(len(losses))
+    for i, (row, var_loss) in enumerate(zip(losses, var_losses)):
+        tail = row[row >= var_loss]
+        if tail.size == 0:
+            cvar[i] = max(0.0, float(var_loss))
+        else:
+            cvar[i] = max(0.0, float(tail.sum() / np.float64(tail.size)))
+    return cvar
+
+
+def _max_drawdowns(returns: np.ndarray) -> np.ndarray:
+    """Row-wise ``risk.calculate_drawdown_from_returns``."""
+    nav = np.cumprod(1 + returns, axis=1)
+    peaks = np.maximum.accumulate(nav, axis=1)
+    return np.abs(((nav - peaks) / peaks).min(axis=1))
+
+
+def _max_feasible_risk_ratio(
+    hist: np.ndarray,
+    rf_monthly: float,
+    effective_upper: float,
+    enable_cvar_constraint: bool,
+    cvar_confidence: float,
+    cvar_limit: float,
+    enable_drawdown_constraint: bool,
+    max_drawdown_limit: float,
+) -> Dict[str, float]:
+    """``strategy.calculate_max_feasible_risk_ratio`` with the grid as one matrix."""
+    if effective_upper <= 0:
+        return {
+            "max_feasible_ratio_by_cvar": 0.0,
+            "max_feasible_ratio_by_drawdown": 0.0,
+            "max_feasible_ratio_by_risk": 0.0,
+        }
+
+    grid = np.arange(0.0, effective_upper + RISK_RATIO_GRID_STEP, RISK_RATIO_GRID_STEP)
+    if len(grid) == 0 or grid[-1] < effective_upper:
+        grid = np.append(grid, effective_upper)
+    ratios = np.array([float(min(max(r, 0.0), effective_upper)) for r in grid])
+    returns = ratios[:, None] * hist[None, :] + ((1 - ratios) * rf_monthly)[:, None]
+
+    cvar_ok = np.ones(len(ratios), dtype=bool)
+    if enable_cvar_constraint:
+        cvar_ok = _cvar_losses(returns, cvar_confidence) <= cvar_limit
+    dd_ok = np.ones(len(ratios), dtype=bool)
+    if enable_drawdown_constraint:
+        dd_ok = _max_drawdowns(returns) <= max_drawdown_limit
+
+    def _last_ratio(ok: np.ndarray) -> float:
+        hits = np.flatnonzero(ok)
+        return float(ratios[hits[-1]]) if hits.size else 0.0
+
+    max_feasible_cvar = _last_ratio(cvar_ok)
+    max_feasible_dd = _last_ratio(dd_ok)
+    max_feasible_both = _last_ratio(cvar_ok & dd_ok)
+
+    max_feasible_risk = float(
+        min(max_feasible_both, effective_upper)
+        if (enable_cvar_constraint or enable_drawdown_constraint)
+        else effective_upper
+    )
+    return {
+        "max_feasible_ratio_by_cvar": float(
+            min(max_feasible_cvar, effective_upper)
+            if enable_cvar_constraint
+            else effective_upper
+        ),
+        "max_feasible_ratio_by_drawdown": float(
+            min(max_feasible_dd, effective_upper)
+            if enable_drawdown_constraint
+            else effective_upper
+        ),
+        "max_feasible_ratio_by_risk": max_feasible_risk,
+    }
+
+
+def target_ratio_optimized(
+    hist: np.ndarray,
+    min_weight: float,
+    max_weight: float,
+    kelly_fraction: float,
+    risk_free_rate: float,
+    total_wealth: float,
+    minimum_cash_reserve: float,
+    enable_cvar_constraint: bool,
+    cvar_confidence: float,
+    cvar_limit: float,
+    enable_drawdown_constraint: bool,
+    max_drawdown_limit: float,
+):
+    """``strategy.calculate_target_ratio_optimized`` on the estimation window.
+
+    ``hist`` holds the reference portfolio's last ``estimation_window``
+    monthly returns up to the signal date.
+    """
+    if total_wealth > 0:
+        cash_cap_ratio = float(
+            np.clip((total_wealth - minimum_cash_reserve) / total_wealth, 0.0, 1.0)
+        )
+    else:
+        cash_cap_ratio = 0.0
+
+    effective_upper = min(max_weight, cash_cap_ratio)
+    lower_bound = min_weight if effective_upper >= min_weight else effective_upper
+
+    optimizer_info = {
+        "mu_excess": None,
+        "sigma2": None,
+        "full_kelly": None,
+        "fractional_kelly": None,
+        "cash_cap_ratio": cash_cap_ratio,
+        "cash_constrained": effective_upper < max_weight,
+        "max_feasible_ratio_by_cvar": float(effective_upper),
+        "max_feasible_ratio_by_drawdown": float(effective_upper),
+        "max_feasible_ratio_by_risk": float(effective_upper),
+        "cvar_estimate_at_target": None,
+        "drawdown_estimate_at_target": None,
+        "constraint_applied": False,
+        "constraint_binding": "cash" if effective_upper < max_weight else "none",
+    }
+
+    if len(hist) < 3:
+        target_ratio = min(min_weight, effective_upper)
+        allocation_signal = _infer_signal_from_bounds(
+            target_ratio, lower_bound, effective_upper, OPTIMIZED_SIGNAL_EPSILON
+        )
+        return target_ratio, allocation_signal, optimizer_info
+
+    rf_monthly = get_monthly_rf_return(risk_free_rate)
+
+    # pandas' nanmean / nanvar(ddof=1) with float counts.
+    count = np.float64(hist.size)
+    mean = hist.sum() / count
+    mu_excess = float(mean - rf_monthly)
+    variance = ((mean - hist) ** 2).sum() / (count - 1)
+    sigma2 = float(max(variance, 1e-6))
+    full_kelly = mu_excess / sigma2
+    fractional_kelly = kelly_fraction * full_kelly
+    risk_caps = _max_feasible_risk_ratio(
+        hist=hist,
+        rf_monthly=rf_monthly,
+        effective_upper=effective_upper,
+        enable_cvar_constraint=enable_cvar_constraint,
+        cvar_confidence=cvar_confidence,
+        cvar_limit=cvar_limit,
+        enable_drawdown_constraint=enable_drawdown_constraint,
+        max_drawdown_limit=max_drawdown_limit,
+    )
+    final_upper = min(effective_upper, risk_caps["max_feasible_ratio_by_risk"])
+    lower_bound = min_weight if final_upper >= min_weight else 0.0
+    target_ratio = float(np.clip(fractional_kelly, lower_bound, final_upper))
+    target_returns = (target_ratio * hist + (1 - target_ratio) * rf_monthly)[None, :]
+
+    constraint_applied = enable_cvar_constraint or enable_drawdown_constraint
+    cvar_binding = (
+        enable_cvar_constraint
+        and risk_caps["max_feasible_ratio_by_cvar"] + 1e-9 < effective_upper
+    )
+    drawdown_binding = (
+        enable_drawdown_constraint
+        and risk_caps["max_feasible_ratio_by_drawdown"] + 1e-9 < effective_upper
+    )
+    if cvar_binding and drawdown_binding:
+        binding = "both"
+    elif cvar_binding:
+        binding = "cvar"
+    elif drawdown_binding:
+        binding = "drawdown"
+    elif effective_upper < max_weight:
+        binding = "cash"
+    else:
+        binding = "none"
+
+    optimizer_info.update(
+        {
+            "mu_excess": mu_excess,
+            "sigma2": sigma2,
+            "full_kelly": float(full_kelly),
+            "fractional_kelly": float(fractional_kelly),
+            "max_feasible_ratio_by_cvar": risk_caps["max_feasible_ratio_by_cvar"],
+            "max_feasible_ratio_by_drawdown": risk_caps[
+                "max_feasible_ratio_by_drawdown"
+            ],
+            "max_feasible_ratio_by_risk": risk_caps["max_feasible_ratio_by_risk"],
+            "cvar_estimate_at_target": float(
+                _cvar_losses(target_returns, cvar_confidence)[0]
+            ),
+            "drawdown_estimate_at_target": float(_max_drawdowns(target_returns)[0]),
+            "constraint_applied": constraint_applied,
+            "constraint_binding": binding,
+        }
+    )
+
+    allocation_signal = _infer_signal_from_bounds(
+        target_ratio, lower_bound, final_upper, OPTIMIZED_SIGNAL_EPSILON
+    )
+    return target_ratio, allocation_signal, optimizer_info
+
+
+_NO_RISKY_ASSETS_INFO = {
+    "cash_cap_ratio": 1.0,
+    "cash_constrained": False,
+    "max_feasible_ratio_by_cvar": 0.0,
+    "max_feasible_ratio_by_drawdown": 0.0,
+    "max_feasible_ratio_by_risk": 0.0,
+    "constraint_applied": False,
+    "constraint_binding": "cash",
+}
+
+
+class RollingMean:
+    """``Series.rolling(window, min_periods=1).mean()`` fed one value at a time.
+
+    Replays pandas' compensated add/remove accumulator (``roll_mean``), so the
+    means match the vectorized call bit for bit, and exposes it through
+    ``state`` so a backtest can carry its moving average over to new rows.
+    """
+
+    def __init__(self, window: int, state: Optional[Dict[str, object]] = None):
+        state = state or {}
+        self.window = window
+        self.values = [float(value) for value in state.get("values", [])]
+        self.sum = float(state.get("sum", 0.0))
+        self.compensation_add = float(state.get("compensation_add", 0.0))
+        self.compensation_remove = float(state.get("compensation_remove", 0.0))
+        self.negatives = int(state.get("negatives", 0))
+        self.repeats = int(state.get("repeats", 0))
+
+    def state(self) -> Dict[str, object]:
+        return {
+            "values": list(self.values),
+            "sum": self.sum,
+            "compensation_add": self.compensation_add,
+            "compensation_remove": self.compensation_remove,
+            "negatives": self.negatives,
+            "repeats": self.repeats,
+        }
+
+    def push(self, value: float) -> float:
+        value = float(value)
+        if not self.values or self.window <= 1:
+            # Windows that do not overlap the previous one start from scratch.
+            self.values = []
+            self.sum = self.compensation_add = self.compensation_remove = 0.0
+            self.negatives = self.repeats = 0
+        elif len(self.values) >= self.window:
+            removed = self.values.pop(0)
+            y = -removed - self.compensation_remove
+            t = self.sum + y
+            self.compensation_remove = t - self.sum - y
+            self.sum = t
+            if math.copysign(1.0, removed) < 0:
+                self.negatives -= 1
+
+        y = value - self.compensation_add
+        t = self.sum + y
+        self.compensation_add = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, value) < 0:
+            self.negatives += 1
+        self.repeats = (
+            self.repeats + 1 if self.values and value == self.values[-1] else 1
+        )
+        self.values.append(value)
+
+        count = len(self.values)
+        mean = self.sum / count
+        if self.repeats >= count:
+            return value
+        if self.negatives == 0 and mean < 0:
+            return 0.0
+        if self.negatives == count and mean > 0:
+            return 0.0
+        return mean
+
+
+def simulate_kelly_dca(
+    nav: np.ndarray,
+    rf_nav: Optional[np.ndarray],
+    weights: np.ndarray,
+    buy_fees: np.ndarray,
+    sell_fees: np.ndarray,
+    reference_nav: np.ndarray,
+    ma: np.ndarray,
+    *,
+    shares: np.ndarray,
+    risk_free_shares: float,
+    cash_balance: float,
+    accumulated_investment: float,
+    total_units: float,
+    monthly_investment: float,
+    max_buy_multiplier: float,
+    sell_threshold: float,
+    min_weight: float,
+    max_weight: float,
+    base_risky_ratio: float,
+    has_risky_assets: bool,
+    target_has_risk_free_asset: bool,
+    strategy_mode: str,
+    kelly_fraction: float,
+    estimation_window: int,
+    risk_free_rate: float,
+    minimum_cash_reserve: float,
+    enable_cvar_constraint: bool,
+    cvar_confidence: float,
+    cvar_limit: float,
+    enable_drawdown_constraint: bool,
+    max_drawdown_limit: float,
+    history_rows: int = 0,
+) -> Dict[str, object]:
+    """Month-by-month value-averaging loop of ``backtest_kelly_dca`` on arrays.
+
+    ``nav`` is the [months, risky assets] NAV matrix in ``weights`` order and
+    ``rf_nav`` the RiskFree NAV, or None when the risk-free asset is unused.
+    ``shares`` is updated in place. Returns per-month portfolio values, unit
+    NAVs, asset values, RiskFree attribution and cash, plus the end state
+    and the last month's signals.
+
+    ``reference_nav`` and ``ma`` may start with ``history_rows`` months of an
+    earlier run that ``nav`` continues; those months only feed the signals.
+    """
+    months = len(nav)
+    can_use_risk_free_asset = rf_nav is not None
+    positive = np.flatnonzero(weights > 0)
+    buy_weights = weights[positive]
+    buy_fee_factors = 1 + buy_fees[positive]
+    sell_fee_factors = 1 - sell_fees[positive]
+    total_weight = buy_weights.sum()
+    avg_fee = 0.0
+    if total_weight > 0:
+        avg_fee = sum(buy_fees[positive] * buy_weights) / total_weight
+    with np.errstate(divide="ignore", invalid="ignore"):
+        reference_returns = reference_nav[1:] / reference_nav[:-1] - 1
+
+    values = np.empty(months)
+    unit_navs = np.empty(months)
+    asset_values = np.empty((months, len(weights)))
+    risk_free_values = np.empty(months)
+    cash_history = np.empty(months)
+    market_signal = "neutral"
+    allocation_signal = "neutral"
+    optimizer_info = None
+
+    for idx in range(months):
+        row = nav[idx]
+        rf_price = rf_nav[idx] if can_use_risk_free_asset else 0.0
+        current_equity_value = (shares * row).sum()
+        current_risk_free_value = (
+            risk_free_shares * rf_price if can_use_risk_free_asset else 0.0
+        )
+        wealth_pre = current_equity_value + current_risk_free_value + cash_balance
+        unit_nav = wealth_pre / total_units if total_units > 0 else 1.0
+        unit_navs[idx] = unit_nav
+
+        cash_balance += monthly_investment
+        accumulated_investment += monthly_investment
+        if unit_nav > 0:
+            total_units += monthly_investment / unit_nav
+
+        total_wealth = current_equity_value + current_risk_free_value + cash_balance
+
+        if not has_risky_assets:
+            tactical_ratio = 0.0
+            market_signal = "neutral"
+            allocation_signal = "neutral"
+            optimizer_info = dict(_NO_RISKY_ASSETS_INFO)
+        elif history_rows + idx == 0:
+            cash_cap_ratio = (
+                float(
+                    np.clip(
+                        (total_wealth - minimum_cash_reserve) / total_wealth,
+                        0.0,
+                        1.0,
+                    )
+                )
+                if total_wealth > 0
+                else 0.0
+            )
+            tactical_ratio = float(min(min_weight, max_weight, cash_cap_ratio))
+            market_signal = "neutral"
+            allocation_signal = "neutral"
+            optimizer_info = None
+        else:
+            signal = history_rows + idx - 1
+            current_price = reference_nav[signal]
+            current_ma = ma[signal]
+            market_signal = infer_valuation_signal(current_price, current_ma)
+            if strategy_mode == "legacy_linear":
+                tactical_ratio, allocation_signal = calculate_target_ratio(
+                    current_price, current_ma, min_weight, max_weight
+                )
+                optimizer_info = None
+            else:
+                hist = reference_returns[max(0, signal - estimation_window) : signal]
+                (
+                    tactical_ratio,
+                    allocation_signal,
+                    optimizer_info,
+                ) = target_ratio_optimized(
+                    hist,
+                    min_weight=min_weight,
+                    max_weight=max_weight,
+                    kelly_fraction=kelly_fraction,
+                    risk_free_rate=risk_free_rate,
+                    total_wealth=total_wealth,
+                    minimum_cash_reserve=minimum_cash_reserve,
+                    enable_cvar_constraint=enable_cvar_constraint,
+                    cvar_confidence=cvar_confidence,
+                    cvar_limit=cvar_limit,
+                    enable_drawdown_constraint=enable_drawdown_constraint,
+                    max_drawdown_limit=max_drawdown_limit,
+                )
+
+        final_target_risky_ratio = float(
+            np.clip(base_risky_ratio * tactical_ratio, 0.0, 1.0)
+        )
+        diff = total_wealth * final_target_risky_ratio - current_equity_value
+
+        if diff > 0:
+            buy_limit = monthly_investment * max_buy_multiplier
+            cash_for_buy = max(0.0, cash_balance - minimum_cash_reserve)
+            if can_use_risk_free_asset:
+                cash_for_buy += current_risk_free_value
+            max_buyable_with_fees = (
+                cash_for_buy / (1 + avg_fee) if avg_fee < 1 else cash_for_buy
+            )
+            buy_amount = min(diff, max_buyable_with_fees, buy_limit)
+
+            if buy_amount > 0:
+                amounts = buy_amount * buy_weights
+                total_cost_with_fees = _sequential_sum(amounts * buy_fee_factors)
+                shares[positive] += amounts / row[positive]
+
+                if can_use_risk_free_asset and total_cost_with_fees > cash_balance:
+                    redeem_needed = min(
+                        total_cost_with_fees - cash_balance, current_risk_free_value
+                    )
+                    if redeem_needed > 0:
+                        risk_free_shares -= redeem_needed / rf_price
+                        cash_balance += redeem_needed
+                cash_balance -= total_cost_with_fees
+        elif diff < 0:
+            if abs(diff) > total_wealth * sell_threshold:
+                sell_amount = abs(diff)
+                if sell_amount > 0:
+                    prices = row[positive]
+                    # No short selling: never sell more than is held.
+                    sold = np.minimum(
+                        sell_amount * buy_weights, shares[positive] * prices
+                    )
+                    selling = sold > 0
+                    net_proceeds = _sequential_sum(
+                        sold[selling] * sell_fee_factors[selling]
+                    )
+                    shares[positive[selling]] -= sold[selling] / prices[selling]
+                    cash_balance += net_proceeds
+
+        if can_use_risk_free_asset:
+            current_risk_free_value = risk_free_shares * rf_price
+            non_risky_after_risky_trades = current_risk_free_value + cash_balance
+
+            if target_has_risk_free_asset:
+                target_cash_balance = min(
+                    minimum_cash_reserve, non_risky_after_risky_trades
+                )
+                if cash_balance < target_cash_balance:
+                    redeem_needed = min(
+                        target_cash_balance - cash_balance, current_risk_free_value
+                    )
+                    if redeem_needed > 0:
+                        risk_free_shares -= redeem_needed / rf_price
+                        cash_balance += redeem_needed
+                elif cash_balance > target_cash_balance:
+                    rf_buy_amount = cash_balance - target_cash_balance
+                    if rf_buy_amount > 0:
+                        risk_free_shares += rf_buy_amount / rf_price
+                        cash_balance -= rf_buy_amount
+            elif current_risk_free_value > 0:
+                risk_free_shares = 0.0
+                cash_balance += current_risk_free_value
+
+        current_asset_values = shares * row
+        asset_values[idx] = current_asset_values
+        held_risk_free = risk_free_shares * rf_price if can_use_risk_free_asset else 0.0
+        risk_free_values[idx] = (
+            held_risk_free if can_use_risk_free_asset else cash_balance
+        )
+        cash_history[idx] = cash_balance
+        values[idx] = current_asset_values.sum() + held_risk_free + cash_balance
+
+    return {
+        "values": values,
+        "unit_navs": unit_navs,
+        "asset_values": asset_values,
+        "risk_free_values": risk_free_values,
+        "cash": cash_history,
+        "shares": shares,
+        "risk_free_shares": risk_free_shares,
+        "cash_balance": cash_balance,
+        "accumulated_investment": accumulated_investment,
+        "total_units": total_units,
+        "market_signal": market_signal,
+        "allocation_signal": allocation_signal,
+        "optimizer_info": optimizer_info,
+    }
+
+
+def _cvar_losses_batch(returns: np.ndarray, confidence: float) -> np.ndarray:
+    """``_cvar_losses`` without the per-row loop, for batched scenarios."""
+    losses = -returns
+    var_losses = np.percentile(losses, confidence * 100.0, axis=1, method="linear")
+    tail = losses >= var_losses[:, None]
+    counts = tail.sum(axis=1)
+    with np.errstate(invalid="ignore"):
+        tail_means = np.where(tail, losses, 0.0).sum(axis=1) / counts
+    return np.maximum(0.0, np.where(counts > 0, tail_means, var_losses))
+
+
+def _linear_target_ratios(
+    price: float, ma: np.ndarray, min_weight: np.ndarray, max_weight: np.ndarray
+) -> np.ndarray:
+    """``strategy.calculate_target_ratio`` for one price and N moving averages."""
+    low_bias, high_bias = 0.8, 1.2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bias = price / ma
+    slope = (min_weight - max_weight) / (high_bias - low_bias)
+    ratio = np.where(
+        bias <= low_bias,
+        max_weight,
+        np.where(bias >= high_bias, min_weight, slope * (bias - low_bias) + max_weight),
+    )
+    return np.where(ma == 0, min_weight, ratio)
+
+
+def _optimized_target_ratios(
+    hist: np.ndarray,
+    total_wealth: np.ndarray,
+    min_weight: np.ndarray,
+    max_weight: np.ndarray,
+    kelly_fraction: np.ndarray,
+    risk_free_rate: float,
+    minimum_cash_reserve: float,
+    enable_cvar_constraint: bool,
+    cvar_confidence: float,
+    cvar_limit: float,
+    enable_drawdown_constraint: bool,
+    max_drawdown_limit: float,
+) -> np.ndarray:
+    """``target_ratio_optimized`` for N scenarios sharing one return window.
+
+    The risk-ratio grid only depends on the window, so its CVaR and drawdown
+    are evaluated once; each scenario then adds its own upper bound, which
+    the scalar version appends to the grid.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cash_cap_ratio = np.where(
+            total_wealth > 0,
+            np.clip((total_wealth - minimum_cash_reserve) / total_wealth, 0.0, 1.0),
+            0.0,
+        )
+    effective_upper = np.minimum(max_weight, cash_cap_ratio)
+    if len(hist) < 3:
+        return np.minimum(min_weight, effective_upper)
+
+    rf_monthly = get_monthly_rf_return(risk_free_rate)
+    count = np.float64(hist.size)
+    mean = hist.sum() / count
+    variance = ((mean - hist) ** 2).sum() / (count - 1)
+    full_kelly = float(mean - rf_monthly) / float(max(variance, 1e-6))
+
+    final_upper = effective_upper
+    if enable_cvar_constraint or enable_drawdown_constraint:
+
+        def _feasible(ratios: np.ndarray) -> np.ndarray:
+            returns = (
+                ratios[:, None] * hist[None, :] + ((1 - ratios) * rf_monthly)[:, None]
+            )
+            ok = np.ones(len(ratios), dtype=bool)
+            if enable_cvar_constraint:
+                ok &= _cvar_losses_batch(returns, cvar_confidence) <= cvar_limit
+            if enable_drawdown_constraint:
+                ok &= _max_drawdowns(returns) <= max_drawdown_limit
+            return ok
+
+        grid = np.arange(
+            0.0, effective_upper.max() + RISK_RATIO_GRID_STEP, RISK_RATIO_GRID_STEP
+        )
+        feasible_grid = grid[_feasible(grid)]
+        # Largest feasible grid point at or below each scenario's upper bound.
+        below = np.searchsorted(feasible_grid, effective_upper, side="right")
+        best_on_grid = np.zeros(len(effective_upper))
+        if feasible_grid.size:
+            best_on_grid = np.where(
+                below > 0, feasible_grid[np.maximum(below - 1, 0)], 0.0
+            )
+        uppers, scenario_upper = np.unique(effective_upper, return_inverse=True)
+        upper_ok = _feasible(uppers)[scenario_upper]
+        max_feasible = np.where(upper_ok, effective_upper, best_on_grid)
+        max_feasible = np.where(effective_upper > 0, max_feasible, 0.0)
+        final_upper = np.minimum(effective_upper, max_feasible)
+
+    lower_bound = np.where(final_upper >= min_weight, min_weight, 0.0)
+    return np.clip(kelly_fraction * full_kelly, lower_bound, final_upper)
+
+
+def simulate_kelly_dca_batch(
+    nav: np.ndarray,
+    rf_nav: Optional[np.ndarray],
+    weights: np.ndarray,
+    buy_fees: np.ndarray,
+    sell_fees: np.ndarray,
+    reference_nav: np.ndarray,
+    ma: np.ndarray,
+    *,
+    kelly_fraction: np.ndarray,
+    min_weight: np.ndarray,
+    max_weight: np.ndarray,
+    sell_threshold: np.ndarray,
+    shares: np.ndarray,
+    risk_free_shares: float,
+    cash_balance: float,
+    accumulated_investment: float,
+    total_units: float,
+    monthly_investment: float,
+    max_buy_multiplier: float,
+    base_risky_ratio: float,
+    has_risky_assets: bool,
+    target_has_risk_free_asset: bool,
+    strategy_mode: str,
+    estimation_window: int,
+    risk_free_rate: float,
+    minimum_cash_reserve: float,
+    enable_cvar_constraint: bool,
+    cvar_confidence: float,
+    cvar_limit: float,
+    enable_drawdown_constraint: bool,
+    max_drawdown_limit: float,
+) -> Dict[str, np.ndarray]:
+    """``simulate_kelly_dca`` for N parameter sets advanced month by month together.
+
+    ``kelly_fraction``, ``min_weight``, ``max_weight`` and ``sell_threshold``
+    hold one value per scenario and ``ma`` is the [months, N] moving average
+    each scenario compares against. All scenarios start from the same
+    ``shares`` vector and balances. Holdings are [N, assets] arrays, so one
+    pass costs about as much as a few single runs; results agree with
+    ``simulate_kelly_dca`` to floating-point rounding, not bit for bit.
+    Returns [months, N] portfolio values and unit NAVs.
+    """
+    months = len(nav)
+    scenarios = len(kelly_fraction)
+    can_use_risk_free_asset = rf_nav is not None
+    positive = np.flatnonzero(weights > 0)
+    buy_weights = weights[positive]
+    buy_fee_factors = 1 + buy_fees[positive]
+    sell_fee_factors = 1 - sell_fees[positive]
+    total_weight = buy_weights.sum()
+    avg_fee = 0.0
+    if total_weight > 0:
+        avg_fee = sum(buy_fees[positive] * buy_weights) / total_weight
+    with np.errstate(divide="ignore", invalid="ignore"):
+        reference_returns = reference_nav[1:] / reference_nav[:-1] - 1
+
+    shares = np.tile(shares, (scenarios, 1))
+    risk_free_shares = np.full(scenarios, float(risk_free_shares))
+    cash_balance = np.full(scenarios, float(cash_balance))
+    total_units = np.full(scenarios, float(total_units))
+    zeros = np.zeros(scenarios)
+    values = np.empty((months, scenarios))
+    unit_navs = np.empty((months, scenarios))
+
+    for idx in range(months):
+        row = nav[idx]
+        rf_price = rf_nav[idx] if can_use_risk_free_asset else 0.0
+        current_equity_value = shares @ row
+        current_risk_free_value = (
+            risk_free_shares * rf_price if can_use_risk_free_asset else zeros
+        )
+        wealth_pre = current_equity_value + current_risk_free_value + cash_balance
+        with np.errstate(divide="ignore", invalid="ignore"):
+            unit_nav = np.where(total_units > 0, wealth_pre / total_units, 1.0)
+            unit_navs[idx] = unit_nav
+
+            cash_balance = cash_balance + monthly_investment
+            accumulated_investment += monthly_investment
+            total_units = np.where(
+                unit_nav > 0, total_units + monthly_investment / unit_nav, total_units
+            )
+        total_wealth = current_equity_value + current_risk_free_value + cash_balance
+
+        if not has_risky_assets:
+            tactical_ratio = zeros
+        elif idx == 0:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cash_cap_ratio = np.where(
+                    total_wealth > 0,
+                    np.clip(
+                        (total_wealth - minimum_cash_reserve) / total_wealth, 0.0, 1.0
+                    ),
+                    0.0,
+                )
+            tactical_ratio = np.minimum(
+                np.minimum(min_weight, max_weight), cash_cap_ratio
+            )
+        elif strategy_mode == "legacy_linear":
+            signal = idx - 1
+            tactical_ratio = _linear_target_ratios(
+                reference_nav[signal], ma[signal], min_weight, max_weight
+            )
+        else:
+            signal = idx - 1
+            tactical_ratio = _optimized_target_ratios(
+                reference_returns[max(0, signal - estimation_window) : signal],
+                total_wealth,
+                min_weight=min_weight,
+                max_weight=max_weight,
+                kelly_fraction=kelly_fraction,
+                risk_free_rate=risk_free_rate,
+                minimum_cash_reserve=minimum_cash_reserve,
+                enable_cvar_constraint=enable_cvar_constraint,
+                cvar_confidence=cvar_confidence,
+                cvar_limit=cvar_limit,
+                enable_drawdown_constraint=enable_drawdown_constraint,
+                max_drawdown_limit=max_drawdown_limit,
+            )
+
+        final_target_risky_ratio = np.clip(base_risky_ratio * tactical_ratio, 0.0, 1.0)
+        diff = total_wealth * final_target_risky_ratio - current_equity_value
+
+        if (diff > 0).any():
+            cash_for_buy = np.maximum(0.0, cash_balance - minimum_cash_reserve)
+            if can_use_risk_free_asset:
+                cash_for_buy = cash_for_buy + current_risk_free_value
+            max_buyable_with_fees = (
+                cash_for_buy / (1 + avg_fee) if avg_fee < 1 else cash_for_buy
+            )
+            buy_amount = np.minimum(
+                np.minimum(diff, max_buyable_with_fees),
+                monthly_investment * max_buy_multiplier,
+            )
+            buy_amount = np.where((diff > 0) & (buy_amount > 0), buy_amount, 0.0)
+            amounts = buy_amount[:, None] * buy_weights
+            total_cost_with_fees = amounts @ buy_fee_factors
+            shares[:, positive] += amounts / row[positive]
+
+            if can_use_risk_free_asset:
+                redeem_needed = np.where(
+                    (buy_amount > 0) & (total_cost_with_fees > cash_balance),
+                    np.minimum(
+                        total_cost_with_fees - cash_balance, current_risk_free_value
+                    ),
+                    0.0,
+                )
+                redeem_needed = np.maximum(redeem_needed, 0.0)
+                risk_free_shares = risk_free_shares - redeem_needed / rf_price
+                cash_balance = cash_balance + redeem_needed
+            cash_balance = cash_balance - total_cost_with_fees
+
+        selling = (diff < 0) & (np.abs(diff) > total_wealth * sell_threshold)
+        if selling.any():
+            sell_amount = np.where(selling, np.abs(diff), 0.0)
+            prices = row[positive]
+            # No short selling: never sell more than is held.
+            sold = np.minimum(
+                sell_amount[:, None] * buy_weights, shares[:, positive] * prices
+            )
+            sold = np.maximum(sold, 0.0)
+            shares[:, positive] -= sold / prices
+            cash_balance = cash_balance + sold @ sell_fee_factors
+
+        if can_use_risk_free_asset:
+            current_risk_free_value = risk_free_shares * rf_price
+            if target_has_risk_free_asset:
+                target_cash_balance = np.minimum(
+                    minimum_cash_reserve, current_risk_free_value + cash_balance
+                )
+                redeem_needed = np.where(
+                    cash_balance < target_cash_balance,
+                    np.maximum(
+                        np.minimum(
+                            target_cash_balance - cash_balance, current_risk_free_value
+                        ),
+                        0.0,
+                    ),
+                    0.0,
+                )
+                rf_buy_amount = np.where(
+                    cash_balance > target_cash_balance,
+                    cash_balance - target_cash_balance,
+                    0.0,
+                )
+                risk_free_shares = (
+                    risk_free_shares
+                    - redeem_needed / rf_price
+                    + rf_buy_amount / rf_price
+                )
+                cash_balance = cash_balance + redeem_needed - rf_buy_amount
+            else:
+                held = current_risk_free_value > 0
+                risk_free_shares = np.where(held, 0.0, risk_free_shares)
+                cash_balance = cash_balance + np.where(
+                    held, current_risk_free_value, 0.0
+                )
+
+        held_risk_free = (
+            risk_free_shares * rf_price if can_use_risk_free_asset else zeros
+        )
+        values[idx] = shares @ row + held_risk_free + cash_balance
+
+    return {
+        "values": values,
+        "unit_navs": unit_navs,
+        "shares": shares,
+        "risk_free_shares": risk_free_shares,
+        "cash_balance": cash_balance,
+        "accumulated_investment": accumulated_investment,
+        "total_units": total_units,
+    }
@@ -0,0 +1,132 @@
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple, Type
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    """Stop calling a failing upstream until it has had time to recover.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail immediately with ``CircuitOpenError``. Once ``reset_timeout``
+    seconds have passed a single trial call is let through (half-open); its
+    outcome closes or re-opens the circuit.
+
+    Exceptions of the ``ignore`` types still reached the upstream and got an
+    answer (e.g. "no such fund"), so they count as a success.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        ignore: Tuple[Type[BaseException], ...] = (),
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.ignore = ignore
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state_locked()
+
+    def _state_locked(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def _before_call(self) -> None:
+        with self._lock:
+            state = self._state_locked()
+            if state == "open" or (state == "half_open" and self._trial_in_flight):
+                raise CircuitOpenError(
+                    f"{self.name} circuit is open after {self._failures} consecutive failures"
+                )
+            if state == "half_open":
+                self._trial_in_flight = True
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        self._before_call()
+        try:
+            result = fn()
+        except self.ignore:
+            self._record_success()
+            raise
+        except Exception:
+            self._record_failure()
+            raise
+        self._record_success()
+        return result
+
+    async def call_async(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """``call`` for coroutine functions; sync and async callers share state."""
+        self._before_call()
+        try:
+            result = await fn()
+        except self.ignore:
+            self._record_success()
+            raise
+        except Exception:
+            self._record_failure()
+            raise
+        self._record_success()
+        return result
+
+    def _record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def _record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class CircuitBreakers:
+    """One ``CircuitBreaker`` per upstream host, created on first use.
+
+    A failing host opens only its own circuit, so an outage of one source
+    does not fail calls to the others.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        ignore: Tuple[Type[BaseException], ...] = (),
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.ignore = ignore
+        self._lock = threading.Lock()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(
+                    host, self.failure_threshold, self.reset_timeout, self.ignore
+                )
+            return breaker
+
+    def states(self) -> Dict[str, str]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.state for host, breaker in breakers.items()}
@@ -1,5 +1,8 @@
 # All module-level configuration constants for quant-compass backend.
 # FUND_LIST_CACHE lives in core/data.py (it is runtime state, not config).
+import os
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 MAX_SINGLE_WEIGHT = 0.5  # prevent over-concentration in a single fund
 MIN_WEIGHT_THRESHOLD = 0.01  # drop tiny weights that are hard to execute
@@ -16,3 +19,38 @@ RETURN_SHRINKAGE = 0.35
 COVARIANCE_SHRINKAGE = 0.20
 DEFAULT_APPLY_FUND_FEES_TO_HISTORY = False
 MIN_WALK_FORWARD_TRAIN_MONTHS = 24
+DATA_DIR = os.environ.get("QUANT_COMPASS_DATA_DIR", os.path.join(_BACKEND_DIR, "data"))
+NAV_STORE_PATH = os.path.join(DATA_DIR, "nav_store.sqlite3")
+NAV_PANEL_DIR = os.path.join(DATA_DIR, "panel")
+TRADING_CALENDAR_PATH = os.path.join(DATA_DIR, "trade_dates.csv")
+INGEST_CHECKPOINT_PATH = os.path.join(DATA_DIR, "ingest_checkpoint.json")
+MAX_CONCURRENT_FUND_FETCHES = 8  # upstream fetches in flight per request
+NAV_STALE_SERVE_DAYS = 7  # serve cached NAVs this old while revalidating
+UPSTREAM_FAILURE_THRESHOLD = 3  # consecutive failures that open the circuit
+UPSTREAM_RESET_SECONDS = 60
+UPSTREAM_ATTEMPT_TIMEOUT_SECONDS = 15  # per-attempt limit on the async fetch path
+UPSTREAM_RATE_PER_SECOND = 5.0  # token-bucket refill per upstream host
+UPSTREAM_BURST = 10
+UPSTREAM_MAX_CONCURRENCY_PER_HOST = 4
+UPSTREAM_MIN_RATE_PER_SECOND = 0.2  # floor of the adaptive slow-down
+NAV_JUMP_RATIO = 1.5  # day-over-day NAV move flagged as a spike or split
+UPSTREAM_CONNECT_TIMEOUT_SECONDS = 5
+UPSTREAM_READ_TIMEOUT_SECONDS = 10
+UPSTREAM_HTTP_POOL_SIZE = 2  # keep-alive connections per host not listed below
+UPSTREAM_HTTP_POOL_SIZES = {
+    # One connection per request the scheduler lets through concurrently.
+    "fund.eastmoney.com": UPSTREAM_MAX_CONCURRENCY_PER_HOST,
+    "finance.sina.com.cn": 1,
+}
+ALIGNED_PANEL_CACHE_SIZE = 128  # (codes, window, risk-free rate) panels kept
+DERIVED_SERIES_CACHE_SIZE = 256  # returns / fee-drag / reference NAVs kept
+FUND_LIST_SNAPSHOT_PATH = os.path.join(DATA_DIR, "fund_list.csv")
+FUND_LIST_TTL_SECONDS = 24 * 60 * 60
+FUND_LIST_RETRY_SECONDS = 5 * 60  # pause after a failed refresh before retrying
+MARKET_DATA_PROVIDER = os.environ.get("QUANT_COMPASS_PROVIDER", "akshare")
+LOCAL_NAV_DIR = os.environ.get("QUANT_COMPASS_LOCAL_NAV_DIR")
+SWEEP_MAX_COMBINATIONS = 20000  # parameter sets one /api/sweep request may run
+SWEEP_MIN_CHUNK = 32  # scenarios per worker task, so batching still pays off
+SWEEP_WORKERS = int(os.environ.get("QUANT_COMPASS_SWEEP_WORKERS", 0)) or (
+    os.cpu_count() or 1
+)
@@ -1,12 +1,593 @@
-import time
-from datetime import date
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional
 
-import akshare as ak
 import pandas as pd
 from fastapi import HTTPException
 
-FUND_LIST_CACHE = None
+from core.circuit_breaker import CircuitBreaker, CircuitBreakers
+from core.constants import (
+    ALIGNED_PANEL_CACHE_SIZE,
+    FUND_LIST_SNAPSHOT_PATH,
+    FUND_LIST_TTL_SECONDS,
+    LOCAL_NAV_DIR,
+    MARKET_DATA_PROVIDER,
+    MAX_CONCURRENT_FUND_FETCHES,
+    NAV_PANEL_DIR,
+    NAV_STALE_SERVE_DAYS,
+    NAV_STORE_PATH,
+    TRADING_CALENDAR_PATH,
+    UPSTREAM_FAILURE_THRESHOLD,
+    UPSTREAM_RESET_SECONDS,
+)
+from core.derived import get_fee_drag_nav
+from core.fund_list import FundListCache
+from core.fund_search import FundSearchIndex
+from core.http_pool import UpstreamHTTPPool
+from core.lru_cache import LRUCache
+from core.nav_panel import MANIFEST_FILENAME, NavPanel, build_nav_panel, open_nav_panel
+from core.nav_store import DAILY, NavStore
+from core.nav_validation import (
+    DUPLICATE_DATE,
+    MISSING_MONTH,
+    SPIKE,
+    SPLIT_LIKE_JUMP,
+    ZERO_NAV,
+    NavValidation,
+)
+from core.providers import FundDataError, MarketDataProvider, create_provider
+from core.scheduler import UpstreamScheduler
+from core.singleflight import AsyncSingleFlight, SingleFlight
+from core.trading_calendar import (
+    CN_TZ,
+    NavFreshnessPolicy,
+    TradingCalendar,
+    load_trading_calendar,
+    save_trading_calendar,
+    to_cn_time,
+)
+
+PROVIDER = None
+FUND_LIST_CACHE = FundListCache(
+    FUND_LIST_SNAPSHOT_PATH, FUND_LIST_TTL_SECONDS, lambda: fetch_fund_list()
+)
+FUND_SEARCH_INDEX = None
+NAV_STORE = None
+NAV_PANEL = None
+NAV_FRESHNESS_POLICY = None
+NAV_FETCH_FLIGHTS = SingleFlight()
+NAV_ASYNC_FETCH_FLIGHTS = AsyncSingleFlight()
+ALIGNED_PANEL_CACHE = LRUCache(ALIGNED_PANEL_CACHE_SIZE)
+UPSTREAM_SCHEDULER = UpstreamScheduler()
+UPSTREAM_HTTP_POOL = UpstreamHTTPPool()
+# Upstream calls outside the app and ingest runs (scripts, notebooks, tests)
+# still time out; those two install the pooled session on top.
+UPSTREAM_HTTP_POOL.install_fallback()
+UPSTREAM_BREAKERS = CircuitBreakers(
+    UPSTREAM_FAILURE_THRESHOLD, UPSTREAM_RESET_SECONDS, ignore=(FundDataError,)
+)
+_REVALIDATION_EXECUTOR = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="nav-revalidate"
+)
+_REVALIDATION_LOCK = threading.Lock()
+_REVALIDATING_CODES = set()
+
+
+def rebuild_fund_search_index(fund_list: pd.DataFrame) -> FundSearchIndex:
+    global FUND_SEARCH_INDEX
+    FUND_SEARCH_INDEX = FundSearchIndex(fund_list)
+    return FUND_SEARCH_INDEX
+
+
+FUND_LIST_CACHE.add_listener(rebuild_fund_search_index)
+
+
+def get_fund_search_index() -> FundSearchIndex:
+    """Search index over the current fund list.
+
+    The cache's refresh listener normally keeps it up to date; rebuilding here
+    covers a cache that was swapped out or loaded before the listener ran.
+    """
+    fund_list = FUND_LIST_CACHE.get()
+    index = FUND_SEARCH_INDEX
+    if index is None or index.frame is not fund_list:
+        index = rebuild_fund_search_index(fund_list)
+    return index
+
+
+def get_nav_store() -> NavStore:
+    global NAV_STORE
+    if NAV_STORE is None:
+        NAV_STORE = NavStore(NAV_STORE_PATH)
+    return NAV_STORE
+
+
+def get_nav_panel() -> Optional[NavPanel]:
+    """Return the shared month-end panel, reopening it after a rebuild."""
+    global NAV_PANEL
+    try:
+        manifest_mtime = os.path.getmtime(
+            os.path.join(NAV_PANEL_DIR, MANIFEST_FILENAME)
+        )
+    except OSError:
+        return None
+    if NAV_PANEL is None or NAV_PANEL.manifest_mtime != manifest_mtime:
+        NAV_PANEL = open_nav_panel(NAV_PANEL_DIR)
+    return NAV_PANEL
+
+
+def rebuild_nav_panel() -> NavPanel:
+    global NAV_PANEL
+    NAV_PANEL = build_nav_panel(get_nav_store(), NAV_PANEL_DIR)
+    return NAV_PANEL
+
+
+def get_provider() -> MarketDataProvider:
+    global PROVIDER
+    if PROVIDER is None:
+        PROVIDER = create_provider(
+            MARKET_DATA_PROVIDER, local_dir=LOCAL_NAV_DIR, scheduler=UPSTREAM_SCHEDULER
+        )
+    return PROVIDER
+
+
+def set_provider(provider: MarketDataProvider) -> None:
+    """Swap the market data source, e.g. to a LocalFileProvider for profiling."""
+    global PROVIDER
+    PROVIDER = provider
+
+
+def upstream_breaker(host: Optional[str]) -> CircuitBreaker:
+    """Circuit breaker of ``host``, or of the provider when it names none."""
+    return UPSTREAM_BREAKERS.get(host or get_provider().name)
+
+
+def fetch_fund_nav(code: str) -> pd.Series:
+    """Download the full daily unit-NAV history of ``code`` from the provider.
+
+    Calls go through the NAV host's circuit breaker so an outage fails fast
+    instead of every request sitting through the provider's retry backoff.
+    """
+    provider = get_provider()
+    return upstream_breaker(provider.nav_host).call(
+        lambda: provider.fetch_fund_nav(code)
+    )
+
+
+async def fetch_fund_nav_async(code: str) -> pd.Series:
+    """Awaitable ``fetch_fund_nav`` sharing the same circuit breaker."""
+    provider = get_provider()
+    return await upstream_breaker(provider.nav_host).call_async(
+        lambda: provider.fetch_fund_nav_async(code)
+    )
+
+
+def get_upstream_metrics() -> Dict[str, object]:
+    return {
+        "circuits": UPSTREAM_BREAKERS.states(),
+        "hosts": UPSTREAM_SCHEDULER.metrics(),
+        "http": UPSTREAM_HTTP_POOL.metrics(),
+    }
+
+
+def fetch_fund_list() -> pd.DataFrame:
+    provider = get_provider()
+    return upstream_breaker(provider.nav_host).call(provider.fetch_fund_list)
+
+
+def load_fund_nav(code: str, freq: str = DAILY) -> pd.Series:
+    """Return the NAV history of ``code`` at ``freq``, preferring the local store.
+
+    The eastmoney endpoint has no date-range parameter, so a refresh still
+    downloads the full history; the store skips that download entirely while
+    the series is fresh under the trading-calendar policy and only persists
+    rows newer than the last stored date.
+
+    Concurrent callers for the same code share a single in-flight load
+    instead of each hitting the upstream.
+
+    A stored series checked within ``NAV_STALE_SERVE_DAYS`` is returned
+    immediately while a background task revalidates it. Older series are
+    refreshed inline, but still served from the store if that refresh fails.
+
+    Weekly (``"W"``) and month-end (``"ME"``) series are pre-aggregated by
+    the store, so no frequency costs a resample here.
+    """
+    return NAV_FETCH_FLIGHTS.do(
+        (code, freq), lambda: _load_fund_nav_uncoalesced(code, freq)
+    )
+
+
+async def load_fund_nav_async(code: str, freq: str = DAILY) -> pd.Series:
+    """``load_fund_nav`` for the async handlers.
+
+    Store reads run on worker threads and the upstream fetch is awaited, so
+    the event loop keeps serving other requests while a fund downloads.
+    """
+    return await NAV_ASYNC_FETCH_FLIGHTS.do(
+        (code, freq), lambda: _load_fund_nav_uncoalesced_async(code, freq)
+    )
+
+
+def get_freshness_policy() -> NavFreshnessPolicy:
+    global NAV_FRESHNESS_POLICY
+    if NAV_FRESHNESS_POLICY is None:
+        NAV_FRESHNESS_POLICY = NavFreshnessPolicy(
+            load_trading_calendar(TRADING_CALENDAR_PATH)
+        )
+    return NAV_FRESHNESS_POLICY
+
+
+def refresh_trading_calendar() -> bool:
+    """Refresh the trade-date snapshot unless it already covers today."""
+    global NAV_FRESHNESS_POLICY
+    calendar = get_freshness_policy().calendar
+    if calendar.trade_dates and calendar.trade_dates[-1] >= date.today():
+        return False
+    try:
+        provider = get_provider()
+        trade_dates = upstream_breaker(provider.calendar_host).call(
+            provider.fetch_trade_dates
+        )
+    except Exception as e:
+        print(f"Trading calendar refresh failed, using weekdays: {e}")
+        return False
+    if not trade_dates:
+        return False
+    save_trading_calendar(trade_dates, TRADING_CALENDAR_PATH)
+    NAV_FRESHNESS_POLICY = NavFreshnessPolicy(TradingCalendar(trade_dates))
+    return True
+
+
+def is_nav_fresh(store: NavStore, code: str) -> bool:
+    """True when no NAV newer than the stored one can have been published."""
+    return get_freshness_policy().is_fresh(
+        store.last_date(code), store.checked_at(code)
+    )
+
+
+def fresh_nav_versions(store: NavStore, codes: List[str]) -> Dict[str, date]:
+    """Stored last NAV date of every code in ``codes`` that is fresh.
+
+    The metadata of the whole batch is read from the store at once.
+    """
+    policy = get_freshness_policy()
+    return {
+        code: last_date
+        for code, (last_date, checked_at) in store.meta(codes).items()
+        if policy.is_fresh(last_date, checked_at)
+    }
+
+
+def refresh_fund_nav(code: str) -> int:
+    """Fetch ``code`` from the provider and persist any new rows.
+
+    Workers on this host take turns per fund: one that waited while another
+    refreshed the same fund finds a newer check time in the shared store and
+    returns without calling upstream again.
+    """
+    store = get_nav_store()
+    checked_before = store.checked_at(code)
+    with store.refresh_lock(code):
+        if store.checked_at(code) != checked_before:
+            return 0
+        return store.append(code, fetch_fund_nav(code), checked_at=datetime.now(CN_TZ))
+
+
+async def refresh_fund_nav_async(code: str) -> int:
+    store = get_nav_store()
+    checked_before = await asyncio.to_thread(store.checked_at, code)
+    lock = store.refresh_lock(code)
+    await lock.acquire_async()
+    try:
+        if await asyncio.to_thread(store.checked_at, code) != checked_before:
+            return 0
+        nav = await fetch_fund_nav_async(code)
+        return await asyncio.to_thread(
+            store.append, code, nav, checked_at=datetime.now(CN_TZ)
+        )
+    finally:
+        lock.release()
+
+
+def schedule_nav_revalidation(code: str) -> bool:
+    with _REVALIDATION_LOCK:
+        if code in _REVALIDATING_CODES:
+            return False
+        _REVALIDATING_CODES.add(code)
+
+    def _run():
+        try:
+            refresh_fund_nav(code)
+        except Exception as e:
+            print(f"Background revalidation failed for {code}: {e}")
+        finally:
+            with _REVALIDATION_LOCK:
+                _REVALIDATING_CODES.discard(code)
+
+    _REVALIDATION_EXECUTOR.submit(_run)
+    return True
+
+
+def _stored_nav(store: NavStore, code: str, freq: str) -> (Optional[pd.Series], bool):
+    """Stored NAVs of ``code`` and whether they must be refreshed inline."""
+    cached = store.load(code, freq)
+    if cached is None:
+        return None, True
+    if is_nav_fresh(store, code):
+        return cached, False
+    checked_at = to_cn_time(store.checked_at(code))
+    if datetime.now(CN_TZ) - checked_at <= timedelta(days=NAV_STALE_SERVE_DAYS):
+        schedule_nav_revalidation(code)
+        return cached, False
+    return cached, True
+
+
+def _load_fund_nav_uncoalesced(code: str, freq: str) -> pd.Series:
+    store = get_nav_store()
+    cached, needs_refresh = _stored_nav(store, code, freq)
+    if not needs_refresh:
+        return cached
+
+    try:
+        # Loads of other frequencies share the refresh of the same fund.
+        NAV_FETCH_FLIGHTS.do(code, lambda: refresh_fund_nav(code))
+    except Exception as e:
+        if cached is None:
+            raise
+        print(f"Refresh failed for {code}, serving stored NAVs: {e}")
+        return cached
+
+    nav = store.load(code, freq)
+    if nav is None:
+        raise ValueError(f"No NAV data available for {code}")
+    return nav
+
+
+async def _load_fund_nav_uncoalesced_async(code: str, freq: str) -> pd.Series:
+    store = get_nav_store()
+    cached, needs_refresh = await asyncio.to_thread(_stored_nav, store, code, freq)
+    if not needs_refresh:
+        return cached
+
+    try:
+        await NAV_ASYNC_FETCH_FLIGHTS.do(code, lambda: refresh_fund_nav_async(code))
+    except Exception as e:
+        if cached is None:
+            raise
+        print(f"Refresh failed for {code}, serving stored NAVs: {e}")
+        return cached
+
+    nav = await asyncio.to_thread(store.load, code, freq)
+    if nav is None:
+        raise ValueError(f"No NAV data available for {code}")
+    return nav
+
+
+def stale_nav_warnings(fund_codes: List[str]) -> List[str]:
+    policy = get_freshness_policy()
+    warnings = []
+    for code, (last_date, checked_at) in get_nav_store().meta(fund_codes).items():
+        if last_date is None or policy.is_fresh(last_date, checked_at):
+            continue
+        warnings.append(
+            f"基金 {code} 的净值未能从数据源及时更新，本次使用截至 {last_date.isoformat()} 的缓存数据。"
+        )
+    return warnings
+
+
+_NAV_ANOMALY_WARNINGS = {
+    ZERO_NAV: "基金 {code} 有 {count} 个净值为零或为负的交易日（如 {first}），已在入库校验时剔除。",
+    SPIKE: "基金 {code} 有 {count} 个单日异常跳变的净值（如 {first}），已在入库校验时剔除。",
+    DUPLICATE_DATE: "基金 {code} 的数据源返回了 {count} 个重复日期（如 {first}），已保留每个日期的最后一条记录。",
+    MISSING_MONTH: "基金 {code} 缺少 {count} 个月份的净值（如 {first}），这些月份沿用上月净值。",
+    SPLIT_LIKE_JUMP: "基金 {code} 有 {count} 个交易日出现疑似拆分的净值跳变（如 {first}），相关月份的收益率可能失真。",
+}
+
+
+def get_nav_validation(code: str) -> Optional[NavValidation]:
+    return get_nav_store().validation(code)
+
+
+def nav_quality_warnings(
+    fund_codes: List[str], start: pd.Timestamp, end: pd.Timestamp
+) -> List[str]:
+    """Warnings from the ingest-time anomaly reports within ``[start, end]``.
+
+    ``start`` is widened to its month so anomalies behind the first
+    month-end NAV of the window are included.
+    """
+    lower = start.strftime("%Y-%m")
+    upper = end.strftime("%Y-%m-%d")
+    store = get_nav_store()
+    warnings = []
+    for code in dict.fromkeys(fund_codes):
+        validation = store.validation(code)
+        if validation is None:
+            continue
+        for anomaly in validation.anomalies:
+            # ISO dates and months compare correctly as strings.
+            dates = [d for d in anomaly["dates"] if lower <= d <= upper]
+            if dates:
+                warnings.append(
+                    _NAV_ANOMALY_WARNINGS[anomaly["kind"]].format(
+                        code=code, count=len(dates), first=dates[0]
+                    )
+                )
+    return warnings
+
+
+def load_fund_navs(
+    fund_codes: List[str],
+    max_workers: int = MAX_CONCURRENT_FUND_FETCHES,
+    freq: str = DAILY,
+) -> (Dict[str, pd.Series], Dict[str, Exception]):
+    """Load several funds with at most ``max_workers`` fetches in flight.
+
+    Both returned dicts follow the order of ``fund_codes`` (duplicates
+    collapsed), so callers get a deterministic column and error order no
+    matter which fetch finishes first.
+    """
+    unique_codes = list(dict.fromkeys(fund_codes))
+    if not unique_codes:
+        return {}, {}
+
+    workers = max(1, min(max_workers, len(unique_codes)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            code: executor.submit(load_fund_nav, code, freq) for code in unique_codes
+        }
+
+    navs = {}
+    errors = {}
+    for code, future in futures.items():
+        try:
+            navs[code] = future.result()
+        except Exception as e:
+            errors[code] = e
+    return navs, errors
+
+
+async def load_fund_navs_async(
+    fund_codes: List[str],
+    max_concurrency: int = MAX_CONCURRENT_FUND_FETCHES,
+    freq: str = DAILY,
+) -> (Dict[str, pd.Series], Dict[str, Exception]):
+    """``load_fund_navs`` on the event loop, bounded by a semaphore."""
+    unique_codes = list(dict.fromkeys(fund_codes))
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _load(code):
+        async with semaphore:
+            return await load_fund_nav_async(code, freq)
+
+    results = await asyncio.gather(
+        *(_load(code) for code in unique_codes), return_exceptions=True
+    )
+    navs = {}
+    errors = {}
+    for code, result in zip(unique_codes, results):
+        if isinstance(result, Exception):
+            errors[code] = result
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            navs[code] = result
+    return navs, errors
+
+
+def load_month_end_navs(
+    fund_codes: List[str], max_workers: int = MAX_CONCURRENT_FUND_FETCHES
+) -> (pd.DataFrame, Dict[str, Exception]):
+    """Month-end NAVs of the funds as one frame, from the shared panel where possible.
+
+    Fresh funds in the panel are selected from it together; everything else
+    is read from the store's pre-aggregated month-end series.
+    """
+    unique_codes = list(dict.fromkeys(fund_codes))
+    from_panel = _month_end_navs_from_panel(unique_codes)
+    navs, errors = load_fund_navs(
+        [code for code in unique_codes if code not in from_panel.columns],
+        max_workers=max_workers,
+        freq="ME",
+    )
+    return _merge_month_end_navs(unique_codes, from_panel, navs), errors
+
+
+async def load_month_end_navs_async(
+    fund_codes: List[str], max_concurrency: int = MAX_CONCURRENT_FUND_FETCHES
+) -> (pd.DataFrame, Dict[str, Exception]):
+    unique_codes = list(dict.fromkeys(fund_codes))
+    from_panel = await asyncio.to_thread(_month_end_navs_from_panel, unique_codes)
+    navs, errors = await load_fund_navs_async(
+        [code for code in unique_codes if code not in from_panel.columns],
+        max_concurrency=max_concurrency,
+        freq="ME",
+    )
+    return _merge_month_end_navs(unique_codes, from_panel, navs), errors
+
+
+def _month_end_navs_from_panel(unique_codes: List[str]) -> pd.DataFrame:
+    """Month-end NAVs of the fresh funds the panel holds.
+
+    A fund refreshed since the panel was built keeps its panel history and
+    only its month ends from the panel's last one on are read from the store:
+    appends recompute the store's periods from the previous last NAV onwards,
+    so nothing before that month can have changed.
+    """
+    panel = get_nav_panel()
+    if panel is None:
+        return pd.DataFrame()
+    store = get_nav_store()
+    versions = fresh_nav_versions(
+        store, [code for code in unique_codes if code in panel]
+    )
+    codes = []
+    tails = {}
+    for code, last_date in versions.items():
+        if last_date is None or last_date < panel.last_dates[code]:
+            continue
+        if last_date > panel.last_dates[code]:
+            tail = store.load(code, "ME", since=panel.last_period(code))
+            if tail is None:
+                continue
+            tails[code] = tail
+        codes.append(code)
+    if not codes:
+        return pd.DataFrame()
+
+    frame = panel.select(codes)
+    for code, tail in tails.items():
+        if tail.index[-1] > frame.index[-1]:
+            frame = frame.reindex(frame.index.union(tail.index))
+        # The selected columns are read-only views: replace, never write into.
+        column = frame[code].to_numpy(copy=True)
+        newer = frame.index >= panel.last_period(code)
+        column[newer] = tail.reindex(frame.index[newer]).to_numpy()
+        frame[code] = column
+    return frame
+
+
+def _merge_month_end_navs(
+    unique_codes: List[str],
+    from_panel: pd.DataFrame,
+    navs: Dict[str, pd.Series],
+) -> pd.DataFrame:
+    if from_panel.columns.empty:
+        merged = pd.DataFrame(navs)
+    elif navs:
+        merged = pd.concat([from_panel, pd.DataFrame(navs)], axis=1)
+    else:
+        merged = from_panel
+    columns = [code for code in unique_codes if code in merged.columns]
+    return merged if list(merged.columns) == columns else merged[columns]
+
+
+def aligned_panel_cache_key(
+    fund_codes: List[str],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    risk_free_rate: Optional[float],
+) -> Optional[tuple]:
+    """Key of an aligned panel, or None while any fund could still change.
+
+    The stored last NAV date of every fund is part of the key, so a panel
+    built before new NAVs arrived is never served afterwards.
+    """
+    codes = tuple(sorted(set(fund_codes)))
+    versions = fresh_nav_versions(get_nav_store(), list(codes))
+    if len(versions) < len(codes):
+        return None
+    return (
+        codes,
+        start_date,
+        end_date,
+        risk_free_rate,
+        tuple(versions[code] for code in codes),
+    )
 
 
 def get_fund_data(
@@ -14,68 +595,181 @@ def get_fund_data(
     start_date: Optional[date],
     end_date: Optional[date],
     risk_free_rate: Optional[float],
+    *,
+    max_workers: int = MAX_CONCURRENT_FUND_FETCHES,
 ) -> (pd.DataFrame, Dict[str, str], List[str]):
-    global FUND_LIST_CACHE
-    if FUND_LIST_CACHE is None:
-        try:
-            print("Initializing fund list cache...")
-            FUND_LIST_CACHE = ak.fund_name_em()
-            FUND_LIST_CACHE.set_index("基金代码", inplace=True)
-            print("Fund list cache initialized.")
-        except Exception as e:
-            raise HTTPException(
-                status_code=500, detail=f"Failed to initialize fund list cache: {e}"
-            )
+    fund_list = _get_fund_list()
+    if not fund_codes:
+        aligned = align_fund_panel(
+            pd.DataFrame(), fund_codes, start_date, end_date, risk_free_rate
+        )
+        return _assemble_fund_data(aligned, fund_codes, {}, [], risk_free_rate)
 
-    fund_data = {}
-    fund_names = {}
     warnings = []
+    cached = _cached_aligned_panel(fund_codes, start_date, end_date, risk_free_rate)
+    if cached is None:
+        fund_data, fund_errors = load_month_end_navs(
+            fund_codes, max_workers=max_workers
+        )
+        cached, warnings = _align_and_cache(
+            fund_data, fund_errors, fund_codes, start_date, end_date, risk_free_rate
+        )
+    return _assemble_fund_data(
+        cached, fund_codes, _fund_names(fund_list, fund_codes), warnings, risk_free_rate
+    )
+
+
+async def get_fund_data_async(
+    fund_codes: List[str],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    risk_free_rate: Optional[float],
+    *,
+    max_concurrency: int = MAX_CONCURRENT_FUND_FETCHES,
+) -> (pd.DataFrame, Dict[str, str], List[str]):
+    """``get_fund_data`` for ``async def`` handlers.
+
+    Upstream fetches are awaited (with async retries and per-attempt
+    timeouts) and blocking store, cache and alignment work runs on worker
+    threads, so a slow fund never stalls the event loop.
+    """
+    fund_list = await asyncio.to_thread(_get_fund_list)
+    if not fund_codes:
+        aligned = await asyncio.to_thread(
+            align_fund_panel,
+            pd.DataFrame(),
+            fund_codes,
+            start_date,
+            end_date,
+            risk_free_rate,
+        )
+        return _assemble_fund_data(aligned, fund_codes, {}, [], risk_free_rate)
+
+    warnings = []
+    cached = await asyncio.to_thread(
+        _cached_aligned_panel, fund_codes, start_date, end_date, risk_free_rate
+    )
+    if cached is None:
+        fund_data, fund_errors = await load_month_end_navs_async(
+            fund_codes, max_concurrency=max_concurrency
+        )
+        cached, warnings = await asyncio.to_thread(
+            _align_and_cache,
+            fund_data,
+            fund_errors,
+            fund_codes,
+            start_date,
+            end_date,
+            risk_free_rate,
+        )
+    return _assemble_fund_data(
+        cached, fund_codes, _fund_names(fund_list, fund_codes), warnings, risk_free_rate
+    )
+
+
+def _get_fund_list() -> pd.DataFrame:
+    try:
+        return FUND_LIST_CACHE.get()
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Failed to initialize fund list cache: {e}"
+        )
+
+
+def _fund_names(fund_list: pd.DataFrame, fund_codes: List[str]) -> Dict[str, str]:
+    fund_names = {}
+    for code in fund_codes:
+        try:
+            fund_names[code] = fund_list.loc[code, "基金简称"]
+        except KeyError:
+            fund_names[code] = f"{code} (名称未找到)"
+    return fund_names
+
+
+def _cached_aligned_panel(
+    fund_codes: List[str],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    risk_free_rate: Optional[float],
+) -> Optional[tuple]:
+    cache_key = aligned_panel_cache_key(
+        fund_codes, start_date, end_date, risk_free_rate
+    )
+    return ALIGNED_PANEL_CACHE.get(cache_key) if cache_key is not None else None
+
+
+def _align_and_cache(
+    fund_data: pd.DataFrame,
+    fund_errors: Dict[str, Exception],
+    fund_codes: List[str],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    risk_free_rate: Optional[float],
+) -> (tuple, List[str]):
+    if fund_errors:
+        raise HTTPException(
+            status_code=400,
+            detail="；".join(
+                f"获取基金 {code} 的净值数据时发生错误: {e}"
+                for code, e in fund_errors.items()
+            ),
+        )
+    warnings = stale_nav_warnings(list(fund_data))
+    df_processed, align_warnings = align_fund_panel(
+        fund_data, fund_codes, start_date, end_date, risk_free_rate
+    )
+    # Quality warnings describe the data, not the request, so they are cached
+    # with the panel and shown on every hit.
+    aligned = (
+        df_processed,
+        align_warnings
+        + nav_quality_warnings(
+            list(fund_data), df_processed.index[0], df_processed.index[-1]
+        ),
+    )
+    cache_key = aligned_panel_cache_key(
+        fund_codes, start_date, end_date, risk_free_rate
+    )
+    if cache_key is not None:
+        ALIGNED_PANEL_CACHE.put(cache_key, aligned)
+    return aligned, warnings
+
+
+def _assemble_fund_data(
+    aligned: tuple,
+    fund_codes: List[str],
+    fund_names: Dict[str, str],
+    warnings: List[str],
+    risk_free_rate: Optional[float],
+) -> (pd.DataFrame, Dict[str, str], List[str]):
+    df_processed, align_warnings = aligned
     if fund_codes:
-        for code in fund_codes:
-            try:
-                try:
-                    fund_names[code] = FUND_LIST_CACHE.loc[code, "基金简称"]
-                except KeyError:
-                    fund_names[code] = f"{code} (名称未找到)"
-
-                # Implement simple retry logic with exponential backoff
-                # Increased retries and reduced timeout as requested by user
-                max_retries = 5
-                retry_delay = 1
-                fund_nav = None
-
-                for attempt in range(max_retries):
-                    try:
-                        fund_nav = ak.fund_open_fund_info_em(
-                            symbol=code, indicator="单位净值走势"
-                        )
-                        break
-                    except Exception as e:
-                        if attempt == max_retries - 1:
-                            raise e
-                        # Log to console for debugging
-                        print(
-                            f"Attempt {attempt + 1}/{max_retries} failed for {code}: {e}. Retrying in {retry_delay}s..."
-                        )
-                        time.sleep(retry_delay)
-                        retry_delay *= 2
-
-                if fund_nav is None:
-                    raise ValueError(
-                        f"Failed to fetch data for {code} after {max_retries} attempts"
-                    )
+        # Cached panels are shared between requests: hand out a copy in the
+        # caller's column order.
+        columns = list(dict.fromkeys(fund_codes))
+        if "RiskFree" in df_processed.columns:
+            columns.append("RiskFree")
+        df_processed = df_processed[columns].copy()
 
-                fund_nav["净值日期"] = pd.to_datetime(fund_nav["净值日期"])
-                fund_nav = fund_nav.set_index("净值日期")["单位净值"].astype(float)
-                fund_data[code] = fund_nav.resample("ME").last()
+    if risk_free_rate is not None:
+        fund_names["RiskFree"] = "无风险资产"
+    return df_processed, fund_names, list(warnings) + list(align_warnings)
 
-            except Exception as e:
-                raise HTTPException(
-                    status_code=400, detail=f"获取基金 {code} 的净值数据时发生错误: {e}"
-                )
 
-    df = pd.DataFrame(fund_data)
-    df = df.sort_index()
+def align_fund_panel(
+    fund_data: pd.DataFrame,
+    fund_codes: List[str],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    risk_free_rate: Optional[float],
+) -> (pd.DataFrame, List[str]):
+    """Align month-end NAV columns on their common window and add the RiskFree NAV."""
+    warnings = []
+    if fund_data.index.is_monotonic_increasing:
+        # Shallow: panel columns stay views, RiskFree is added to this frame only.
+        df = fund_data.copy(deep=False)
+    else:
+        df = fund_data.sort_index()
 
     if not df.empty:
         latest_start_date = max(
@@ -105,7 +799,6 @@ def get_fund_data(
         rf_returns = pd.Series(monthly_rf_return, index=rf_index)
         rf_nav = (1 + rf_returns).cumprod()
         df["RiskFree"] = rf_nav
-        fund_names["RiskFree"] = "无风险资产"
 
     if actual_start > user_start and fund_codes:
         warnings.append(
@@ -123,18 +816,14 @@ def get_fund_data(
     if df_processed.empty:
         raise HTTPException(status_code=400, detail="数据处理后为空，无法进行分析。")
 
-    return df_processed, fund_names, warnings
+    return df_processed, warnings
 
 
 def apply_fund_fee_drag(
     df_nav: pd.DataFrame, fund_fees: Dict[str, float]
 ) -> pd.DataFrame:
-    monthly_returns = df_nav.pct_change().fillna(0)
-    for code in monthly_returns.columns:
-        if code == "RiskFree":
-            continue
-        monthly_returns[code] -= fund_fees.get(code, 0.0) / 12
-    return (1 + monthly_returns).cumprod()
+    # The memoized frame is shared between requests; callers get their own copy.
+    return get_fee_drag_nav(df_nav, fund_fees).copy()
 
 
 def prepare_nav_for_analysis(
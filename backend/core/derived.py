@@ -0,0 +1,92 @@
+import hashlib
+from typing import Callable, Dict, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.constants import DERIVED_SERIES_CACHE_SIZE
+from core.lru_cache import LRUCache
+
+DERIVED_SERIES_CACHE = LRUCache(DERIVED_SERIES_CACHE_SIZE)
+
+
+def panel_fingerprint(frame: pd.DataFrame) -> bytes:
+    """Content identity of a NAV panel: values, dates and column labels.
+
+    Hashing the raw buffers is an order of magnitude cheaper than a pandas
+    transform, and unlike ``id(frame)`` it survives the defensive copies
+    ``get_fund_data`` hands out, so equal panels share entries across
+    requests while slices and edited frames never collide with the original.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(frame.to_numpy(dtype=float)).tobytes())
+    index = frame.index
+    if isinstance(index, pd.DatetimeIndex):
+        digest.update(index.asi8.tobytes())
+    else:
+        digest.update(pd.util.hash_array(np.asarray(index, dtype=object)).tobytes())
+    digest.update("\x1f".join(map(str, frame.columns)).encode())
+    return digest.digest()
+
+
+def _memoize(
+    name: str, frame: pd.DataFrame, params: Hashable, compute: Callable[[], object]
+):
+    key = (name, panel_fingerprint(frame), params)
+    value = DERIVED_SERIES_CACHE.get(key)
+    if value is None:
+        value = compute()
+        DERIVED_SERIES_CACHE.put(key, value)
+    return value
+
+
+def get_monthly_returns(df_nav: pd.DataFrame) -> pd.DataFrame:
+    """``df_nav.pct_change().fillna(0)``, shared between callers.
+
+    The result is cached and must be treated as read-only.
+    """
+    return _memoize("returns", df_nav, None, lambda: df_nav.pct_change().fillna(0))
+
+
+def get_fee_drag_nav(df_nav: pd.DataFrame, fund_fees: Dict[str, float]) -> pd.DataFrame:
+    """NAV rebased to 1 after deducting each fund's annual fee monthly.
+
+    The result is cached and must be treated as read-only.
+    """
+
+    def _compute():
+        drag = pd.Series(
+            [
+                0.0 if code == "RiskFree" else fund_fees.get(code, 0.0) / 12
+                for code in df_nav.columns
+            ],
+            index=df_nav.columns,
+        )
+        return (1 + (get_monthly_returns(df_nav) - drag)).cumprod()
+
+    params = tuple(sorted((str(k), float(v)) for k, v in fund_fees.items()))
+    return _memoize("fee_drag", df_nav, params, _compute)
+
+
+def get_reference_portfolio_nav(df_nav: pd.DataFrame, weights: pd.Series) -> pd.Series:
+    """``df_nav[weights.index].dot(weights)``, shared between callers.
+
+    Accumulated column by column rather than through BLAS, whose row blocking
+    makes a month's value depend on its position in the panel; this way a
+    backtest resumed over new rows sees the same reference NAV as a full run.
+
+    The result is cached and must be treated as read-only.
+    """
+    params: Tuple = (
+        tuple(map(str, weights.index)),
+        tuple(float(w) for w in weights.to_numpy()),
+    )
+
+    def _compute():
+        values = df_nav[weights.index].to_numpy(dtype=float)
+        nav = np.zeros(len(df_nav))
+        for position, weight in enumerate(weights.to_numpy(dtype=float)):
+            nav += values[:, position] * weight
+        return pd.Series(nav, index=df_nav.index)
+
+    return _memoize("reference_nav", df_nav, params, _compute)
@@ -0,0 +1,64 @@
+import asyncio
+import os
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks degrade to no-ops, workers just don't coordinate.
+    fcntl = None
+
+# Async waiters retry a busy lock at this interval instead of blocking a thread.
+_ASYNC_POLL_SECONDS = 0.02
+
+
+class FileLock:
+    """Exclusive advisory lock on ``path``, shared by every process on the host.
+
+    Backed by ``flock``, so it is held per open file: two ``FileLock``
+    objects on the same path exclude each other whether they live in one
+    process or in different uvicorn workers, and the OS releases the lock if
+    the holder dies. An instance is not re-entrant.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        self._fd: Optional[int] = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if self._fd is not None:
+            raise RuntimeError(f"{self.path} is already held by this FileLock")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                os.close(fd)
+                return False
+        self._fd = fd
+        return True
+
+    async def acquire_async(self) -> None:
+        while not self.acquire(blocking=False):
+            await asyncio.sleep(_ASYNC_POLL_SECONDS)
+
+    def release(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+    @property
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
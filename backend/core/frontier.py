@@ -1,14 +1,14 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import numpy as np
 import pandas as pd
-from scipy.optimize import minimize
 
 from core.constants import (
     COVARIANCE_SHRINKAGE,
     MIN_WALK_FORWARD_TRAIN_MONTHS,
     MIN_WEIGHT_THRESHOLD,
 )
+from core.derived import get_monthly_returns
 from core.portfolio import (
     get_effective_single_weight_cap,  # noqa: F401
     get_frontier_initial_guess,
@@ -21,6 +21,13 @@ from core.portfolio import (
 from core.risk import calculate_drawdown_from_returns
 
 
+def minimize(*args, **kwargs):
+    """``scipy.optimize.minimize``, imported on first use to keep startup fast."""
+    from scipy.optimize import minimize as scipy_minimize
+
+    return scipy_minimize(*args, **kwargs)
+
+
 def append_frontier_stability_warnings(
     warnings: List[str], df_nav: pd.DataFrame, fund_fees: Dict[str, float]
 ):
@@ -37,8 +44,11 @@ def append_frontier_stability_warnings(
         return
 
     full_frontier = calculate_efficient_frontier(df_nav, fund_fees)
+    # Returns of a leading slice are the leading rows of the full returns.
     first_half = calculate_efficient_frontier(
-        df_nav.iloc[: len(df_nav) // 2], fund_fees
+        df_nav.iloc[: len(df_nav) // 2],
+        fund_fees,
+        monthly_returns=get_monthly_returns(df_nav).iloc[: len(df_nav) // 2],
     )
     second_half = calculate_efficient_frontier(
         df_nav.iloc[len(df_nav) // 2 :], fund_fees
@@ -60,23 +70,24 @@ def append_frontier_stability_warnings(
         )
 
 
-def calculate_efficient_frontier(df, fund_fees):
+def calculate_efficient_frontier(
+    df, fund_fees, monthly_returns: Optional[pd.DataFrame] = None
+):
+    if monthly_returns is None:
+        monthly_returns = get_monthly_returns(df)
+
     if list(df.columns) == ["RiskFree"]:
-        monthly_returns = df.pct_change().fillna(0)
         expected_return = monthly_returns["RiskFree"].mean()
         return [
             {"risk": 0, "return": expected_return * 12, "weights": {"RiskFree": 1.0}}
         ]
 
     if len(df.columns) == 1:
-        monthly_returns = df.pct_change().fillna(0)
         code = df.columns[0]
         expected_return = float(monthly_returns[code].mean() * 12)
         risk = float(monthly_returns[code].std(ddof=0) * np.sqrt(12))
         return [{"risk": risk, "return": expected_return, "weights": {code: 1.0}}]
 
-    monthly_returns = df.pct_change().fillna(0)
-
     raw_expected_returns = monthly_returns.mean()
     cov_matrix = monthly_returns.cov()
     if "RiskFree" in cov_matrix.columns:
@@ -218,7 +229,7 @@ def calculate_frontier_walk_forward_metrics(
     if not full_frontier:
         return []
 
-    returns = df_nav.pct_change().fillna(0)
+    returns = get_monthly_returns(df_nav)
     metrics = [
         {"oos_returns": [], "weight_drifts": []} for _ in range(len(full_frontier))
     ]
@@ -229,7 +240,9 @@ def calculate_frontier_walk_forward_metrics(
 
     for split_end in range(min_train_months, len(df_nav)):
         train_df = df_nav.iloc[:split_end]
-        train_frontier = calculate_efficient_frontier(train_df, fund_fees)
+        train_frontier = calculate_efficient_frontier(
+            train_df, fund_fees, monthly_returns=returns.iloc[:split_end]
+        )
         if not train_frontier:
             continue
 
@@ -0,0 +1,217 @@
+import os
+import threading
+import time
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from core.constants import FUND_LIST_RETRY_SECONDS
+from core.file_lock import FileLock
+
+
+class FundListCache:
+    """Thread-safe cache of the fund universe returned by ``fetch``.
+
+    The list is persisted as a CSV snapshot so a restarted worker can serve
+    names immediately. Once the in-memory copy is older than ``ttl_seconds``
+    it is refreshed in the background; a failed refresh keeps the last good
+    snapshot in place, and upstream is not tried again for ``retry_seconds``.
+    The snapshot is shared by every worker on the host:
+    refreshes take a file lock so only one worker calls upstream per TTL,
+    and the others install the newer snapshot on their next ``get``.
+
+    Listeners are called with every newly installed list, so derived
+    structures such as the search index are rebuilt off the request path.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        ttl_seconds: float,
+        fetch: Callable[[], pd.DataFrame],
+        retry_seconds: float = FUND_LIST_RETRY_SECONDS,
+    ):
+        self.snapshot_path = str(snapshot_path)
+        self._refresh_lock_path = f"{self.snapshot_path}.lock"
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self.fetch = fetch
+        self._lock = threading.Lock()
+        self._frame: Optional[pd.DataFrame] = None
+        self._loaded_at = 0.0
+        self._retry_after = 0.0
+        self._refreshing = False
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[pd.DataFrame], None]] = []
+
+    def add_listener(self, callback: Callable[[pd.DataFrame], None]) -> None:
+        self._listeners.append(callback)
+
+    def _notify(self, frame: pd.DataFrame) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(frame)
+            except Exception as e:
+                print(f"Fund list listener {callback!r} failed: {e}")
+
+    def get(self) -> pd.DataFrame:
+        """Return the fund list indexed by ``基金代码``.
+
+        Only the very first call on a machine without a snapshot blocks on
+        the upstream download; afterwards stale data is served while a
+        background refresh runs.
+        """
+        with self._lock:
+            frame = self._frame
+        if frame is None:
+            frame = self.load_snapshot()
+            if frame is None:
+                wait = self._retry_wait()
+                if wait > 0:
+                    raise RuntimeError(
+                        f"Fund list unavailable, next upstream attempt in {wait:.0f}s"
+                    )
+                return self.refresh(raise_on_error=True)
+        else:
+            newer = self._install_newer_snapshot()
+            if newer is not None:
+                frame = newer
+        with self._lock:
+            stale = time.time() - self._loaded_at >= self.ttl_seconds
+        if stale and self._retry_wait() <= 0:
+            self.refresh_in_background()
+        return frame
+
+    def _retry_wait(self) -> float:
+        """Seconds until upstream may be tried again after a failed refresh."""
+        with self._lock:
+            return self._retry_after - time.time()
+
+    def load_snapshot(self) -> Optional[pd.DataFrame]:
+        if not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            frame = pd.read_csv(self.snapshot_path, dtype=str).set_index("基金代码")
+        except Exception as e:
+            print(f"Failed to read fund list snapshot {self.snapshot_path}: {e}")
+            return None
+        with self._lock:
+            installed = self._frame is None
+            if installed:
+                self._frame = frame
+                self._loaded_at = os.path.getmtime(self.snapshot_path)
+            frame = self._frame
+        if installed:
+            self._notify(frame)
+        return frame
+
+    def _install_newer_snapshot(self) -> Optional[pd.DataFrame]:
+        """Install a snapshot another worker wrote after ours was loaded."""
+        mtime = self._snapshot_mtime()
+        if not mtime:
+            return None
+        with self._lock:
+            if self._frame is not None and mtime <= self._loaded_at:
+                return None
+        try:
+            frame = pd.read_csv(self.snapshot_path, dtype=str).set_index("基金代码")
+        except Exception as e:
+            print(f"Failed to read fund list snapshot {self.snapshot_path}: {e}")
+            return None
+        with self._lock:
+            self._frame = frame
+            self._loaded_at = mtime
+        self._notify(frame)
+        return frame
+
+    def refresh(self, *, raise_on_error: bool = False) -> Optional[pd.DataFrame]:
+        requested = time.time()
+        with FileLock(self._refresh_lock_path):
+            if self._snapshot_mtime() >= requested:
+                # Another worker refreshed while this one waited for the lock.
+                frame = self._install_newer_snapshot()
+                if frame is not None:
+                    return frame
+            try:
+                print("Refreshing fund list cache...")
+                frame = self.fetch().astype(str).set_index("基金代码")
+            except Exception as e:
+                print(f"Fund list refresh failed, keeping last good snapshot: {e}")
+                with self._lock:
+                    self._retry_after = time.time() + self.retry_seconds
+                    last_good = self._frame
+                if raise_on_error:
+                    raise
+                return last_good
+
+            self._write_snapshot(frame)
+            with self._lock:
+                self._frame = frame
+                self._loaded_at = time.time()
+                self._retry_after = 0.0
+        print(f"Fund list cache refreshed ({len(frame)} funds).")
+        self._notify(frame)
+        return frame
+
+    def _snapshot_mtime(self) -> float:
+        try:
+            return os.path.getmtime(self.snapshot_path)
+        except OSError:
+            return 0.0
+
+    def refresh_in_background(self) -> bool:
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+
+        def _run():
+            try:
+                self.refresh()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=_run, name="fund-list-refresh", daemon=True).start()
+        return True
+
+    def start(self) -> None:
+        """Warm the cache from disk and keep it fresh on a daemon thread."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._stop.clear()
+
+        def _run():
+            self.load_snapshot()
+            while not self._stop.is_set():
+                self._install_newer_snapshot()
+                with self._lock:
+                    age = time.time() - self._loaded_at
+                if age >= self.ttl_seconds and self._retry_wait() <= 0:
+                    self.refresh()
+                    with self._lock:
+                        age = time.time() - self._loaded_at
+                # A failed refresh is retried once its backoff has passed
+                # instead of after a full TTL.
+                wait = max(self.ttl_seconds - age, self._retry_wait())
+                self._stop.wait(wait if wait > 0 else self.retry_seconds)
+
+        self._worker = threading.Thread(
+            target=_run, name="fund-list-cache", daemon=True
+        )
+        self._worker.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _write_snapshot(self, frame: pd.DataFrame) -> None:
+        directory = os.path.dirname(self.snapshot_path)
+        try:
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.snapshot_path}.tmp"
+            frame.reset_index().to_csv(tmp_path, index=False)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"Failed to persist fund list snapshot: {e}")
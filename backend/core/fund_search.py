@@ -0,0 +1,119 @@
+import bisect
+from collections import defaultdict
+from typing import Dict, List, Optional, Set
+
+import pandas as pd
+
+
+def _grams(text: str) -> Set[str]:
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+class FundSearchIndex:
+    """In-memory lookup over the fund universe.
+
+    Codes are kept sorted for prefix range scans; names and pinyin initials
+    get character-bigram posting lists so a substring query only verifies
+    the few funds sharing every bigram with it instead of scanning 10k+ rows.
+    """
+
+    def __init__(self, fund_list: pd.DataFrame):
+        self.frame = fund_list
+        codes = [str(code) for code in fund_list.index]
+        names = self._column(fund_list, "基金简称", codes)
+        initials = [value.upper() for value in self._column(fund_list, "拼音缩写")]
+        fund_types = self._column(fund_list, "基金类型")
+
+        order = sorted(range(len(codes)), key=lambda idx: codes[idx])
+        self.codes = [codes[idx] for idx in order]
+        self.names = [names[idx] for idx in order]
+        self.initials = [initials[idx] for idx in order]
+        self.fund_types = [fund_types[idx] for idx in order]
+
+        self._name_grams = self._build_postings(self.names)
+        self._initial_grams = self._build_postings(self.initials)
+
+    @staticmethod
+    def _column(
+        frame: pd.DataFrame, column: str, default: Optional[List[str]] = None
+    ) -> List[str]:
+        if column in frame.columns:
+            return ["" if pd.isna(v) else str(v) for v in frame[column]]
+        return list(default) if default is not None else [""] * len(frame)
+
+    @staticmethod
+    def _build_postings(values: List[str]) -> Dict[str, Set[int]]:
+        postings = defaultdict(set)
+        for idx, value in enumerate(values):
+            for gram in _grams(value):
+                postings[gram].add(idx)
+            # Single characters stay searchable for one-character queries.
+            for char in set(value):
+                postings[char].add(idx)
+        return dict(postings)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def _code_prefix(self, prefix: str) -> range:
+        start = bisect.bisect_left(self.codes, prefix)
+        stop = bisect.bisect_left(self.codes, prefix + "￿")
+        return range(start, stop)
+
+    @staticmethod
+    def _substring(
+        postings: Dict[str, Set[int]], values: List[str], query: str
+    ) -> List[int]:
+        candidates = None
+        for gram in sorted(_grams(query), key=lambda g: len(postings.get(g, ()))):
+            matches = postings.get(gram)
+            if not matches:
+                return []
+            candidates = set(matches) if candidates is None else candidates & matches
+            if not candidates:
+                return []
+        return sorted(idx for idx in candidates or () if query in values[idx])
+
+    def search(self, query: str, limit: int = 20) -> List[Dict[str, str]]:
+        """Rank code prefixes first, then pinyin-initial and name matches."""
+        query = query.strip()
+        if not query or limit <= 0:
+            return []
+
+        ordered: List[int] = []
+        seen: Set[int] = set()
+
+        def _extend(indices):
+            for idx in indices:
+                if idx not in seen:
+                    seen.add(idx)
+                    ordered.append(idx)
+                    if len(ordered) >= limit:
+                        return True
+            return False
+
+        upper = query.upper()
+        initial_matches = self._substring(self._initial_grams, self.initials, upper)
+        name_matches = self._substring(self._name_grams, self.names, query)
+        groups = [
+            self._code_prefix(query) if query.isdigit() else [],
+            [idx for idx in initial_matches if self.initials[idx].startswith(upper)],
+            [idx for idx in name_matches if self.names[idx].startswith(query)],
+            name_matches,
+            initial_matches,
+        ]
+        for group in groups:
+            if _extend(group):
+                break
+
+        return [
+            {
+                "code": self.codes[idx],
+                "name": self.names[idx],
+                "pinyin_initials": self.initials[idx],
+                "fund_type": self.fund_types[idx],
+            }
+            for idx in ordered
+        ]
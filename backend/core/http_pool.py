@@ -0,0 +1,199 @@
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from core.constants import (
+    UPSTREAM_CONNECT_TIMEOUT_SECONDS,
+    UPSTREAM_HTTP_POOL_SIZE,
+    UPSTREAM_HTTP_POOL_SIZES,
+    UPSTREAM_READ_TIMEOUT_SECONDS,
+)
+
+
+# The module-level helper as requests ships it, before any pool patches it.
+_PLAIN_REQUEST = requests.api.request
+
+
+class _HostCounters:
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+
+
+class _ConnectionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostCounters] = {}
+
+    def _host_locked(self, host: str) -> _HostCounters:
+        counters = self._hosts.get(host)
+        if counters is None:
+            counters = self._hosts[host] = _HostCounters()
+        return counters
+
+    def request_sent(self, host: str) -> None:
+        with self._lock:
+            self._host_locked(host).requests += 1
+
+    def connection_opened(self, host: str) -> None:
+        with self._lock:
+            self._host_locked(host).connections_opened += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                host: {
+                    "requests": counters.requests,
+                    "connections_opened": counters.connections_opened,
+                    "connections_reused": max(
+                        0, counters.requests - counters.connections_opened
+                    ),
+                }
+                for host, counters in self._hosts.items()
+            }
+
+
+def _counting_pool_class(base, stats: _ConnectionStats):
+    class _CountingPool(base):
+        def _new_conn(self):
+            stats.connection_opened(self.host)
+            return super()._new_conn()
+
+    return _CountingPool
+
+
+class _CountingAdapter(HTTPAdapter):
+    """``HTTPAdapter`` whose pools report every request and new connection.
+
+    Requests sent without a timeout get ``timeout``.
+    """
+
+    def __init__(self, stats: _ConnectionStats, timeout: Tuple[float, float], **kwargs):
+        self._stats = stats
+        self._timeout = timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self._stats),
+            "https": _counting_pool_class(HTTPSConnectionPool, self._stats),
+        }
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self._timeout
+        self._stats.request_sent(urlsplit(request.url).hostname or "")
+        return super().send(request, **kwargs)
+
+
+class UpstreamHTTPPool:
+    """Keep-alive ``requests`` session shared by every upstream HTTP call.
+
+    akshare calls ``requests.get``/``requests.post``, which open a fresh
+    session, and with it a new TCP and TLS connection, per call. ``install``
+    routes those module-level helpers through one pooled session with a
+    ``pool_sizes[host]`` connection pool per host; its adapters give requests
+    without an explicit timeout separate connect and read timeouts. Sessions
+    other code creates itself are left alone. ``metrics`` reports per host
+    how many requests were sent and how many reused an open connection.
+
+    The API installs the pool for the lifetime of the app and the ingest CLI
+    for the length of a run; both uninstall it again. Outside those scopes
+    ``install_fallback`` keeps the same default timeouts on the unpooled
+    helpers, so no upstream call can hang forever.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = UPSTREAM_CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = UPSTREAM_READ_TIMEOUT_SECONDS,
+        pool_sizes: Optional[Dict[str, int]] = None,
+        default_pool_size: int = UPSTREAM_HTTP_POOL_SIZE,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_sizes = dict(
+            UPSTREAM_HTTP_POOL_SIZES if pool_sizes is None else pool_sizes
+        )
+        self.default_pool_size = default_pool_size
+        self._stats = _ConnectionStats()
+        self._install_lock = threading.Lock()
+        self._originals = None
+        self.session = self._build_session()
+
+    def _adapter(self, pool_size: int) -> HTTPAdapter:
+        return _CountingAdapter(
+            self._stats,
+            self.timeout,
+            pool_connections=1,
+            pool_maxsize=max(1, pool_size),
+        )
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        # ``requests.get`` starts every call with an empty cookie jar; keep it
+        # that way so calls cannot leak cookies into each other.
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        default = self._adapter(self.default_pool_size)
+        session.mount("http://", default)
+        session.mount("https://", default)
+        for host, size in self.pool_sizes.items():
+            # requests matches mounts by URL prefix; the trailing slash keeps
+            # look-alike hosts such as ``{host}.cn`` on the default adapter.
+            adapter = self._adapter(size)
+            session.mount(f"http://{host}/", adapter)
+            session.mount(f"https://{host}/", adapter)
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Drop-in for ``requests.request`` on the pooled session."""
+        return self.session.request(method=method, url=url, **kwargs)
+
+    def fallback_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """``requests.request`` without the pool, but with its default timeouts."""
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return _PLAIN_REQUEST(method=method, url=url, **kwargs)
+
+    def install_fallback(self) -> None:
+        """Give the unpooled ``requests`` helpers the default timeouts.
+
+        Only replaces helpers requests itself provides, so it is a no-op
+        while the pool, or another fallback, is installed.
+        """
+        with self._install_lock:
+            if requests.api.request is _PLAIN_REQUEST:
+                requests.api.request = self.fallback_request
+            if requests.request is _PLAIN_REQUEST:
+                requests.request = self.fallback_request
+
+    def install(self) -> None:
+        """Route ``requests.request``/``get``/``post``/... through the pool."""
+        with self._install_lock:
+            if self._originals is not None:
+                return
+            self._originals = (requests.api.request, requests.request)
+            requests.api.request = self.request
+            requests.request = self.request
+
+    def uninstall(self) -> None:
+        with self._install_lock:
+            if self._originals is None:
+                return
+            requests.api.request, requests.request = self._originals
+            self._originals = None
+
+    @property
+    def installed(self) -> bool:
+        return self._originals is not None
+
+    def metrics(self) -> Dict[str, Dict[str, int]]:
+        return self._stats.snapshot()
+
+    def close(self) -> None:
+        self.session.close()
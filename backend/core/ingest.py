@@ -0,0 +1,205 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Optional, Set
+
+import core.data
+from core.circuit_breaker import CircuitOpenError
+from core.constants import INGEST_CHECKPOINT_PATH, MAX_CONCURRENT_FUND_FETCHES
+
+
+class IngestReport:
+    """Counters of one ingestion run."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.requests = 0
+        self.fetched = 0
+        self.skipped = 0
+        self.deferred = 0
+        self.rows = 0
+        self.failed: Dict[str, str] = {}
+        self.started = time.perf_counter()
+
+    @property
+    def processed(self) -> int:
+        return self.fetched + self.skipped + len(self.failed)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def summary(self) -> str:
+        elapsed = max(self.elapsed, 1e-9)
+        return (
+            f"{self.processed}/{self.total} funds in {self.elapsed:.1f}s "
+            f"({self.processed / elapsed:.1f} funds/s, "
+            f"{self.requests / elapsed:.2f} requests/s): "
+            f"{self.fetched} fetched, {self.skipped} already fresh, "
+            f"{len(self.failed)} failed, {self.deferred} deferred, "
+            f"{self.rows} new NAV rows, {self.requests} upstream requests"
+        )
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    """Codes completed by an interrupted run, empty when there is none."""
+    if not os.path.exists(path):
+        return set()
+    try:
+        with open(path, encoding="utf-8") as f:
+            return set(json.load(f)["completed"])
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Ignoring unreadable ingest checkpoint {path}: {e}")
+        return set()
+
+
+def save_checkpoint(path: str, completed: Set[str], failed: Dict[str, str]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"completed": sorted(completed), "failed": failed}, f)
+    os.replace(tmp_path, path)
+
+
+def _upstream_requests() -> int:
+    """Upstream attempts made so far, retries included."""
+    metrics = core.data.UPSTREAM_SCHEDULER.metrics()
+    return sum(host["requests"] for host in metrics.values())
+
+
+def ingest_universe(
+    codes: Iterable[str],
+    *,
+    checkpoint_path: str = INGEST_CHECKPOINT_PATH,
+    max_funds: Optional[int] = None,
+    workers: int = MAX_CONCURRENT_FUND_FETCHES,
+    report_every: int = 100,
+    log: Callable[[str], None] = print,
+) -> IngestReport:
+    """Fetch every code that is not fresh in the NAV store.
+
+    At most ``max_funds`` funds are fetched. Each fetch can take up to the
+    provider's ``max_retries`` upstream attempts, and ``report.requests``
+    counts those attempts. Codes beyond the budget, or left over when the
+    upstream circuit opens, are deferred to the next run. Progress is checkpointed every ``report_every`` funds and on
+    interruption, and the checkpoint is removed once the universe is done.
+    """
+    completed = load_checkpoint(checkpoint_path)
+    pending = [code for code in dict.fromkeys(codes) if code not in completed]
+    report = IngestReport(total=len(pending))
+    if completed:
+        log(f"Resuming ingestion: {len(completed)} funds already done.")
+
+    store = core.data.get_nav_store()
+    fresh = core.data.fresh_nav_versions(store, pending)
+    to_fetch = []
+    for code in pending:
+        if code in fresh:
+            completed.add(code)
+            report.skipped += 1
+        else:
+            to_fetch.append(code)
+    if max_funds is not None and len(to_fetch) > max_funds:
+        report.deferred = len(to_fetch) - max_funds
+        to_fetch = to_fetch[:max_funds]
+
+    requests_before = _upstream_requests()
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    futures = {
+        executor.submit(core.data.refresh_fund_nav, code): code for code in to_fetch
+    }
+    try:
+        for future in as_completed(futures):
+            code = futures[future]
+            try:
+                report.rows += future.result()
+            except CircuitOpenError:
+                report.deferred += 1
+                continue
+            except Exception as e:
+                report.failed[code] = str(e)
+            else:
+                report.fetched += 1
+                completed.add(code)
+            report.requests = _upstream_requests() - requests_before
+            if report.processed % report_every == 0:
+                save_checkpoint(checkpoint_path, completed, report.failed)
+                log(report.summary())
+    except KeyboardInterrupt:
+        for future in futures:
+            future.cancel()
+        save_checkpoint(checkpoint_path, completed, report.failed)
+        log(f"Interrupted, progress saved to {checkpoint_path}.")
+        raise
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    report.requests = _upstream_requests() - requests_before
+    if report.deferred or report.failed:
+        save_checkpoint(checkpoint_path, completed, report.failed)
+    elif os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    log(report.summary())
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Fill the local NAV store with every fund in the universe."
+    )
+    parser.add_argument(
+        "--max-funds",
+        type=int,
+        default=None,
+        help="fetch at most this many funds in this run; each fund may take "
+        "several upstream attempts (default: unlimited)",
+    )
+    parser.add_argument("--workers", type=int, default=MAX_CONCURRENT_FUND_FETCHES)
+    parser.add_argument("--checkpoint", default=INGEST_CHECKPOINT_PATH)
+    parser.add_argument(
+        "--restart", action="store_true", help="ignore an existing checkpoint"
+    )
+    parser.add_argument("--report-every", type=int, default=100)
+    parser.add_argument(
+        "--codes", nargs="+", help="ingest only these codes instead of the universe"
+    )
+    parser.add_argument(
+        "--no-panel",
+        action="store_true",
+        help="skip rebuilding the month-end panel afterwards",
+    )
+    args = parser.parse_args(argv)
+
+    if args.restart and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+
+    core.data.UPSTREAM_HTTP_POOL.install()
+    try:
+        codes = args.codes or list(core.data.FUND_LIST_CACHE.get().index)
+        report = ingest_universe(
+            codes,
+            checkpoint_path=args.checkpoint,
+            max_funds=args.max_funds,
+            workers=args.workers,
+            report_every=args.report_every,
+        )
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        core.data.UPSTREAM_HTTP_POOL.uninstall()
+
+    if report.fetched and not args.no_panel:
+        panel = core.data.rebuild_nav_panel()
+        print(f"Rebuilt NAV panel with {len(panel.codes)} funds.")
+    for code, error in sorted(report.failed.items()):
+        print(f"  {code}: {error}")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import struct
+import zlib
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# magic, version, decimals, date delta width, value delta width, count,
+# first day (days since epoch), first scaled value
+_HEADER = struct.Struct("<4sBBBBIiq")
+_MAGIC = b"QNAV"
+_VERSION = 1
+_MAX_DECIMALS = 8
+_RAW_FLOAT = 255  # ``decimals`` marker for values stored as plain float64
+
+_SIGNED = {1: np.int8, 2: np.int16, 4: np.int32, 8: np.int64}
+_UNSIGNED = {1: np.uint8, 2: np.uint16, 4: np.uint32, 8: np.uint64}
+
+
+def _scale_decimals(values: np.ndarray) -> int:
+    """Fewest decimals that represent every value exactly, or ``_RAW_FLOAT``."""
+    for decimals in range(_MAX_DECIMALS + 1):
+        scale = 10.0**decimals
+        scaled = np.round(values * scale)
+        if np.all(np.abs(scaled) < 2**53) and np.array_equal(scaled / scale, values):
+            return decimals
+    return _RAW_FLOAT
+
+
+def _narrowest(deltas: np.ndarray, widths: dict) -> np.ndarray:
+    for width, dtype in widths.items():
+        info = np.iinfo(dtype)
+        if deltas.size == 0 or (deltas.min() >= info.min and deltas.max() <= info.max):
+            return deltas.astype(dtype)
+    raise ValueError("NAV deltas do not fit in 64 bits")
+
+
+def _shuffle(array: np.ndarray) -> bytes:
+    # Grouping the i-th byte of every element lets zlib see the long runs of
+    # zero high bytes that small deltas produce.
+    return array.view(np.uint8).reshape(-1, array.itemsize).T.tobytes()
+
+
+def _unshuffle(buffer: bytes, dtype) -> np.ndarray:
+    itemsize = np.dtype(dtype).itemsize
+    planes = np.frombuffer(buffer, dtype=np.uint8).reshape(itemsize, -1)
+    return planes.T.copy().view(dtype).ravel()
+
+
+def encode_nav(nav: pd.Series, level: int = 6) -> bytes:
+    """Pack a date-indexed NAV series into a compact, lossless blob.
+
+    Dates become day deltas and values become deltas of integers scaled by
+    the fewest decimals that round-trip exactly (four for eastmoney unit
+    NAVs). Each delta stream is narrowed to the smallest integer width,
+    byte-shuffled and the whole block is zlib-compressed. The index must be
+    sorted and unique; NaNs are not representable.
+    """
+    days = nav.index.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    values = nav.to_numpy(dtype=np.float64)
+    if values.size and np.isnan(values).any():
+        raise ValueError("NaN NAVs cannot be encoded")
+    if days.size > 1 and np.any(np.diff(days) <= 0):
+        raise ValueError("NAV dates must be strictly increasing")
+
+    decimals = _scale_decimals(values) if values.size else 0
+    if decimals == _RAW_FLOAT:
+        first_value = 0
+        value_stream = values.astype("<f8")
+    else:
+        scaled = np.round(values * 10.0**decimals).astype(np.int64)
+        first_value = int(scaled[0]) if scaled.size else 0
+        value_stream = _narrowest(np.diff(scaled), _SIGNED)
+    day_stream = _narrowest(np.diff(days), _UNSIGNED)
+
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        decimals,
+        day_stream.itemsize,
+        value_stream.itemsize,
+        int(days.size),
+        int(days[0]) if days.size else 0,
+        first_value,
+    )
+    payload = _shuffle(day_stream) + _shuffle(value_stream)
+    return header + zlib.compress(payload, level)
+
+
+def decode_nav(blob: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """Dates (``datetime64[D]``) and float64 NAVs of an ``encode_nav`` blob."""
+    magic, version, decimals, day_width, value_width, count, first_day, first_value = (
+        _HEADER.unpack_from(blob)
+    )
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a NAV codec blob")
+    if count == 0:
+        return np.empty(0, dtype="datetime64[D]"), np.empty(0, dtype=np.float64)
+
+    payload = zlib.decompress(blob[_HEADER.size :])
+    raw_values = decimals == _RAW_FLOAT
+    day_bytes = (count - 1) * day_width
+    day_deltas = _unshuffle(payload[:day_bytes], _UNSIGNED[day_width])
+    days = np.empty(count, dtype=np.int64)
+    days[0] = first_day
+    np.cumsum(day_deltas, out=days[1:])
+    days[1:] += first_day
+
+    if raw_values:
+        values = _unshuffle(payload[day_bytes:], np.dtype("<f8")).astype(np.float64)
+    else:
+        value_deltas = _unshuffle(payload[day_bytes:], _SIGNED[value_width])
+        scaled = np.empty(count, dtype=np.int64)
+        scaled[0] = first_value
+        np.cumsum(value_deltas, out=scaled[1:])
+        scaled[1:] += first_value
+        values = scaled / 10.0**decimals
+    return days.astype("datetime64[D]"), values
+
+
+def decode_nav_series(blob: bytes) -> pd.Series:
+    days, values = decode_nav(blob)
+    return pd.Series(
+        values,
+        index=pd.DatetimeIndex(days.astype("datetime64[ns]"), name="净值日期"),
+        name="单位净值",
+    )
@@ -0,0 +1,179 @@
+import json
+import os
+import time
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.nav_store import NavStore
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+class NavPanel:
+    """Date-aligned month-end NAV panel backed by a read-only memory map.
+
+    Values are stored column-major, so every fund's history is one contiguous
+    block of the file and ``select`` touches only the pages of the funds it
+    is asked for. Every uvicorn worker that opens the same panel shares its
+    pages through the OS page cache.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        dates: pd.DatetimeIndex,
+        codes: List[str],
+        row_ranges: Dict[str, tuple],
+        last_dates: Dict[str, date],
+        manifest_mtime: float = 0.0,
+    ):
+        self.values = values
+        self.dates = dates
+        self.codes = codes
+        self.column_index = {code: idx for idx, code in enumerate(codes)}
+        self.row_ranges = row_ranges
+        self.last_dates = last_dates
+        self.manifest_mtime = manifest_mtime
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.column_index
+
+    def last_period(self, code: str) -> pd.Timestamp:
+        """Month end of the last NAV of ``code`` the panel holds."""
+        return self.dates[self.row_ranges[code][1] - 1]
+
+    def select(
+        self,
+        codes: List[str],
+        start: Optional[pd.Timestamp] = None,
+        end: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        """Requested codes over the requested window, as views of the map.
+
+        Each column is a slice of the fund's contiguous block, so nothing is
+        copied. Without ``start`` or ``end`` the frame spans only the months
+        from the first to the last NAV of any of ``codes``, not the whole
+        panel.
+        """
+        if start is None:
+            lo = min((self.row_ranges[code][0] for code in codes), default=0)
+        else:
+            lo = self.dates.searchsorted(start, side="left")
+        if end is None:
+            hi = max((self.row_ranges[code][1] for code in codes), default=0)
+        else:
+            hi = self.dates.searchsorted(end, side="right")
+        return pd.DataFrame(
+            {code: self.values[lo:hi, self.column_index[code]] for code in codes},
+            index=self.dates[lo:hi],
+            columns=codes,
+            copy=False,
+        )
+
+
+def build_nav_panel(store: NavStore, panel_dir: str) -> NavPanel:
+    """Write every stored fund's month-end series to a new panel file.
+
+    The data file and manifest are written under fresh names and the
+    manifest is swapped in atomically, so readers never see a half-written
+    panel and already-mapped old files stay valid until they are reopened.
+    """
+    os.makedirs(panel_dir, exist_ok=True)
+    monthly = {}
+    last_dates = {}
+    for code in store.codes():
+        nav = store.load(code, "ME")
+        if nav is None or nav.empty:
+            continue
+        monthly[code] = nav
+        last_dates[code] = store.last_date(code)
+
+    codes = list(monthly)
+    if monthly:
+        dates = pd.date_range(
+            start=min(s.index[0] for s in monthly.values()),
+            end=max(s.index[-1] for s in monthly.values()),
+            freq="ME",
+        )
+    else:
+        dates = pd.DatetimeIndex([], freq="ME")
+
+    data_filename = f"nav_panel.{time.time_ns()}.npy"
+    data_path = os.path.join(panel_dir, data_filename)
+    values = np.lib.format.open_memmap(
+        data_path,
+        mode="w+",
+        dtype=np.float64,
+        shape=(len(dates), len(codes)),
+        fortran_order=True,
+    )
+    values[:] = np.nan
+    row_ranges = {}
+    for idx, code in enumerate(codes):
+        series = monthly[code]
+        start = int(dates.searchsorted(series.index[0]))
+        stop = start + len(series)
+        values[start:stop, idx] = series.to_numpy(dtype=float)
+        row_ranges[code] = (start, stop)
+    values.flush()
+    del values
+
+    manifest = {
+        "data_file": data_filename,
+        "dates": [d.strftime("%Y-%m-%d") for d in dates],
+        "codes": codes,
+        "row_ranges": row_ranges,
+        "last_dates": {code: d.isoformat() for code, d in last_dates.items()},
+    }
+    manifest_path = os.path.join(panel_dir, MANIFEST_FILENAME)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+
+    for filename in os.listdir(panel_dir):
+        if filename.startswith("nav_panel.") and filename != data_filename:
+            try:
+                os.remove(os.path.join(panel_dir, filename))
+            except OSError:
+                pass
+
+    return open_nav_panel(panel_dir)
+
+
+def open_nav_panel(panel_dir: str) -> Optional[NavPanel]:
+    manifest_path = os.path.join(panel_dir, MANIFEST_FILENAME)
+    try:
+        manifest_mtime = os.path.getmtime(manifest_path)
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        values = np.load(os.path.join(panel_dir, manifest["data_file"]), mmap_mode="r")
+    except (OSError, ValueError, KeyError):
+        return None
+
+    return NavPanel(
+        values=values,
+        dates=pd.DatetimeIndex(pd.to_datetime(manifest["dates"]), name="净值日期"),
+        codes=manifest["codes"],
+        row_ranges={
+            code: tuple(bounds) for code, bounds in manifest["row_ranges"].items()
+        },
+        last_dates={
+            code: date.fromisoformat(d) for code, d in manifest["last_dates"].items()
+        },
+        manifest_mtime=manifest_mtime,
+    )
+
+
+if __name__ == "__main__":
+    from core.constants import NAV_PANEL_DIR, NAV_STORE_PATH
+
+    started = time.perf_counter()
+    panel = build_nav_panel(NavStore(NAV_STORE_PATH), NAV_PANEL_DIR)
+    print(
+        f"Built NAV panel with {len(panel.codes)} funds x {len(panel.dates)} months "
+        f"in {time.perf_counter() - started:.2f}s"
+    )
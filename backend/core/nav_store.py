@@ -0,0 +1,361 @@
+import hashlib
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.file_lock import FileLock
+from core.nav_codec import decode_nav_series, encode_nav
+from core.nav_validation import NavValidation, merge_duplicate_dates, validate_nav
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nav_series (
+    code TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nav_quality (
+    code TEXT PRIMARY KEY,
+    points INTEGER NOT NULL,
+    mask BLOB NOT NULL,
+    anomalies TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nav_meta (
+    code TEXT PRIMARY KEY,
+    last_date TEXT,
+    checked_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS nav_resampled (
+    code TEXT NOT NULL,
+    freq TEXT NOT NULL,
+    period_end TEXT NOT NULL,
+    nav REAL NOT NULL,
+    PRIMARY KEY (code, freq, period_end)
+) WITHOUT ROWID;
+"""
+
+DAILY = "D"
+# pandas aliases of the pre-aggregated series: week ending Sunday, month end.
+RESAMPLED_FREQUENCIES = ("W", "ME")
+NAV_FREQUENCIES = (DAILY,) + RESAMPLED_FREQUENCIES
+
+
+def _period_start(day: pd.Timestamp, freq: str) -> pd.Timestamp:
+    day = day.normalize()
+    if freq == "W":
+        return day - pd.Timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def _hashed(code: str) -> str:
+    return hashlib.blake2b(code.encode(), digest_size=8).hexdigest()
+
+
+def _rows_to_series(rows) -> pd.Series:
+    dates, navs = zip(*rows)
+    return pd.Series(
+        navs, index=pd.DatetimeIndex(dates, name="净值日期"), name="单位净值"
+    ).astype(float)
+
+
+class NavStore:
+    """Local SQLite store of unit NAVs keyed by fund code.
+
+    Daily NAVs are the source of truth and are kept as one ``nav_codec`` blob
+    per fund (about 1-2 bytes per NAV instead of a ~30 byte row). Weekly and
+    month-end closes are derived when rows are appended (only the periods
+    touched by the new rows are recomputed), so readers get any frequency
+    without resampling.
+
+    Every append also validates the whole history once (see
+    ``nav_validation``) and stores its validity mask and anomaly report next
+    to the blob. Loads return only the valid points and the derived series
+    are built from them, so bad upstream prints never reach a request.
+
+    The file is the cache every uvicorn worker on the host shares: it runs
+    in WAL mode so readers never wait for a writer, a committed append is
+    visible to all workers at once, and ``refresh_lock`` lets workers take
+    turns fetching a fund.
+    """
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+            self._migrate_row_table(conn)
+            unvalidated = conn.execute(
+                "SELECT code FROM nav_series "
+                "WHERE code NOT IN (SELECT code FROM nav_quality)"
+            ).fetchall()
+            for (code,) in unvalidated:
+                self._store_validation(
+                    conn, code, self._load_daily(conn, code, valid_only=False), []
+                )
+                conn.execute("DELETE FROM nav_resampled WHERE code = ?", (code,))
+            # Stores written before the resampled table existed are backfilled once.
+            missing = conn.execute(
+                "SELECT code FROM nav_meta WHERE last_date IS NOT NULL "
+                "AND code NOT IN (SELECT DISTINCT code FROM nav_resampled)"
+            ).fetchall()
+            for (code,) in missing:
+                self._update_resampled(conn, code, None)
+
+    @staticmethod
+    def _migrate_row_table(conn: sqlite3.Connection) -> None:
+        """Pack the one-row-per-NAV table of older stores into codec blobs."""
+        legacy = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'nav'"
+        ).fetchone()
+        if legacy is None:
+            return
+        codes = [row[0] for row in conn.execute("SELECT DISTINCT code FROM nav")]
+        for code in codes:
+            rows = conn.execute(
+                "SELECT nav_date, nav FROM nav WHERE code = ? ORDER BY nav_date",
+                (code,),
+            ).fetchall()
+            conn.execute(
+                "INSERT OR REPLACE INTO nav_series (code, data) VALUES (?, ?)",
+                (code, encode_nav(_rows_to_series(rows))),
+            )
+        conn.execute("DROP TABLE nav")
+
+    @staticmethod
+    def _load_daily(
+        conn: sqlite3.Connection, code: str, valid_only: bool = True
+    ) -> Optional[pd.Series]:
+        row = conn.execute(
+            "SELECT data FROM nav_series WHERE code = ?", (code,)
+        ).fetchone()
+        if row is None:
+            return None
+        nav = decode_nav_series(row[0])
+        if valid_only:
+            validation = NavStore._load_validation(conn, code)
+            if validation is not None and validation.mask.size == len(nav):
+                nav = nav[validation.mask]
+        return nav if not nav.empty else None
+
+    @staticmethod
+    def _load_validation(
+        conn: sqlite3.Connection, code: str
+    ) -> Optional[NavValidation]:
+        row = conn.execute(
+            "SELECT points, mask, anomalies FROM nav_quality WHERE code = ?", (code,)
+        ).fetchone()
+        if row is None:
+            return None
+        return NavValidation.from_stored(row[1], row[0], row[2])
+
+    @staticmethod
+    def _store_validation(
+        conn: sqlite3.Connection,
+        code: str,
+        daily: Optional[pd.Series],
+        duplicate_dates: List[str],
+    ) -> NavValidation:
+        validation = validate_nav(
+            daily if daily is not None else pd.Series(dtype=float),
+            duplicate_dates=duplicate_dates,
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO nav_quality (code, points, mask, anomalies) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                code,
+                int(validation.mask.size),
+                validation.pack_mask(),
+                json.dumps(validation.anomalies),
+            ),
+        )
+        return validation
+
+    def refresh_lock(self, code: str) -> FileLock:
+        """Cross-process lock serializing upstream refreshes of ``code``."""
+        name = code if code.isascii() and code.isalnum() else _hashed(code)
+        return FileLock(os.path.join(f"{self.path}.locks", f"{name}.lock"))
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per operation keeps the store safe to use
+        # from worker threads without sharing sqlite handles.
+        return sqlite3.connect(self.path, timeout=30)
+
+    def last_date(self, code: str) -> Optional[date]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT last_date FROM nav_meta WHERE code = ?", (code,)
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return date.fromisoformat(row[0])
+
+    def checked_at(self, code: str) -> Optional[datetime]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT checked_at FROM nav_meta WHERE code = ?", (code,)
+            ).fetchone()
+        if row is None:
+            return None
+        return datetime.fromisoformat(row[0])
+
+    def meta(
+        self, codes: List[str]
+    ) -> Dict[str, Tuple[Optional[date], Optional[datetime]]]:
+        """``(last_date, checked_at)`` of every code in ``codes``, in one read.
+
+        Codes that were never checked map to ``(None, None)``.
+        """
+        unique_codes = list(dict.fromkeys(codes))
+        meta = {code: (None, None) for code in unique_codes}
+        with closing(self._connect()) as conn:
+            # Stay under SQLite's default limit on bound parameters.
+            for i in range(0, len(unique_codes), 500):
+                batch = unique_codes[i : i + 500]
+                rows = conn.execute(
+                    "SELECT code, last_date, checked_at FROM nav_meta "
+                    f"WHERE code IN ({', '.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for code, last_date, checked_at in rows:
+                    meta[code] = (
+                        None if last_date is None else date.fromisoformat(last_date),
+                        datetime.fromisoformat(checked_at),
+                    )
+        return meta
+
+    def codes(self) -> List[str]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT code FROM nav_meta WHERE last_date IS NOT NULL ORDER BY code"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def validation(self, code: str) -> Optional[NavValidation]:
+        """Validity mask and anomaly report computed when ``code`` was stored."""
+        with closing(self._connect()) as conn:
+            return self._load_validation(conn, code)
+
+    def load(
+        self,
+        code: str,
+        freq: str = DAILY,
+        *,
+        valid_only: bool = True,
+        since: Optional[pd.Timestamp] = None,
+    ) -> Optional[pd.Series]:
+        """NAV history of ``code`` at ``freq`` (one of ``NAV_FREQUENCIES``).
+
+        Weekly and month-end series match ``resample(freq).last()`` of the
+        valid daily points, including NaN for periods without any NAV.
+        ``valid_only=False`` returns the daily series as received, with the
+        points the validity mask rejects. ``since`` drops the points (or
+        periods) dated before it; for derived series only those rows are read.
+        """
+        if freq not in NAV_FREQUENCIES:
+            raise ValueError(f"Unsupported NAV frequency: {freq}")
+        with closing(self._connect()) as conn:
+            if freq == DAILY:
+                nav = self._load_daily(conn, code, valid_only)
+                if nav is None or since is None:
+                    return nav
+                nav = nav[nav.index >= since]
+                return nav if not nav.empty else None
+            rows = conn.execute(
+                "SELECT period_end, nav FROM nav_resampled "
+                "WHERE code = ? AND freq = ? AND period_end >= ? ORDER BY period_end",
+                (code, freq, "" if since is None else since.strftime("%Y-%m-%d")),
+            ).fetchall()
+        if not rows:
+            return None
+        nav = _rows_to_series(rows)
+        return nav.reindex(
+            pd.date_range(nav.index[0], nav.index[-1], freq=freq, name="净值日期")
+        )
+
+    def append(self, code: str, nav: pd.Series, *, checked_at: datetime) -> int:
+        """Store the rows of ``nav`` dated after the last stored date.
+
+        Returns the number of new rows written. The check time is always
+        recorded so callers can tell an up-to-date series from a stale one.
+        """
+        nav = nav.dropna().sort_index()
+        duplicated = nav.index[nav.index.duplicated()]
+        nav = nav[~nav.index.duplicated(keep="last")].astype(float)
+        with closing(self._connect()) as conn, conn:
+            # Serialize read-modify-write of the blob across threads and workers.
+            conn.execute("BEGIN IMMEDIATE")
+            stored = self._load_daily(conn, code, valid_only=False)
+            if stored is not None:
+                duplicated = duplicated[duplicated > stored.index[-1]]
+                nav = nav[nav.index > stored.index[-1]]
+            combined = nav if stored is None else pd.concat([stored, nav])
+            if not nav.empty:
+                conn.execute(
+                    "INSERT OR REPLACE INTO nav_series (code, data) VALUES (?, ?)",
+                    (code, encode_nav(combined)),
+                )
+                previous = self._load_validation(conn, code)
+                validation = self._store_validation(
+                    conn,
+                    code,
+                    combined,
+                    merge_duplicate_dates(previous, duplicated),
+                )
+                valid = combined[validation.mask]
+                if previous is not None and not np.array_equal(
+                    previous.mask, validation.mask[: previous.mask.size]
+                ):
+                    # A new point can turn the last stored one into a spike.
+                    since = combined.index[previous.mask.size - 1]
+                else:
+                    since = nav.index[0]
+                self._update_resampled(conn, code, since, valid)
+            new_last = (
+                None if combined.empty else combined.index[-1].strftime("%Y-%m-%d")
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO nav_meta (code, last_date, checked_at) "
+                "VALUES (?, ?, ?)",
+                (code, new_last, checked_at.isoformat()),
+            )
+        return len(nav)
+
+    def _update_resampled(
+        self,
+        conn: sqlite3.Connection,
+        code: str,
+        since: Optional[pd.Timestamp],
+        daily: Optional[pd.Series] = None,
+    ) -> None:
+        """Recompute the periods of every derived frequency from ``since`` on."""
+        if daily is None:
+            daily = self._load_daily(conn, code)
+        if daily is None:
+            return
+        for freq in RESAMPLED_FREQUENCIES:
+            start = None if since is None else _period_start(since, freq)
+            window = daily if start is None else daily[daily.index >= start]
+            closes = window.resample(freq).last().dropna()
+            # Periods whose only NAVs were masked since the last run lose their row.
+            conn.execute(
+                "DELETE FROM nav_resampled "
+                "WHERE code = ? AND freq = ? AND period_end >= ?",
+                (code, freq, "" if start is None else start.strftime("%Y-%m-%d")),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO nav_resampled (code, freq, period_end, nav) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (code, freq, ts.strftime("%Y-%m-%d"), float(v))
+                    for ts, v in closes.items()
+                ],
+            )
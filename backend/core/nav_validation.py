@@ -0,0 +1,121 @@
+import json
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.constants import NAV_JUMP_RATIO
+
+ZERO_NAV = "zero_nav"
+DUPLICATE_DATE = "duplicate_date"
+MISSING_MONTH = "missing_month"
+SPIKE = "spike"
+SPLIT_LIKE_JUMP = "split_like_jump"
+
+
+def _iso_dates(days: np.ndarray) -> List[str]:
+    return [str(day) for day in days.astype("datetime64[D]")]
+
+
+class NavValidation:
+    """Validity mask and anomaly report of one fund's daily NAV history.
+
+    ``mask`` lines up with the stored daily series: False marks points that
+    must not be used (non-positive NAVs and one-day spikes). ``anomalies``
+    holds one ``{"kind", "count", "dates"}`` entry per kind of problem found;
+    missing months and split-like jumps are reported but not masked, since
+    dropping a point cannot repair them.
+    """
+
+    def __init__(self, mask: np.ndarray, anomalies: List[Dict[str, object]]):
+        self.mask = np.asarray(mask, dtype=bool)
+        self.anomalies = anomalies
+
+    @property
+    def valid_count(self) -> int:
+        return int(self.mask.sum())
+
+    def dates(self, kind: str) -> List[str]:
+        for anomaly in self.anomalies:
+            if anomaly["kind"] == kind:
+                return list(anomaly["dates"])
+        return []
+
+    def pack_mask(self) -> bytes:
+        return np.packbits(self.mask).tobytes()
+
+    @classmethod
+    def from_stored(cls, mask: bytes, length: int, anomalies: str) -> "NavValidation":
+        bits = np.unpackbits(np.frombuffer(mask, dtype=np.uint8), count=length)
+        return cls(bits.astype(bool), json.loads(anomalies))
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "points": int(self.mask.size),
+            "valid_points": self.valid_count,
+            "anomalies": self.anomalies,
+        }
+
+
+def validate_nav(
+    nav: pd.Series,
+    duplicate_dates: Iterable[str] = (),
+    jump_ratio: float = NAV_JUMP_RATIO,
+) -> NavValidation:
+    """Check a sorted, de-duplicated daily NAV series in a few array passes.
+
+    ``duplicate_dates`` are the dates the upstream sent more than once; they
+    are already collapsed in ``nav`` and only reported. A move by more than
+    ``jump_ratio`` (either way) between consecutive valid NAVs is a spike
+    when the next NAV returns to the previous level and a split-like jump
+    otherwise.
+    """
+    days = nav.index.to_numpy(dtype="datetime64[D]")
+    values = nav.to_numpy(dtype=np.float64)
+    mask = np.isfinite(values) & (values > 0)
+    anomalies = []
+
+    def _report(kind: str, dates: List[str]) -> None:
+        if dates:
+            anomalies.append({"kind": kind, "count": len(dates), "dates": dates})
+
+    _report(ZERO_NAV, _iso_dates(days[~mask]))
+    _report(DUPLICATE_DATE, sorted(set(duplicate_dates)))
+
+    valid_positions = np.flatnonzero(mask)
+    valid = values[valid_positions]
+    log_limit = np.log(jump_ratio)
+    steps = np.diff(np.log(valid))
+    jumps = np.abs(steps) > log_limit
+    # A jump that the next step undoes is a bad print, not a level change.
+    reverted = np.zeros_like(jumps)
+    if steps.size > 1:
+        reverted[:-1] = (
+            jumps[:-1]
+            & jumps[1:]
+            & (np.sign(steps[:-1]) != np.sign(steps[1:]))
+            & (np.abs(steps[:-1] + steps[1:]) <= log_limit)
+        )
+    spikes = valid_positions[1:][reverted]
+    mask[spikes] = False
+    # The step back down from a spike is part of the same bad print.
+    splits = jumps & ~reverted & ~np.concatenate([[False], reverted[:-1]])
+    _report(SPIKE, _iso_dates(days[spikes]))
+    _report(SPLIT_LIKE_JUMP, _iso_dates(days[valid_positions[1:][splits]]))
+
+    months = np.unique(days[mask].astype("datetime64[M]"))
+    if months.size:
+        expected = np.arange(months[0], months[-1] + 1)
+        missing = np.setdiff1d(expected, months, assume_unique=True)
+        _report(MISSING_MONTH, [str(month) for month in missing])
+
+    return NavValidation(mask, anomalies)
+
+
+def merge_duplicate_dates(
+    previous: Optional[NavValidation], duplicated: pd.DatetimeIndex
+) -> List[str]:
+    """Duplicate dates already on record plus the ones in a new upstream batch."""
+    dates = set(previous.dates(DUPLICATE_DATE)) if previous is not None else set()
+    dates.update(duplicated.strftime("%Y-%m-%d"))
+    return sorted(dates)
@@ -0,0 +1,241 @@
+import asyncio
+import os
+from datetime import date
+from typing import List, Optional
+
+import pandas as pd
+
+from core.constants import UPSTREAM_ATTEMPT_TIMEOUT_SECONDS
+from core.scheduler import UpstreamScheduler
+
+NAV_DATE_COLUMN = "净值日期"
+NAV_VALUE_COLUMN = "单位净值"
+FUND_CODE_COLUMN = "基金代码"
+FUND_NAME_COLUMN = "基金简称"
+
+
+def _akshare():
+    # akshare drags in py-mini-racer, lxml and friends; importing it on the
+    # first upstream call keeps it off worker startup.
+    import akshare
+
+    return akshare
+
+
+class FundDataError(ValueError):
+    """The source answered, but has no usable NAV history for this fund.
+
+    Unknown codes and empty histories say nothing about the source's health,
+    so circuit breakers do not count them as failures.
+    """
+
+
+class MarketDataProvider:
+    """Source of raw fund data used by ``core.data``.
+
+    Implementations return the full daily unit-NAV history of a fund as a
+    float Series indexed by date, and the fund universe as a DataFrame with
+    at least ``基金代码`` and ``基金简称`` columns. A fund the source has
+    no data for raises ``FundDataError``.
+
+    ``nav_host`` and ``calendar_host`` name the upstreams behind the NAV and
+    calendar calls, so each gets its own circuit breaker.
+    """
+
+    name = "base"
+    nav_host: Optional[str] = None
+    calendar_host: Optional[str] = None
+
+    def fetch_fund_nav(self, code: str) -> pd.Series:
+        raise NotImplementedError
+
+    async def fetch_fund_nav_async(self, code: str) -> pd.Series:
+        """Awaitable ``fetch_fund_nav``; blocking sources run on a worker thread."""
+        return await asyncio.to_thread(self.fetch_fund_nav, code)
+
+    def fetch_fund_list(self) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def fetch_trade_dates(self) -> Optional[List[date]]:
+        """CN exchange trading days, or None when the source has no calendar."""
+        return None
+
+
+def normalize_nav_frame(frame: pd.DataFrame) -> pd.Series:
+    frame = frame.rename(columns={"date": NAV_DATE_COLUMN, "nav": NAV_VALUE_COLUMN})
+    dates = pd.to_datetime(frame[NAV_DATE_COLUMN])
+    nav = pd.Series(
+        frame[NAV_VALUE_COLUMN].astype(float).to_numpy(),
+        index=pd.DatetimeIndex(dates, name=NAV_DATE_COLUMN),
+        name=NAV_VALUE_COLUMN,
+    )
+    return nav.sort_index()
+
+
+class AkshareProvider(MarketDataProvider):
+    """Eastmoney data scraped through akshare.
+
+    Every request goes through an ``UpstreamScheduler``, which paces it per
+    host and slows the host down after failures; retries therefore need no
+    backoff of their own.
+
+    Only network errors (``OSError``, which covers requests' errors and
+    timeouts) mean eastmoney is unreachable. An empty history, or akshare
+    failing to parse the answer on every attempt (what unknown codes get),
+    is a ``FundDataError``.
+    """
+
+    name = "akshare"
+    nav_host = "fund.eastmoney.com"
+    calendar_host = "finance.sina.com.cn"
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        attempt_timeout: Optional[float] = None,
+        scheduler: Optional[UpstreamScheduler] = None,
+    ):
+        self.max_retries = max_retries
+        self.attempt_timeout = attempt_timeout
+        self.scheduler = scheduler or UpstreamScheduler()
+
+    def _fetch_nav_frame(self, code: str) -> pd.DataFrame:
+        return _akshare().fund_open_fund_info_em(symbol=code, indicator="单位净值走势")
+
+    @staticmethod
+    def _nav_from_frame(code: str, frame: Optional[pd.DataFrame]) -> pd.Series:
+        if frame is None or frame.empty:
+            raise FundDataError(f"No NAV data for {code}")
+        return normalize_nav_frame(frame)
+
+    def fetch_fund_nav(self, code: str) -> pd.Series:
+        for attempt in range(self.max_retries):
+            try:
+                fund_nav = self.scheduler.call(
+                    self.nav_host, lambda: self._fetch_nav_frame(code)
+                )
+                return self._nav_from_frame(code, fund_nav)
+            except FundDataError:
+                raise
+            except Exception as e:
+                if attempt == self.max_retries - 1:
+                    if isinstance(e, OSError):
+                        raise
+                    raise FundDataError(str(e)) from e
+                # Log to console for debugging
+                print(
+                    f"Attempt {attempt + 1}/{self.max_retries} failed for {code}: {e}. Retrying..."
+                )
+        raise ValueError(
+            f"Failed to fetch data for {code} after {self.max_retries} attempts"
+        )
+
+    async def fetch_fund_nav_async(self, code: str) -> pd.Series:
+        """``fetch_fund_nav`` without blocking the event loop.
+
+        akshare is synchronous, so each attempt runs on a worker thread and
+        is abandoned after ``attempt_timeout`` seconds; waiting for the
+        scheduler happens on the loop.
+        """
+        for attempt in range(self.max_retries):
+            try:
+                fund_nav = await self.scheduler.call_async(
+                    self.nav_host,
+                    lambda: self._fetch_nav_frame(code),
+                    timeout=self.attempt_timeout,
+                )
+                return self._nav_from_frame(code, fund_nav)
+            except FundDataError:
+                raise
+            except Exception as e:
+                if attempt == self.max_retries - 1:
+                    if isinstance(e, OSError):
+                        raise
+                    raise FundDataError(str(e)) from e
+                print(
+                    f"Attempt {attempt + 1}/{self.max_retries} failed for {code}: {e!r}. Retrying..."
+                )
+        raise ValueError(
+            f"Failed to fetch data for {code} after {self.max_retries} attempts"
+        )
+
+    def fetch_fund_list(self) -> pd.DataFrame:
+        return self.scheduler.call(self.nav_host, lambda: _akshare().fund_name_em())
+
+    def fetch_trade_dates(self) -> Optional[List[date]]:
+        frame = self.scheduler.call(
+            self.calendar_host, lambda: _akshare().tool_trade_date_hist_sina()
+        )
+        return list(pd.to_datetime(frame["trade_date"]).dt.date)
+
+
+class LocalFileProvider(MarketDataProvider):
+    """Offline provider reading one NAV file per fund from a directory.
+
+    Each fund lives in ``<code>.parquet`` or ``<code>.csv`` with either the
+    akshare column names (``净值日期``, ``单位净值``) or ``date``/``nav``.
+    An optional ``fund_list.csv`` supplies names; otherwise the universe is
+    every code with a NAV file. An optional ``trade_dates.csv`` with a
+    ``trade_date`` column supplies the trading calendar.
+    """
+
+    name = "local"
+    fund_list_filename = "fund_list.csv"
+
+    def __init__(self, directory: str):
+        self.directory = str(directory)
+
+    def _nav_path(self, code: str) -> Optional[str]:
+        for extension in (".parquet", ".csv"):
+            path = os.path.join(self.directory, f"{code}{extension}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def fetch_fund_nav(self, code: str) -> pd.Series:
+        path = self._nav_path(code)
+        if path is None:
+            raise FundDataError(f"No NAV file for {code} in {self.directory}")
+        if path.endswith(".parquet"):
+            frame = pd.read_parquet(path)
+        else:
+            frame = pd.read_csv(path)
+        return normalize_nav_frame(frame)
+
+    def fetch_fund_list(self) -> pd.DataFrame:
+        list_path = os.path.join(self.directory, self.fund_list_filename)
+        if os.path.exists(list_path):
+            return pd.read_csv(list_path, dtype={FUND_CODE_COLUMN: str})
+
+        codes = sorted(
+            {
+                os.path.splitext(filename)[0]
+                for filename in os.listdir(self.directory)
+                if filename.endswith((".csv", ".parquet"))
+                and filename not in (self.fund_list_filename, "trade_dates.csv")
+            }
+        )
+        return pd.DataFrame({FUND_CODE_COLUMN: codes, FUND_NAME_COLUMN: codes})
+
+    def fetch_trade_dates(self) -> Optional[List[date]]:
+        path = os.path.join(self.directory, "trade_dates.csv")
+        if not os.path.exists(path):
+            return None
+        return list(pd.to_datetime(pd.read_csv(path)["trade_date"]).dt.date)
+
+
+def create_provider(
+    name: str,
+    *,
+    local_dir: Optional[str] = None,
+    scheduler: Optional[UpstreamScheduler] = None,
+) -> MarketDataProvider:
+    if name == AkshareProvider.name:
+        return AkshareProvider(
+            attempt_timeout=UPSTREAM_ATTEMPT_TIMEOUT_SECONDS, scheduler=scheduler
+        )
+    if name == LocalFileProvider.name:
+        if not local_dir:
+            raise ValueError("The local provider needs a NAV directory")
+        return LocalFileProvider(local_dir)
+    raise ValueError(f"Unknown market data provider: {name}")
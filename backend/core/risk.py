@@ -3,6 +3,7 @@ from typing import Dict, List
 import numpy as np
 import pandas as pd
 
+from core.derived import get_monthly_returns
 from core.portfolio import shrink_frontier_expected_returns
 
 
@@ -26,7 +27,7 @@ def calculate_asset_diagnostics(
     if df_nav.empty:
         return []
 
-    monthly_returns = df_nav.pct_change().fillna(0)
+    monthly_returns = get_monthly_returns(df_nav)
     raw_expected_returns = monthly_returns.mean()
     optimizer_expected_returns = shrink_frontier_expected_returns(raw_expected_returns)
     annualized_volatility = monthly_returns.std(ddof=0) * np.sqrt(12)
@@ -124,6 +125,18 @@ def calculate_max_drawdown(nav_series: pd.Series) -> float:
     return drawdowns.min()
 
 
+def calculate_max_drawdown_values(values: np.ndarray) -> float:
+    """``calculate_max_drawdown`` of a value path held in a plain array."""
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return 0.0
+    peaks = np.maximum.accumulate(values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdowns = (values - peaks) / peaks
+    drawdowns = drawdowns[~np.isnan(drawdowns)]
+    return float(drawdowns.min()) if drawdowns.size else 0.0
+
+
 def calculate_cvar_loss(returns: pd.Series, confidence: float) -> float:
     if returns.empty:
         return 0.0
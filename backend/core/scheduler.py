@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from core.constants import (
+    UPSTREAM_BURST,
+    UPSTREAM_MAX_CONCURRENCY_PER_HOST,
+    UPSTREAM_MIN_RATE_PER_SECOND,
+    UPSTREAM_RATE_PER_SECOND,
+)
+
+# Async waiters poll for a free concurrency slot at this interval; waiting on
+# tokens sleeps exactly until the next token is due.
+_ASYNC_SLOT_POLL_SECONDS = 0.01
+
+
+class _HostState:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.requests = 0
+        self.errors = 0
+        self.wait_seconds = 0.0
+
+
+class UpstreamScheduler:
+    """Pace upstream calls per host with a token bucket and a concurrency cap.
+
+    Each host refills ``rate`` tokens per second up to ``burst`` and allows at
+    most ``max_concurrency`` calls in flight. A failed call multiplies the
+    host's rate by ``slowdown`` (never below ``min_rate``) and empties its
+    bucket, so the next call waits a full, longer interval; every success
+    adds ``recovery`` back until the configured rate is reached again.
+    Sync callers block on a condition, async callers sleep on the event loop;
+    both share the same per-host state.
+    """
+
+    def __init__(
+        self,
+        rate: float = UPSTREAM_RATE_PER_SECOND,
+        burst: float = UPSTREAM_BURST,
+        max_concurrency: int = UPSTREAM_MAX_CONCURRENCY_PER_HOST,
+        min_rate: float = UPSTREAM_MIN_RATE_PER_SECOND,
+        slowdown: float = 0.5,
+        recovery: Optional[float] = None,
+    ):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_rate = min(min_rate, rate)
+        self.slowdown = slowdown
+        self.recovery = rate / 20 if recovery is None else recovery
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _host_locked(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.rate, self.burst)
+        return state
+
+    def _reserve_locked(self, state: _HostState) -> Optional[float]:
+        """Take a slot and a token: 0 on success, else seconds to wait.
+
+        None means the host is at its concurrency cap and the caller must
+        wait for a release rather than for time to pass.
+        """
+        now = time.monotonic()
+        state.tokens = min(
+            self.burst, state.tokens + (now - state.updated) * state.rate
+        )
+        state.updated = now
+        if state.in_flight >= self.max_concurrency:
+            return None
+        if state.tokens < 1:
+            return (1 - state.tokens) / state.rate
+        state.tokens -= 1
+        state.in_flight += 1
+        return 0.0
+
+    def _start_waiting_locked(self, state: _HostState) -> None:
+        state.waiting += 1
+        state.max_waiting = max(state.max_waiting, state.waiting)
+
+    def acquire(self, host: str) -> None:
+        started = time.monotonic()
+        with self._lock:
+            state = self._host_locked(host)
+            self._start_waiting_locked(state)
+            try:
+                while True:
+                    delay = self._reserve_locked(state)
+                    if delay == 0:
+                        return
+                    self._released.wait(delay)
+            finally:
+                state.waiting -= 1
+                state.wait_seconds += time.monotonic() - started
+
+    async def acquire_async(self, host: str) -> None:
+        started = time.monotonic()
+        with self._lock:
+            state = self._host_locked(host)
+            self._start_waiting_locked(state)
+        try:
+            while True:
+                with self._lock:
+                    delay = self._reserve_locked(state)
+                if delay == 0:
+                    return
+                await asyncio.sleep(
+                    _ASYNC_SLOT_POLL_SECONDS if delay is None else delay
+                )
+        finally:
+            with self._lock:
+                state.waiting -= 1
+                state.wait_seconds += time.monotonic() - started
+
+    def release(self, host: str, ok: bool) -> None:
+        with self._lock:
+            state = self._host_locked(host)
+            state.in_flight -= 1
+            state.requests += 1
+            if ok:
+                state.rate = min(self.rate, state.rate + self.recovery)
+            else:
+                state.errors += 1
+                state.rate = max(self.min_rate, state.rate * self.slowdown)
+                state.tokens = min(state.tokens, 0.0)
+            self._released.notify_all()
+
+    def _run_and_release(self, host: str, fn: Callable[[], Any]) -> Any:
+        ok = False
+        try:
+            result = fn()
+            ok = True
+            return result
+        finally:
+            self.release(host, ok)
+
+    def call(self, host: str, fn: Callable[[], Any]) -> Any:
+        self.acquire(host)
+        return self._run_and_release(host, fn)
+
+    async def call_async(
+        self, host: str, fn: Callable[[], Any], timeout: Optional[float] = None
+    ) -> Any:
+        """Run blocking ``fn`` on a worker thread once ``host`` admits it.
+
+        ``timeout`` bounds only the call itself, not the time spent queued.
+        A timed-out call keeps its slot until the thread really finishes, so
+        abandoned requests still count against the concurrency cap.
+        """
+        await self.acquire_async(host)
+        future = asyncio.get_running_loop().run_in_executor(
+            None, self._run_and_release, host, fn
+        )
+        # Retrieve the outcome of calls nobody awaits any more after a timeout.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                host: {
+                    "rate_per_second": round(state.rate, 4),
+                    "tokens": round(state.tokens, 4),
+                    "in_flight": state.in_flight,
+                    "queue_depth": state.waiting,
+                    "max_queue_depth": state.max_waiting,
+                    "requests": state.requests,
+                    "errors": state.errors,
+                    "wait_seconds": round(state.wait_seconds, 4),
+                }
+                for host, state in self._hosts.items()
+            }
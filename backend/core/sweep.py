@@ -0,0 +1,235 @@
+import asyncio
+import itertools
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+
+from core.backtest import SCENARIO_PARAMETERS, backtest_kelly_dca_batch
+from core.constants import SWEEP_MAX_COMBINATIONS, SWEEP_MIN_CHUNK, SWEEP_WORKERS
+
+SWEEP_METRICS = ("annualized_return", "max_drawdown", "final_value", "volatility")
+
+
+def sweep_values(name: str, spec) -> List[float]:
+    """Values of one swept parameter: a list, or a ``{start, stop, step}`` range.
+
+    Ranges include ``stop`` when the steps land on it.
+    """
+    if isinstance(spec, dict):
+        start, stop, step = (float(spec[key]) for key in ("start", "stop", "step"))
+        if step <= 0 or stop < start:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{name}: range needs step > 0 and stop >= start",
+            )
+        count = math.floor((stop - start) / step + 1e-9) + 1
+        values = [round(start + i * step, 10) for i in range(count)]
+    else:
+        values = [float(value) for value in spec]
+    if not values:
+        raise HTTPException(status_code=400, detail=f"{name}: no values to sweep")
+    if name == "ma_window" and not all(value.is_integer() for value in values):
+        raise HTTPException(status_code=400, detail="ma_window values must be integers")
+    return list(dict.fromkeys(values))
+
+
+def expand_sweep_grid(
+    sweep: Dict[str, object], base: Dict[str, float]
+) -> Tuple[List[str], List[Dict[str, float]]]:
+    """Swept parameter names and the full grid of scenarios over them.
+
+    Parameters not in ``sweep`` keep their ``base`` value in every scenario.
+    """
+    unknown = sorted(set(sweep) - set(SCENARIO_PARAMETERS))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot sweep {unknown}; choose from {list(SCENARIO_PARAMETERS)}",
+        )
+    names = [name for name in SCENARIO_PARAMETERS if name in sweep]
+    grids = [sweep_values(name, sweep[name]) for name in names]
+    combinations = math.prod(len(grid) for grid in grids)
+    if combinations > SWEEP_MAX_COMBINATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"{combinations} combinations exceed the limit of "
+            f"{SWEEP_MAX_COMBINATIONS}",
+        )
+    scenarios = [
+        {**base, **dict(zip(names, values))} for values in itertools.product(*grids)
+    ]
+    return names, scenarios
+
+
+def sweep_table(names: List[str], rows: List[Dict[str, float]]) -> Dict[str, list]:
+    """Column-oriented result: the swept parameters, then ``SWEEP_METRICS``."""
+    columns = [*names, *SWEEP_METRICS]
+    return {
+        "columns": columns,
+        "rows": [[row[column] for column in columns] for row in rows],
+    }
+
+
+class SharedPanel:
+    """NAV panel copied once into shared memory for the sweep workers.
+
+    Tasks carry only ``handle`` (segment name, rows, columns), so the panel
+    is never pickled per task. ``release`` unlinks the segment.
+    """
+
+    def __init__(self, df_nav: pd.DataFrame):
+        index = df_nav.index.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        values = df_nav.to_numpy(dtype=np.float64)
+        self._shm = SharedMemory(create=True, size=max(1, index.nbytes + values.nbytes))
+        np.ndarray(index.shape, np.int64, buffer=self._shm.buf)[:] = index
+        np.ndarray(values.shape, np.float64, buffer=self._shm.buf, offset=index.nbytes)[
+            :
+        ] = values
+        self.handle = (self._shm.name, len(index), list(df_nav.columns))
+
+    def release(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+
+# Worker side: the panel of the sweep this process last worked on.
+_WORKER_PANEL: Optional[Tuple[str, pd.DataFrame]] = None
+
+
+def _load_shared_panel(handle) -> pd.DataFrame:
+    global _WORKER_PANEL
+    name, rows, columns = handle
+    if _WORKER_PANEL is not None and _WORKER_PANEL[0] == name:
+        return _WORKER_PANEL[1]
+    shm = SharedMemory(name=name)
+    try:
+        index = np.ndarray((rows,), np.int64, buffer=shm.buf).copy()
+        values = np.ndarray(
+            (rows, len(columns)), np.float64, buffer=shm.buf, offset=index.nbytes
+        ).copy()
+    finally:
+        shm.close()
+    df_nav = pd.DataFrame(
+        values, index=pd.DatetimeIndex(index.view("datetime64[ns]")), columns=columns
+    )
+    _WORKER_PANEL = (name, df_nav)
+    return df_nav
+
+
+def _run_sweep_chunk(handle, weights_dict, monthly_investment, scenarios, options):
+    try:
+        return backtest_kelly_dca_batch(
+            _load_shared_panel(handle),
+            weights_dict,
+            monthly_investment,
+            scenarios,
+            **options,
+        )
+    except HTTPException as e:
+        # HTTPException cannot be unpickled in the parent, which would then
+        # see a broken pool; send back a plain error instead.
+        raise ValueError(e.detail) from None
+    except Exception as e:
+        raise ValueError(f"{type(e).__name__}: {e}") from None
+
+
+class SweepPool:
+    """Worker processes that run parameter sweeps as batched chunks.
+
+    The pool starts on the first sweep and lives as long as the API process.
+    Each sweep puts its panel in shared memory once and splits the scenarios
+    into one ``backtest_kelly_dca_batch`` chunk per worker (at least
+    ``min_chunk`` scenarios each).
+    """
+
+    def __init__(self, workers: int = SWEEP_WORKERS, min_chunk: int = SWEEP_MIN_CHUNK):
+        self.workers = max(1, workers)
+        self.min_chunk = max(1, min_chunk)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned, not forked: the API process runs threads.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def chunks(self, scenarios: List[Dict[str, float]]) -> List[List[Dict[str, float]]]:
+        size = max(self.min_chunk, math.ceil(len(scenarios) / self.workers))
+        return [scenarios[i : i + size] for i in range(0, len(scenarios), size)]
+
+    async def run_async(
+        self, df_nav, weights_dict, monthly_investment, scenarios, **options
+    ) -> List[Dict[str, float]]:
+        """``backtest_kelly_dca_batch`` over ``scenarios``, fanned out to the pool."""
+        if not scenarios:
+            return []
+        panel = SharedPanel(df_nav)
+        futures = []
+        executor = self._get_executor()
+        try:
+            futures = [
+                executor.submit(
+                    _run_sweep_chunk,
+                    panel.handle,
+                    weights_dict,
+                    monthly_investment,
+                    chunk,
+                    options,
+                )
+                for chunk in self.chunks(scenarios)
+            ]
+            results = await asyncio.gather(
+                *(asyncio.wrap_future(future) for future in futures)
+            )
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+        finally:
+            # Chunks already handed to a worker cannot be cancelled and may
+            # still attach to the segment; unlink it only once they finish.
+            running = [
+                future
+                for future in futures
+                if not future.done() and not future.cancel()
+            ]
+            if running:
+                waiter = asyncio.ensure_future(
+                    asyncio.wait([asyncio.wrap_future(future) for future in running])
+                )
+                waiter.add_done_callback(lambda _: panel.release())
+                await asyncio.shield(waiter)
+            else:
+                panel.release()
+        return [row for chunk in results for row in chunk]
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+SWEEP_POOL = SweepPool()
+
+
+def get_sweep_pool() -> SweepPool:
+    return SWEEP_POOL
@@ -0,0 +1,113 @@
+import bisect
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+CN_TZ = ZoneInfo("Asia/Shanghai")
+
+
+class TradingCalendar:
+    """CN exchange trading days.
+
+    Without an explicit list of trade dates every weekday counts as a
+    trading day, which only costs one pointless refetch per public holiday.
+    """
+
+    def __init__(self, trade_dates: Optional[Iterable[date]] = None):
+        self.trade_dates = sorted(set(trade_dates or []))
+
+    def _covers(self, day: date) -> bool:
+        return bool(self.trade_dates) and (
+            self.trade_dates[0] <= day <= self.trade_dates[-1]
+        )
+
+    def is_trading_day(self, day: date) -> bool:
+        if self._covers(day):
+            idx = bisect.bisect_left(self.trade_dates, day)
+            return idx < len(self.trade_dates) and self.trade_dates[idx] == day
+        return day.weekday() < 5
+
+    def previous_trading_day(self, day: date) -> date:
+        """The latest trading day on or before ``day``."""
+        while not self.is_trading_day(day):
+            day -= timedelta(days=1)
+        return day
+
+
+def load_trading_calendar(snapshot_path: str) -> TradingCalendar:
+    if not os.path.exists(snapshot_path):
+        return TradingCalendar()
+    try:
+        frame = pd.read_csv(snapshot_path)
+        return TradingCalendar(list(pd.to_datetime(frame["trade_date"]).dt.date))
+    except Exception as e:
+        print(f"Failed to read trading calendar {snapshot_path}: {e}")
+        return TradingCalendar()
+
+
+def save_trading_calendar(trade_dates: Iterable[date], snapshot_path: str) -> None:
+    directory = os.path.dirname(snapshot_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{snapshot_path}.tmp"
+    pd.DataFrame({"trade_date": sorted(set(trade_dates))}).to_csv(tmp_path, index=False)
+    os.replace(tmp_path, snapshot_path)
+
+
+def to_cn_time(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=CN_TZ)
+    return moment.astimezone(CN_TZ)
+
+
+class NavFreshnessPolicy:
+    """Decide whether a cached NAV series can still gain new rows.
+
+    Open-end funds publish the NAV of trading day T during the evening of T
+    (``publish_start`` to ``publish_end``, Beijing time). A cached series is
+    fresh when it already holds the latest NAV that can exist; while the
+    publish window is open it is re-checked every ``recheck_interval``;
+    otherwise it stays fresh until the next window opens.
+    """
+
+    def __init__(
+        self,
+        calendar: TradingCalendar,
+        publish_start: time = time(18, 0),
+        publish_end: time = time(23, 30),
+        recheck_interval: timedelta = timedelta(minutes=30),
+    ):
+        self.calendar = calendar
+        self.publish_start = publish_start
+        self.publish_end = publish_end
+        self.recheck_interval = recheck_interval
+
+    def latest_publishable_date(self, now: datetime) -> date:
+        """The newest trading day whose NAV may have been published by ``now``."""
+        now = to_cn_time(now)
+        day = now.date()
+        if now.time() < self.publish_start:
+            day -= timedelta(days=1)
+        return self.calendar.previous_trading_day(day)
+
+    def is_fresh(
+        self,
+        last_date: Optional[date],
+        checked_at: Optional[datetime],
+        now: Optional[datetime] = None,
+    ) -> bool:
+        if checked_at is None:
+            return False
+        now = to_cn_time(now or datetime.now(CN_TZ))
+        checked_at = to_cn_time(checked_at)
+        expected = self.latest_publishable_date(now)
+        if last_date is not None and last_date >= expected:
+            return True
+
+        window_end = datetime.combine(expected, self.publish_end, tzinfo=CN_TZ)
+        if now < window_end:
+            return now - checked_at < self.recheck_interval
+        return checked_at >= window_end
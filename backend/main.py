@@ -1,24 +1,33 @@
-import requests
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
 
 from api.routes import router
-
-# Set a default timeout for all requests globally to prevent hanging
-# This specifically addresses the user's request to "reduce timeout"
-_original_request = requests.Session.request
-
-
-def _patched_request(self, method, url, *args, **kwargs):
-    if "timeout" not in kwargs:
-        kwargs["timeout"] = 10  # 10 seconds timeout
-    return _original_request(self, method, url, *args, **kwargs)
-
-
-requests.Session.request = _patched_request
-
-app = FastAPI()
+from core.data import FUND_LIST_CACHE, UPSTREAM_HTTP_POOL, refresh_trading_calendar
+from core.sweep import SWEEP_POOL
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pooled keep-alive sessions with connect/read timeouts for the upstream
+    # HTTP calls akshare makes (see core.http_pool).
+    UPSTREAM_HTTP_POOL.install()
+    # Warm the fund list and trading calendar off the request path.
+    FUND_LIST_CACHE.start()
+    threading.Thread(
+        target=refresh_trading_calendar, name="trading-calendar", daemon=True
+    ).start()
+    yield
+    FUND_LIST_CACHE.stop()
+    UPSTREAM_HTTP_POOL.uninstall()
+    UPSTREAM_HTTP_POOL.close()
+    SWEEP_POOL.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
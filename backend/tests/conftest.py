@@ -0,0 +1,67 @@
+import pytest
+
+import core.data
+from core.circuit_breaker import CircuitBreakers
+from core.constants import (
+    FUND_LIST_TTL_SECONDS,
+    UPSTREAM_FAILURE_THRESHOLD,
+    UPSTREAM_RESET_SECONDS,
+)
+from core.fund_list import FundListCache
+from core.lru_cache import LRUCache
+from core.nav_store import NavStore
+from core.providers import AkshareProvider, FundDataError
+from core.scheduler import UpstreamScheduler
+from core.trading_calendar import NavFreshnessPolicy, TradingCalendar
+
+
+@pytest.fixture(autouse=True)
+def isolated_nav_store(tmp_path, monkeypatch):
+    """Keep every test on its own empty NAV store instead of the shared one."""
+    store = NavStore(tmp_path / "nav_store.sqlite3")
+    monkeypatch.setattr(core.data, "NAV_STORE", store)
+    monkeypatch.setattr(core.data, "NAV_PANEL_DIR", str(tmp_path / "panel"))
+    monkeypatch.setattr(core.data, "NAV_PANEL", None)
+    monkeypatch.setattr(core.data, "ALIGNED_PANEL_CACHE", LRUCache(8))
+    monkeypatch.setattr(
+        core.data, "NAV_FRESHNESS_POLICY", NavFreshnessPolicy(TradingCalendar())
+    )
+    return store
+
+
+@pytest.fixture(autouse=True)
+def isolated_fund_list(tmp_path, monkeypatch):
+    cache = FundListCache(
+        tmp_path / "fund_list.csv", FUND_LIST_TTL_SECONDS, core.data.fetch_fund_list
+    )
+    cache.add_listener(core.data.rebuild_fund_search_index)
+    monkeypatch.setattr(core.data, "FUND_LIST_CACHE", cache)
+    monkeypatch.setattr(core.data, "FUND_SEARCH_INDEX", None)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def upstream_scheduler(monkeypatch):
+    """Pacing fast enough that retries in tests cost milliseconds."""
+    scheduler = UpstreamScheduler(
+        rate=1000, burst=1000, max_concurrency=16, min_rate=100
+    )
+    monkeypatch.setattr(core.data, "UPSTREAM_SCHEDULER", scheduler)
+    return scheduler
+
+
+@pytest.fixture(autouse=True)
+def akshare_provider(monkeypatch, upstream_scheduler):
+    """Tests mock akshare directly, whatever provider the environment selects."""
+    provider = AkshareProvider(scheduler=upstream_scheduler)
+    monkeypatch.setattr(core.data, "PROVIDER", provider)
+    return provider
+
+
+@pytest.fixture(autouse=True)
+def upstream_breakers(monkeypatch):
+    breakers = CircuitBreakers(
+        UPSTREAM_FAILURE_THRESHOLD, UPSTREAM_RESET_SECONDS, ignore=(FundDataError,)
+    )
+    monkeypatch.setattr(core.data, "UPSTREAM_BREAKERS", breakers)
+    return breakers
@@ -125,7 +125,7 @@ def test_analyze_returns_asset_diagnostics():
         index=dates,
     )
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (
             mock_df,
             {
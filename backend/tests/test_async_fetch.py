@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from core.data import get_fund_data_async, load_fund_navs_async
+from core.providers import AkshareProvider
+
+from .mock_data import mock_fund_name_em, mock_fund_open_fund_info_em
+
+
+def test_async_retries_are_paced_by_the_scheduler(upstream_scheduler):
+    calls = []
+
+    def flaky(symbol, indicator):
+        calls.append(symbol)
+        if len(calls) < 3:
+            raise ConnectionError("reset")
+        return mock_fund_open_fund_info_em(symbol, indicator)
+
+    provider = AkshareProvider(max_retries=5, scheduler=upstream_scheduler)
+    with patch("akshare.fund_open_fund_info_em", side_effect=flaky):
+        nav = asyncio.run(provider.fetch_fund_nav_async("000001"))
+
+    assert not nav.empty
+    assert len(calls) == 3
+    metrics = upstream_scheduler.metrics()[AkshareProvider.nav_host]
+    assert metrics["requests"] == 3
+    assert metrics["errors"] == 2
+    assert metrics["rate_per_second"] < upstream_scheduler.rate
+
+
+def test_async_attempt_is_abandoned_after_timeout(upstream_scheduler):
+    calls = []
+
+    def hangs_once(symbol, indicator):
+        calls.append(symbol)
+        if len(calls) == 1:
+            time.sleep(0.5)
+        return mock_fund_open_fund_info_em(symbol, indicator)
+
+    provider = AkshareProvider(
+        max_retries=2, attempt_timeout=0.05, scheduler=upstream_scheduler
+    )
+
+    async def timed_fetch():
+        started = time.perf_counter()
+        nav = await provider.fetch_fund_nav_async("000001")
+        return nav, time.perf_counter() - started
+
+    with patch("akshare.fund_open_fund_info_em", side_effect=hangs_once):
+        nav, elapsed = asyncio.run(timed_fetch())
+
+    assert not nav.empty
+    assert len(calls) == 2
+    assert elapsed < 0.5
+
+
+def test_event_loop_keeps_running_while_funds_download():
+    def slow_fetch(symbol, indicator):
+        time.sleep(0.2)
+        return mock_fund_open_fund_info_em(symbol, indicator)
+
+    async def scenario():
+        ticks = 0
+        done = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.create_task(ticker())
+        df, names, _ = await get_fund_data_async(["000001", "000002"], None, None, 0.02)
+        done.set()
+        await ticking
+        return df, names, ticks
+
+    with (
+        patch("akshare.fund_name_em", return_value=mock_fund_name_em()),
+        patch("akshare.fund_open_fund_info_em", side_effect=slow_fetch),
+    ):
+        df, names, ticks = asyncio.run(scenario())
+
+    assert list(df.columns) == ["000001", "000002", "RiskFree"]
+    assert names["000002"] == "Fund B"
+    assert ticks >= 10
+
+
+def test_concurrent_async_loads_of_one_fund_share_a_fetch():
+    lock = threading.Lock()
+    calls = 0
+
+    def slow_fetch(symbol, indicator):
+        nonlocal calls
+        with lock:
+            calls += 1
+        time.sleep(0.05)
+        return mock_fund_open_fund_info_em(symbol, indicator)
+
+    async def scenario():
+        return await asyncio.gather(
+            load_fund_navs_async(["000001", "000002"]),
+            load_fund_navs_async(["000002", "000001"]),
+        )
+
+    with patch("akshare.fund_open_fund_info_em", side_effect=slow_fetch):
+        (first, _), (second, _) = asyncio.run(scenario())
+
+    assert calls == 2
+    assert list(first) == ["000001", "000002"]
+    assert list(second) == ["000002", "000001"]
+
+
+def test_async_path_reports_every_failed_fund():
+    with (
+        patch("akshare.fund_name_em", return_value=mock_fund_name_em()),
+        patch("akshare.fund_open_fund_info_em", side_effect=ValueError("boom")),
+    ):
+        with pytest.raises(HTTPException) as excinfo:
+            asyncio.run(get_fund_data_async(["000001", "000002"], None, None, None))
+
+    assert excinfo.value.status_code == 400
+    assert "000001" in excinfo.value.detail
+    assert "000002" in excinfo.value.detail
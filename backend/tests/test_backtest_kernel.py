@@ -0,0 +1,266 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+
+from core.backtest import (
+    SCENARIO_PARAMETERS,
+    backtest_kelly_dca,
+    backtest_kelly_dca_batch,
+    backtest_kelly_dca_reference,
+    resume_kelly_dca,
+)
+from core.backtest_kernel import RollingMean, _cvar_losses, _max_drawdowns
+from core.risk import calculate_cvar_loss, calculate_drawdown_from_returns
+
+
+def _panel(months=24, funds=4, seed=7, risk_free=True):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.006, 0.06, size=(months, funds))
+    # A crash and a rally so both the sell branch and the risk caps kick in.
+    returns[months // 3 : months // 3 + 4] -= 0.12
+    returns[months // 2 : months // 2 + 3] += 0.15
+    nav = np.cumprod(1 + returns, axis=0)
+    dates = pd.date_range("2015-01-31", periods=months, freq="ME")
+    df_nav = pd.DataFrame(nav, index=dates, columns=[f"F{i}" for i in range(funds)])
+    if risk_free:
+        df_nav["RiskFree"] = np.cumprod(np.full(months, 1.002))
+    return df_nav
+
+
+SCENARIOS = {
+    "legacy": dict(strategy_mode="legacy_linear"),
+    "optimized": dict(),
+    "optimized_no_constraints": dict(
+        enable_cvar_constraint=False, enable_drawdown_constraint=False
+    ),
+    "tight_constraints": dict(cvar_limit=0.02, max_drawdown_limit=0.05),
+    "fees_and_holdings": dict(
+        buy_fee={"F0": 0.015, "F2": 0.005},
+        sell_fee={"F1": 0.005},
+        initial_holdings={"F0": 5000.0, "F3": 2000.0, "RiskFree": 3000.0},
+        initial_cash=1000.0,
+    ),
+    "cash_reserve": dict(minimum_cash_reserve=4000.0, sell_threshold=0.0),
+    "short_window": dict(estimation_window=6, ma_window=3, kelly_fraction=1.0),
+}
+
+
+MIXED_WEIGHTS = {"F0": 0.3, "F1": 0.2, "F2": 0.1, "F3": 0.1, "RiskFree": 0.3}
+
+
+def _assert_kernel_matches_reference(df_nav, weights, **kwargs):
+    expected = backtest_kelly_dca_reference(df_nav, weights, 1000.0, **kwargs)
+    actual = backtest_kelly_dca(df_nav, weights, 1000.0, **kwargs)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+def test_kernel_matches_reference_bit_for_bit(name):
+    _assert_kernel_matches_reference(_panel(), MIXED_WEIGHTS, **SCENARIOS[name])
+
+
+@pytest.mark.parametrize(
+    "weights",
+    [
+        {"F0": 0.5, "F1": 0.5},
+        {"F0": 0.6, "F1": 0.0, "F2": 0.4},
+        {"RiskFree": 1.0},
+    ],
+)
+def test_kernel_matches_reference_across_weights(weights):
+    _assert_kernel_matches_reference(_panel(), weights)
+
+
+def test_kernel_matches_reference_without_risk_free_column():
+    _assert_kernel_matches_reference(
+        _panel(risk_free=False, seed=11),
+        {"F0": 0.25, "F1": 0.25, "F2": 0.25, "F3": 0.25},
+    )
+
+
+def test_panel_with_missing_navs_uses_reference():
+    df_nav = _panel(months=12)
+    df_nav.iloc[5, 1] = np.nan
+    weights = {"F0": 0.5, "F1": 0.5}
+
+    expected = backtest_kelly_dca_reference(df_nav, weights, 1000.0)
+    actual = backtest_kelly_dca(df_nav, weights, 1000.0)
+
+    assert actual.keys() == expected.keys()
+    assert actual["history"] == expected["history"]
+
+
+def test_row_wise_risk_estimators_match_pandas():
+    rng = np.random.default_rng(3)
+    returns = rng.normal(0.005, 0.05, size=(40, 17))
+
+    cvar = _cvar_losses(returns, 0.95)
+    drawdowns = _max_drawdowns(returns)
+
+    for row, row_cvar, row_drawdown in zip(returns, cvar, drawdowns):
+        assert row_cvar == calculate_cvar_loss(pd.Series(row), 0.95)
+        assert row_drawdown == calculate_drawdown_from_returns(pd.Series(row))
+
+
+BATCH_SCENARIOS = [
+    {"kelly_fraction": 0.25, "min_weight": 0.1, "max_weight": 0.6},
+    {"kelly_fraction": 1.0, "min_weight": 0.5, "max_weight": 1.0, "ma_window": 3},
+    {"sell_threshold": 0.0, "ma_window": 6},
+    {"min_weight": 0.0, "max_weight": 0.0},
+    {},
+]
+
+
+@pytest.mark.parametrize("strategy_mode", ["legacy_linear", "optimized_kelly"])
+@pytest.mark.parametrize("scenario", ["optimized", "fees_and_holdings", "cash_reserve"])
+def test_batch_matches_single_runs(strategy_mode, scenario):
+    df_nav = _panel()
+    shared = {
+        key: value
+        for key, value in SCENARIOS[scenario].items()
+        if key not in SCENARIO_PARAMETERS
+    }
+
+    rows = backtest_kelly_dca_batch(
+        df_nav,
+        MIXED_WEIGHTS,
+        1000.0,
+        BATCH_SCENARIOS,
+        strategy_mode=strategy_mode,
+        **shared,
+    )
+
+    assert len(rows) == len(BATCH_SCENARIOS)
+    for params, row in zip(BATCH_SCENARIOS, rows):
+        single = backtest_kelly_dca(
+            df_nav,
+            MIXED_WEIGHTS,
+            1000.0,
+            strategy_mode=strategy_mode,
+            **shared,
+            **params,
+        )
+        assert row == {**SCENARIO_PARAMETERS, **params, **row}
+        for key in ("total_invested", "final_value", "final_unit_nav"):
+            assert row[key] == pytest.approx(single[key], rel=1e-12)
+        for key in ("annualized_return", "max_drawdown", "max_drawdown_value"):
+            assert row[key] == pytest.approx(single[key], rel=1e-9, abs=1e-12)
+        assert row["volatility"] >= 0.0
+
+
+def test_batch_accepts_a_parameter_frame():
+    frame = pd.DataFrame(BATCH_SCENARIOS[:2])
+
+    rows = backtest_kelly_dca_batch(_panel(), MIXED_WEIGHTS, 1000.0, frame)
+
+    assert [row["ma_window"] for row in rows] == [12, 3]
+    assert backtest_kelly_dca_batch(_panel(), MIXED_WEIGHTS, 1000.0, []) == []
+
+
+def test_batch_rejects_unknown_or_invalid_parameters():
+    with pytest.raises(HTTPException) as unknown:
+        backtest_kelly_dca_batch(_panel(), MIXED_WEIGHTS, 1000.0, [{"window": 3}])
+    assert unknown.value.status_code == 400
+
+    with pytest.raises(HTTPException) as invalid:
+        backtest_kelly_dca_batch(
+            _panel(), MIXED_WEIGHTS, 1000.0, [{"min_weight": 0.9, "max_weight": 0.5}]
+        )
+    assert invalid.value.status_code == 400
+
+
+@pytest.mark.parametrize("window", [1, 3, 12])
+def test_rolling_mean_matches_pandas(window):
+    rng = np.random.default_rng(window)
+    values = np.cumprod(1 + rng.normal(0.0, 0.05, 60)) * 1e3
+    values[20:30] = 1.0  # runs of equal values take pandas' exact-repeat path
+
+    rolling = RollingMean(window)
+    means = [rolling.push(value) for value in values]
+
+    expected = pd.Series(values).rolling(window, min_periods=1).mean().to_numpy()
+    assert np.array_equal(means, expected)
+
+
+def _resume_in_steps(df_nav, weights, splits, **kwargs):
+    """Run the first ``splits[0]`` months, then resume up to each later split."""
+    result = backtest_kelly_dca(
+        df_nav.iloc[: splits[0]], weights, 1000.0, return_state=True, **kwargs
+    )
+    history = dict(result["history"])
+    for end in [*splits[1:], len(df_nav)]:
+        state = json.loads(json.dumps(result["state"]))
+        result = resume_kelly_dca(state, df_nav.iloc[:end])
+        history.update(result["history"])
+    return result, history
+
+
+@pytest.mark.parametrize(
+    "name", ["legacy", "optimized", "fees_and_holdings", "short_window"]
+)
+@pytest.mark.parametrize("splits", [[1], [5, 6, 20], [12]])
+def test_resumed_run_matches_full_run(name, splits):
+    df_nav = _panel(months=30)
+    full = backtest_kelly_dca(
+        df_nav, MIXED_WEIGHTS, 1000.0, return_state=True, **SCENARIOS[name]
+    )
+
+    resumed, history = _resume_in_steps(
+        df_nav, MIXED_WEIGHTS, splits, **SCENARIOS[name]
+    )
+
+    assert history == full["history"]
+    assert resumed["state"] == full["state"]
+    for key in full.keys() - {"history", "unit_nav_history", "attribution"}:
+        assert resumed[key] == full[key], key
+    assert len(resumed["history"]) == 30 - ([1] + splits)[-1]
+
+
+def test_resumed_run_without_risky_assets():
+    df_nav = _panel(months=12)
+    full = backtest_kelly_dca(df_nav, {"RiskFree": 1.0}, 1000.0, return_state=True)
+
+    resumed, history = _resume_in_steps(df_nav, {"RiskFree": 1.0}, [4, 5])
+
+    assert history == full["history"]
+    assert resumed["state"] == full["state"]
+
+
+def test_state_size_does_not_grow_with_history():
+    short = backtest_kelly_dca(
+        _panel(months=40), MIXED_WEIGHTS, 1000.0, return_state=True
+    )
+    long = backtest_kelly_dca(
+        _panel(months=80), MIXED_WEIGHTS, 1000.0, return_state=True
+    )
+
+    assert len(short["state"]["reference_nav"]) == 37
+    for key, value in long["state"].items():
+        if isinstance(value, list):
+            assert len(value) == len(short["state"][key]), key
+    assert len(long["state"]["rolling_mean"]["values"]) == 12
+
+
+def test_resume_rejects_unusable_panels():
+    df_nav = _panel(months=12)
+    state = backtest_kelly_dca(
+        df_nav.iloc[:8], MIXED_WEIGHTS, 1000.0, return_state=True
+    )["state"]
+    gappy = df_nav.copy()
+    gappy.iloc[10, 0] = np.nan
+
+    for bad_state, panel in [
+        (state, df_nav.iloc[:8]),
+        (state, df_nav.drop(columns="F2")),
+        (state, gappy),
+        ({**state, "version": 0}, df_nav),
+    ]:
+        with pytest.raises(HTTPException) as error:
+            resume_kelly_dca(bad_state, panel)
+        assert error.value.status_code == 400
+
+    with pytest.raises(HTTPException):
+        backtest_kelly_dca(gappy, MIXED_WEIGHTS, 1000.0, return_state=True)
@@ -20,7 +20,7 @@ def test_recommendation_insufficient_cash():
     # Create severe undervaluation to trigger large gap
     mock_df.iloc[-1] = mock_df.iloc[-1] * 0.3  # 70% drop
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (
             mock_df,
             {"000001": "Fund A", "000002": "Fund B"},
@@ -57,7 +57,7 @@ def test_recommendation_zero_cash():
     mock_df = pd.DataFrame(data, index=dates)
     mock_df.iloc[-1] = mock_df.iloc[-1] * 0.5  # Create undervaluation
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (
             mock_df,
             {"000001": "Fund A"},
@@ -88,7 +88,7 @@ def test_recommendation_respects_minimum_cash_reserve():
     mock_df = pd.DataFrame(data, index=dates)
     mock_df.iloc[-1] = mock_df.iloc[-1] * 0.5
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (
             mock_df,
             {"000001": "Fund A"},
@@ -118,7 +118,7 @@ def test_recommendation_zero_target_when_reserve_exceeds_wealth():
     data = {"000001": [1.0] * len(dates)}
     mock_df = pd.DataFrame(data, index=dates)
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (
             mock_df,
             {"000001": "Fund A"},
@@ -159,7 +159,7 @@ def test_cvar_constraint_caps_target_ratio():
     ] * 3
     mock_df = pd.DataFrame({"000001": nav_values[: len(dates)]}, index=dates)
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (
             mock_df,
             {"000001": "Fund A"},
@@ -204,7 +204,7 @@ def test_drawdown_constraint_caps_target_ratio():
     ] * 3
     mock_df = pd.DataFrame({"000001": nav_values[: len(dates)]}, index=dates)
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (
             mock_df,
             {"000001": "Fund A"},
@@ -250,7 +250,7 @@ def test_combined_constraints_use_tighter_cap():
     ] * 3
     mock_df = pd.DataFrame({"000001": nav_values[: len(dates)]}, index=dates)
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (
             mock_df,
             {"000001": "Fund A"},
@@ -298,7 +298,7 @@ def test_hard_constraints_override_min_weight():
     ] * 3
     mock_df = pd.DataFrame({"000001": nav_values[: len(dates)]}, index=dates)
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (
             mock_df,
             {"000001": "Fund A"},
@@ -426,7 +426,7 @@ def test_fee_calculation_accuracy():
     mock_df = pd.DataFrame(data, index=dates)
     mock_df.iloc[-1] = 0.8  # Slight undervaluation
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (
             mock_df,
             {"000001": "Fund A"},
@@ -481,7 +481,7 @@ def test_sell_threshold_boundary():
     # Create overvaluation to trigger potential sell
     mock_df.iloc[-1] = 1.3  # 30% above average
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (
             mock_df,
             {"000001": "Fund A"},
@@ -561,7 +561,7 @@ def test_recommendation_sell_proceeds_not_double_counted():
     # Create severe overvaluation to trigger sell signal (bias = 1.5)
     mock_df.iloc[-1] = 1.5
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (
             mock_df,
             {"000001": "Fund A"},
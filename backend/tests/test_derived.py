@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import core.derived
+from core.data import apply_fund_fee_drag
+from core.derived import (
+    get_fee_drag_nav,
+    get_monthly_returns,
+    get_reference_portfolio_nav,
+    panel_fingerprint,
+)
+from core.frontier import calculate_efficient_frontier
+from core.lru_cache import LRUCache
+from core.risk import calculate_asset_diagnostics
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = LRUCache(16)
+    monkeypatch.setattr(core.derived, "DERIVED_SERIES_CACHE", cache)
+    return cache
+
+
+def _panel():
+    rng = np.random.default_rng(7)
+    dates = pd.date_range("2020-01-31", periods=36, freq="ME")
+    data = 1 + rng.normal(0.005, 0.03, size=(36, 3)).cumsum(axis=0)
+    df = pd.DataFrame(data, index=dates, columns=["000001", "000002", "000003"])
+    df["RiskFree"] = (1 + 0.02 / 12) ** np.arange(36)
+    return df
+
+
+def test_returns_are_shared_across_copies_of_the_same_panel(cache):
+    df = _panel()
+    first = get_monthly_returns(df)
+    assert get_monthly_returns(df.copy()) is first
+    pd.testing.assert_frame_equal(first, df.pct_change().fillna(0))
+
+    edited = df.copy()
+    edited.iloc[5, 0] *= 1.01
+    assert get_monthly_returns(edited) is not first
+    assert panel_fingerprint(df.iloc[:10]) != panel_fingerprint(df)
+    assert cache.stats()["hits"] == 1
+
+
+def test_fee_drag_matches_the_column_by_column_formula(cache):
+    df = _panel()
+    fees = {"000001": 0.015, "000003": 0.006}
+
+    returns = df.pct_change().fillna(0)
+    for code in returns.columns:
+        if code != "RiskFree":
+            returns[code] -= fees.get(code, 0.0) / 12
+    expected = (1 + returns).cumprod()
+
+    pd.testing.assert_frame_equal(
+        get_fee_drag_nav(df, fees), expected, check_exact=True
+    )
+    # Callers of apply_fund_fee_drag own their frame; the cached one is untouched.
+    adjusted = apply_fund_fee_drag(df, fees)
+    adjusted.iloc[:, :] = 0.0
+    pd.testing.assert_frame_equal(get_fee_drag_nav(df, fees), expected)
+    assert get_fee_drag_nav(df, {"000001": 0.02}) is not get_fee_drag_nav(df, fees)
+
+
+def test_reference_nav_is_keyed_by_weights(cache):
+    df = _panel()
+    weights = pd.Series([0.5, 0.5], index=["000001", "000002"])
+    nav = get_reference_portfolio_nav(df, weights)
+
+    pd.testing.assert_series_equal(nav, df[weights.index].dot(weights))
+    assert get_reference_portfolio_nav(df.copy(), weights.copy()) is nav
+    assert get_reference_portfolio_nav(df, weights * [1.2, 0.8]) is not nav
+
+
+def test_analysis_steps_compute_returns_once(cache):
+    df = _panel()
+    frontier = calculate_efficient_frontier(df, {})
+    calculate_asset_diagnostics(df, {code: code for code in df.columns}, frontier)
+    calculate_efficient_frontier(df.copy(), {})
+
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 2
@@ -1,5 +1,5 @@
 import pandas as pd
-from core.backtest import backtest_dca, backtest_kelly_dca
+from core.backtest import backtest_dca, backtest_kelly_dca, backtest_lump_sum
 
 
 def test_dca_drawdown_with_rising_market():
@@ -60,3 +60,44 @@ def test_dca_drawdown_real_drop():
 
     print(f"Computed DCA Real Drop Drawdown: {results['max_drawdown_nav']}")
     assert abs(results["max_drawdown_nav"] - expected_dd) < 0.0001
+
+
+def test_dca_unit_nav_ignores_inflows():
+    dates = pd.date_range(start="2023-01-31", periods=3, freq="ME")
+    df_nav = pd.DataFrame({"AssetA": [1.0, 2.0, 1.0]}, index=dates)
+
+    results = backtest_dca(df_nav, {"AssetA": 1.0}, 1000.0)
+
+    # Units bought at 1.0 and 2.0; the unit NAV only follows the asset.
+    assert results["history"] == {
+        "2023-01": 1000.0,
+        "2023-02": 3000.0,
+        "2023-03": 2500.0,
+    }
+    assert results["final_unit_nav"] == 1.0
+    assert results["max_drawdown_nav"] == -0.5
+    assert abs(results["max_drawdown_value"] - (2500.0 / 3000.0 - 1)) < 1e-12
+    assert results["attribution"]["2023-02"] == {
+        "AssetA": 3000.0,
+        "RiskFree": 0.0,
+        "Cash": 0.0,
+    }
+
+
+def test_lump_sum_reports_idle_cash_as_risk_free():
+    dates = pd.date_range(start="2023-01-31", periods=2, freq="ME")
+    df_nav = pd.DataFrame({"AssetA": [1.0, 1.5], "AssetB": [2.0, 1.0]}, index=dates)
+
+    results = backtest_lump_sum(
+        df_nav, {"AssetA": 0.5, "AssetB": 0.5}, 1000.0, initial_cash=200.0
+    )
+
+    assert results["total_invested"] == 1200.0
+    assert results["history"] == {"2023-01": 1200.0, "2023-02": 1200.0}
+    assert results["attribution"]["2023-02"] == {
+        "AssetA": 750.0,
+        "AssetB": 250.0,
+        "RiskFree": 200.0,
+        "Cash": 200.0,
+    }
+    assert results["max_drawdown_nav"] == 0.0
@@ -13,7 +13,7 @@ from api.routes import get_current_recommendation
 
 def test_riskfree_post_trade_calculation():
     # Mock get_fund_data to avoid external API calls
-    with patch("api.routes.get_fund_data") as mock_get_data:
+    with patch("api.routes.get_fund_data_async") as mock_get_data:
         # Mock Data: 1 Fund + RiskFree
         import pandas as pd
 
@@ -0,0 +1,176 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+
+import core.data
+from core.data import (
+    NAV_FETCH_FLIGHTS,
+    get_fund_data,
+    load_fund_nav,
+    load_fund_navs,
+)
+from core.singleflight import SingleFlight
+
+from .mock_data import mock_fund_name_em, mock_fund_open_fund_info_em
+
+
+def test_load_fund_navs_overlaps_fetches_and_keeps_request_order():
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_fetch(symbol, indicator):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return mock_fund_open_fund_info_em(symbol, indicator)
+
+    codes = ["000003", "000001", "000002", "000001"]
+    with patch("akshare.fund_open_fund_info_em", side_effect=slow_fetch):
+        navs, errors = load_fund_navs(codes, max_workers=2)
+
+    assert errors == {}
+    assert list(navs) == ["000003", "000001", "000002"]
+    assert peak == 2
+
+
+def test_get_fund_data_reports_every_failed_fund():
+    def flaky_fetch(symbol, indicator):
+        if symbol == "000002":
+            raise ValueError("upstream unavailable")
+        return mock_fund_open_fund_info_em(symbol, indicator)
+
+    with (
+        patch("akshare.fund_name_em", return_value=mock_fund_name_em()),
+        patch("akshare.fund_open_fund_info_em", side_effect=flaky_fetch),
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            get_fund_data(["000001", "000002"], None, None, None)
+
+    assert exc_info.value.status_code == 400
+    assert "000002" in exc_info.value.detail
+    assert "000001" not in exc_info.value.detail
+
+
+def test_get_fund_data_column_order_follows_request():
+    with (
+        patch("akshare.fund_name_em", return_value=mock_fund_name_em()),
+        patch(
+            "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+        ),
+    ):
+        df, names, _ = get_fund_data(["000002", "000001"], None, None, None)
+
+    assert list(df.columns) == ["000002", "000001"]
+    assert isinstance(df.index, pd.DatetimeIndex)
+    assert names["000001"] == "Fund A"
+
+
+def test_concurrent_loads_of_one_code_share_a_single_upstream_call():
+    release = threading.Event()
+
+    def blocking_fetch(symbol, indicator):
+        release.wait(timeout=5)
+        return mock_fund_open_fund_info_em(symbol, indicator)
+
+    results = []
+    with patch(
+        "akshare.fund_open_fund_info_em", side_effect=blocking_fetch
+    ) as upstream:
+        threads = [
+            threading.Thread(target=lambda: results.append(load_fund_nav("000001")))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        while NAV_FETCH_FLIGHTS.in_flight() == 0:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+    assert upstream.call_count == 1
+    assert len(results) == 5
+    assert all(result is results[0] for result in results)
+    assert NAV_FETCH_FLIGHTS.in_flight() == 0
+
+
+def test_single_flight_propagates_leader_error_to_waiters():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(timeout=5)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            flights.do("000001", failing)
+        except ValueError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(timeout=5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert errors == ["boom", "boom"]
+    assert flights.in_flight() == 0
+
+
+def test_repeated_requests_reuse_the_aligned_panel():
+    with (
+        patch("akshare.fund_name_em", return_value=mock_fund_name_em()),
+        patch(
+            "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+        ),
+    ):
+        first, _, _ = get_fund_data(["000001", "000002"], None, None, 0.02)
+        with patch(
+            "core.data.load_month_end_navs", side_effect=AssertionError
+        ) as loader:
+            second, names, _ = get_fund_data(["000002", "000001"], None, None, 0.02)
+
+    loader.assert_not_called()
+    assert list(second.columns) == ["000002", "000001", "RiskFree"]
+    assert names["RiskFree"] == "无风险资产"
+    pd.testing.assert_frame_equal(second, first[second.columns])
+
+    # Mutating a returned frame must not leak into the cached panel.
+    second.iloc[0, 0] = -1.0
+    third, _, _ = get_fund_data(["000001", "000002"], None, None, 0.02)
+    pd.testing.assert_frame_equal(third, first)
+    assert core.data.ALIGNED_PANEL_CACHE.stats()["hits"] == 2
+
+
+def test_aligned_panel_key_changes_when_new_navs_arrive(isolated_nav_store):
+    with patch(
+        "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+    ):
+        load_fund_nav("000001")
+    key = core.data.aligned_panel_cache_key(["000001"], None, None, None)
+
+    extra = pd.Series([9.9], index=pd.to_datetime(["2023-04-03"]))
+    isolated_nav_store.append(
+        "000001", extra, checked_at=isolated_nav_store.checked_at("000001")
+    )
+
+    assert core.data.aligned_panel_cache_key(["000001"], None, None, None) != key
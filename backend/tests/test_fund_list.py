@@ -0,0 +1,85 @@
+import os
+import time
+from unittest.mock import patch
+
+from core.data import fetch_fund_list
+from core.fund_list import FundListCache
+
+from .mock_data import mock_fund_name_em
+
+
+def test_refresh_persists_snapshot_for_next_process(tmp_path):
+    path = tmp_path / "fund_list.csv"
+    with patch("akshare.fund_name_em", return_value=mock_fund_name_em()):
+        FundListCache(path, ttl_seconds=3600, fetch=fetch_fund_list).get()
+
+    restarted = FundListCache(path, ttl_seconds=3600, fetch=fetch_fund_list)
+    with patch("akshare.fund_name_em", side_effect=AssertionError) as upstream:
+        frame = restarted.get()
+
+    upstream.assert_not_called()
+    assert frame.loc["000001", "基金简称"] == "Fund A"
+
+
+def test_failed_refresh_keeps_last_good_snapshot(tmp_path):
+    cache = FundListCache(
+        tmp_path / "fund_list.csv", ttl_seconds=3600, fetch=fetch_fund_list
+    )
+    with patch("akshare.fund_name_em", return_value=mock_fund_name_em()):
+        cache.get()
+
+    with patch("akshare.fund_name_em", side_effect=ConnectionError("down")):
+        frame = cache.refresh()
+
+    assert frame.loc["000002", "基金简称"] == "Fund B"
+    assert cache.get() is frame
+
+
+def test_stale_snapshot_is_served_while_refreshing_in_background(tmp_path):
+    path = tmp_path / "fund_list.csv"
+    with patch("akshare.fund_name_em", return_value=mock_fund_name_em()):
+        FundListCache(path, ttl_seconds=3600, fetch=fetch_fund_list).get()
+    old = time.time() - 7200
+    os.utime(path, (old, old))
+
+    cache = FundListCache(path, ttl_seconds=3600, fetch=fetch_fund_list)
+    updated = mock_fund_name_em()
+    updated.loc[0, "基金简称"] = "Fund A (renamed)"
+    with patch("akshare.fund_name_em", return_value=updated):
+        stale = cache.get()
+        assert stale.loc["000001", "基金简称"] == "Fund A"
+        deadline = time.time() + 5
+        while cache.get().loc["000001", "基金简称"] != "Fund A (renamed)":
+            assert time.time() < deadline
+            time.sleep(0.01)
+
+
+def test_failed_background_refresh_backs_off_before_retrying(tmp_path):
+    path = tmp_path / "fund_list.csv"
+    with patch("akshare.fund_name_em", return_value=mock_fund_name_em()):
+        FundListCache(path, ttl_seconds=3600, fetch=fetch_fund_list).get()
+    old = time.time() - 7200
+    os.utime(path, (old, old))
+
+    cache = FundListCache(
+        path, ttl_seconds=3600, fetch=fetch_fund_list, retry_seconds=0.3
+    )
+
+    def _wait_for_refresh():
+        deadline = time.time() + 5
+        while cache._refreshing:
+            assert time.time() < deadline
+            time.sleep(0.01)
+
+    with patch("akshare.fund_name_em", side_effect=ConnectionError("down")) as upstream:
+        cache.get()
+        _wait_for_refresh()
+        for _ in range(5):
+            assert cache.get().loc["000001", "基金简称"] == "Fund A"
+        _wait_for_refresh()
+        assert upstream.call_count == 1
+
+        time.sleep(0.3)
+        cache.get()
+        _wait_for_refresh()
+        assert upstream.call_count == 2
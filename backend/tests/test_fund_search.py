@@ -0,0 +1,103 @@
+import time
+from unittest.mock import patch
+
+import pandas as pd
+from fastapi.testclient import TestClient
+
+import core.data
+from core.fund_search import FundSearchIndex
+from main import app
+
+from .mock_data import mock_fund_name_em
+
+client = TestClient(app)
+
+
+def _fund_list():
+    return pd.DataFrame(
+        {
+            "基金代码": ["110022", "000001", "110011", "161725", "000002"],
+            "拼音缩写": ["YFDXFHY", "HXCZHH", "YFDYXZX", "ZSZZBJ", "HXCZHH"],
+            "基金简称": [
+                "易方达消费行业股票",
+                "华夏成长混合",
+                "易方达优质精选混合(QDII)",
+                "招商中证白酒指数(LOF)A",
+                "华夏成长混合(后端)",
+            ],
+            "基金类型": ["股票型", "混合型-偏股", "QDII", "指数型-股票", "混合型-偏股"],
+        }
+    ).set_index("基金代码")
+
+
+def test_search_matches_code_prefix_name_and_pinyin_initials():
+    index = FundSearchIndex(_fund_list())
+
+    assert [r["code"] for r in index.search("110")] == ["110011", "110022"]
+    assert [r["code"] for r in index.search("白酒")] == ["161725"]
+    assert [r["code"] for r in index.search("yfd")] == ["110011", "110022"]
+    assert [r["code"] for r in index.search("精选混合")] == ["110011"]
+    assert index.search("不存在") == []
+    assert len(index.search("混", limit=2)) == 2
+
+
+def test_search_ranks_prefix_matches_before_substrings():
+    index = FundSearchIndex(_fund_list())
+
+    codes = [r["code"] for r in index.search("华夏")]
+    assert codes == ["000001", "000002"]
+    assert [r["code"] for r in index.search("混合")][-1] == "110011"
+
+
+def test_search_without_pinyin_column():
+    index = FundSearchIndex(mock_fund_name_em().astype(str).set_index("基金代码"))
+
+    assert index.search("Fund B")[0]["code"] == "000002"
+    assert index.search("00000")[0]["pinyin_initials"] == ""
+
+
+def test_search_answers_well_under_a_millisecond():
+    codes = [f"{i:06d}" for i in range(20000)]
+    frame = pd.DataFrame(
+        {
+            "基金代码": codes,
+            "拼音缩写": [f"JJ{i % 977}" for i in range(20000)],
+            "基金简称": [f"测试基金{i % 313}号混合{i}" for i in range(20000)],
+        }
+    ).set_index("基金代码")
+    index = FundSearchIndex(frame)
+
+    queries = ["0123", "基金12号", "JJ97", "混合1999"]
+    started = time.perf_counter()
+    for _ in range(50):
+        for query in queries:
+            index.search(query)
+    per_query = (time.perf_counter() - started) / (50 * len(queries))
+
+    assert per_query < 0.001
+
+
+def test_index_is_rebuilt_when_fund_list_refreshes():
+    first = pd.DataFrame({"基金代码": ["000001"], "基金简称": ["Fund A"]})
+    second = pd.DataFrame(
+        {"基金代码": ["000001", "000009"], "基金简称": ["Fund A", "New Fund"]}
+    )
+    with patch("akshare.fund_name_em", return_value=first):
+        assert core.data.get_fund_search_index().search("New") == []
+
+    with patch("akshare.fund_name_em", return_value=second):
+        core.data.FUND_LIST_CACHE.refresh()
+
+    assert core.data.get_fund_search_index().search("New")[0]["code"] == "000009"
+
+
+def test_search_endpoint():
+    with patch("akshare.fund_name_em", return_value=mock_fund_name_em()):
+        response = client.get("/api/funds/search", params={"q": "Fund", "limit": 2})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["query"] == "Fund"
+    assert [r["code"] for r in body["results"]] == ["000001", "000002"]
+
+    assert client.get("/api/funds/search", params={"q": ""}).status_code == 422
@@ -0,0 +1,161 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from fastapi.testclient import TestClient
+
+from core import http_pool
+from core.http_pool import UpstreamHTTPPool
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=abc")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upstream_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pool():
+    pool = UpstreamHTTPPool(
+        connect_timeout=1, read_timeout=2, pool_sizes={"127.0.0.1": 2}
+    )
+    pool.install()
+    yield pool
+    pool.uninstall()
+    pool.close()
+
+
+def test_module_level_requests_reuse_one_connection(pool, upstream_url):
+    for _ in range(5):
+        assert requests.get(upstream_url).text == "ok"
+
+    assert pool.metrics()["127.0.0.1"] == {
+        "requests": 5,
+        "connections_opened": 1,
+        "connections_reused": 4,
+    }
+    # Like fresh ``requests.get`` calls, pooled calls do not share cookies.
+    assert len(pool.session.cookies) == 0
+
+
+def test_default_timeouts_are_split_and_explicit_ones_win(pool, monkeypatch):
+    seen = []
+
+    def fake_send(self, request, **kwargs):
+        seen.append(kwargs["timeout"])
+        raise requests.ConnectionError("offline")
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", fake_send)
+    for call in (
+        lambda: requests.get("http://127.0.0.1:9/"),
+        lambda: requests.request("GET", "http://127.0.0.1:9/", timeout=7),
+        # Sessions the pool does not own keep their own defaults.
+        lambda: requests.Session().get("http://127.0.0.1:9/"),
+    ):
+        with pytest.raises(requests.ConnectionError):
+            call()
+
+    assert seen == [(1, 2), 7, None]
+
+
+def test_default_timeouts_hold_outside_the_installed_pool(monkeypatch):
+    seen = []
+
+    def fake_send(self, request, **kwargs):
+        seen.append(kwargs["timeout"])
+        raise requests.ConnectionError("offline")
+
+    monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", fake_send)
+    monkeypatch.setattr(requests.api, "request", http_pool._PLAIN_REQUEST)
+    monkeypatch.setattr(requests, "request", http_pool._PLAIN_REQUEST)
+    pool = UpstreamHTTPPool(connect_timeout=1, read_timeout=2)
+    pool.install_fallback()
+    calls = [
+        lambda: requests.get("http://127.0.0.1:9/"),
+        # The pooled session's own adapters apply the default too.
+        lambda: pool.session.get("http://127.0.0.1:9/"),
+    ]
+    for call in calls:
+        with pytest.raises(requests.ConnectionError):
+            call()
+
+    pool.install()
+    pool.uninstall()
+    with pytest.raises(requests.ConnectionError):
+        requests.post("http://127.0.0.1:9/")
+
+    assert seen == [(1, 2), (1, 2), (1, 2)]
+    pool.close()
+
+
+def test_per_host_pools_do_not_capture_look_alike_hosts():
+    pool = UpstreamHTTPPool(pool_sizes={"fund.eastmoney.com": 4})
+    sized = pool.session.get_adapter("https://fund.eastmoney.com/pingzhongdata/1.js")
+
+    look_alike = pool.session.get_adapter("https://fund.eastmoney.com.cn/x")
+    default = pool.session.get_adapter("https://example.com/")
+
+    assert look_alike is default
+    assert sized is not default
+    assert sized.poolmanager.connection_pool_kw["maxsize"] == 4
+    pool.close()
+
+
+def test_uninstall_restores_requests():
+    originals = (requests.api.request, requests.request, requests.Session.request)
+    pool = UpstreamHTTPPool()
+    pool.install()
+    pool.install()
+    assert requests.api.request == pool.request
+    assert requests.request == pool.request
+    assert requests.Session.request is originals[2]
+
+    pool.uninstall()
+
+    assert (
+        requests.api.request,
+        requests.request,
+        requests.Session.request,
+    ) == originals
+    assert not pool.installed
+
+
+def test_app_installs_the_pool_only_while_running(monkeypatch):
+    import main
+    from core.data import UPSTREAM_HTTP_POOL
+
+    class _IdleCache:
+        def start(self):
+            pass
+
+        def stop(self):
+            pass
+
+    monkeypatch.setattr(main, "FUND_LIST_CACHE", _IdleCache())
+    monkeypatch.setattr(main, "refresh_trading_calendar", lambda: False)
+    assert not UPSTREAM_HTTP_POOL.installed
+
+    with TestClient(main.app):
+        assert UPSTREAM_HTTP_POOL.installed
+
+    assert not UPSTREAM_HTTP_POOL.installed
@@ -0,0 +1,31 @@
+from benchmarks.import_time import LAZY_MODULES, parse_importtime, profile_import
+
+
+def test_worker_startup_does_not_import_lazy_modules():
+    profile = profile_import("main")
+
+    assert "api.routes" in profile.modules
+    assert profile.lazy_violations() == []
+
+
+def test_data_layer_does_not_import_the_backtest_engine():
+    profile = profile_import("core.data")
+
+    assert "core.data" in profile.modules
+    assert not {"core.backtest", "core.backtest_kernel", "core.sweep"} & set(
+        profile.modules
+    )
+
+
+def test_parse_importtime_reads_depth_and_times():
+    profile = parse_importtime(
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     scipy.linalg\n"
+        "import time:        80 |        200 |   scipy\n"
+        "import time:        10 |        210 | main\n"
+    )
+
+    assert profile.total_ms == 0.21
+    assert [row["depth"] for row in profile.rows] == [2, 1, 0]
+    assert profile.lazy_violations() == ["scipy"]
+    assert "scipy" in LAZY_MODULES
@@ -0,0 +1,108 @@
+import json
+from unittest.mock import patch
+
+import core.data
+from core.ingest import ingest_universe, main
+
+from .mock_data import mock_fund_name_em, mock_fund_open_fund_info_em
+
+CODES = ["000001", "000002", "000003"]
+
+
+def test_budget_defers_remaining_codes_to_the_resumed_run(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    with patch(
+        "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+    ) as upstream:
+        first = ingest_universe(
+            CODES, checkpoint_path=str(checkpoint), max_funds=2, workers=1
+        )
+        assert upstream.call_count == 2
+        assert first.fetched == 2
+        assert first.deferred == 1
+        assert first.requests == 2
+        assert len(json.loads(checkpoint.read_text())["completed"]) == 2
+
+        second = ingest_universe(CODES, checkpoint_path=str(checkpoint), workers=1)
+
+    assert upstream.call_count == 3
+    assert second.total == 1
+    assert second.fetched == 1
+    assert not checkpoint.exists()
+    assert core.data.get_nav_store().codes() == CODES
+
+
+def test_failed_codes_are_reported_and_retried_next_run(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+
+    def flaky(symbol, indicator):
+        if symbol == "000002":
+            raise ValueError("bad symbol")
+        return mock_fund_open_fund_info_em(symbol, indicator)
+
+    with (
+        patch("akshare.fund_open_fund_info_em", side_effect=flaky),
+    ):
+        report = ingest_universe(CODES, checkpoint_path=str(checkpoint), workers=1)
+
+    assert list(report.failed) == ["000002"]
+    # Every attempt counts, including the retries of the failing fund.
+    assert report.requests == 2 + core.data.PROVIDER.max_retries
+    assert json.loads(checkpoint.read_text())["failed"] == {"000002": "bad symbol"}
+
+    with patch(
+        "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+    ) as upstream:
+        retry = ingest_universe(CODES, checkpoint_path=str(checkpoint), workers=1)
+
+    assert upstream.call_count == 1
+    assert retry.fetched == 1
+    assert not checkpoint.exists()
+
+
+def test_fresh_codes_are_skipped_without_requests(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    with patch(
+        "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+    ):
+        ingest_universe(CODES, checkpoint_path=checkpoint)
+
+    with (
+        patch("core.data.NavFreshnessPolicy.is_fresh", return_value=True),
+        patch("akshare.fund_open_fund_info_em", side_effect=AssertionError) as upstream,
+    ):
+        report = ingest_universe(CODES, checkpoint_path=checkpoint)
+
+    upstream.assert_not_called()
+    assert report.skipped == 3
+    assert report.requests == 0
+
+
+def test_open_circuit_defers_instead_of_failing(tmp_path, upstream_breakers):
+    checkpoint = tmp_path / "checkpoint.json"
+    with (
+        patch("akshare.fund_open_fund_info_em", side_effect=ConnectionError("down")),
+    ):
+        report = ingest_universe(
+            [f"{i:06d}" for i in range(6)], checkpoint_path=str(checkpoint), workers=1
+        )
+
+    assert len(report.failed) == upstream_breakers.failure_threshold
+    assert report.deferred == 6 - upstream_breakers.failure_threshold
+    assert checkpoint.exists()
+
+
+def test_cli_ingests_universe_and_builds_panel(tmp_path, capsys):
+    with (
+        patch("akshare.fund_name_em", return_value=mock_fund_name_em()),
+        patch(
+            "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+        ),
+    ):
+        status = main(["--checkpoint", str(tmp_path / "checkpoint.json")])
+
+    assert status == 0
+    assert core.data.get_nav_panel().codes == CODES
+    output = capsys.readouterr().out
+    assert "3/3 funds" in output
+    assert "funds/s" in output
@@ -109,7 +109,7 @@ def test_current_recommendation_does_not_double_count_management_fee_by_default(
     dates = pd.date_range(start="2024-01-01", periods=14, freq="ME")
     mock_df = pd.DataFrame({"000001": [1.0] * len(dates)}, index=dates)
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (mock_df, {"000001": "Fund A"}, [])
         request_data = {
             "fund_codes": ["000001"],
@@ -142,7 +142,7 @@ def test_analyze_returns_recommended_point_for_long_sample():
         index=dates,
     )
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (
             mock_df,
             {"000001": "Fund A", "000002": "Fund B"},
@@ -196,7 +196,7 @@ def test_current_recommendation_rejects_weights_for_missing_assets():
     dates = pd.date_range(start="2024-01-01", periods=14, freq="ME")
     mock_df = pd.DataFrame({"000001": [1.0] * len(dates)}, index=dates)
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (mock_df, {"000001": "Fund A"}, [])
         request_data = {
             "fund_codes": ["000001"],
@@ -221,7 +221,7 @@ def test_backtest_strategies_rejects_weights_for_missing_assets():
     dates = pd.date_range(start="2024-01-01", periods=14, freq="ME")
     mock_df = pd.DataFrame({"000001": [1.0] * len(dates)}, index=dates)
 
-    with patch("api.routes.get_fund_data") as mock_get_fund:
+    with patch("api.routes.get_fund_data_async") as mock_get_fund:
         mock_get_fund.return_value = (mock_df, {"000001": "Fund A"}, [])
         request_data = {
             "fund_codes": ["000001"],
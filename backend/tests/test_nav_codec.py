@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.nav_codec import decode_nav, decode_nav_series, encode_nav
+
+
+def _random_walk_nav(periods, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2004-01-02", periods=periods)
+    navs = np.round(np.cumprod(1 + rng.normal(0.0003, 0.01, periods)), 4)
+    return pd.Series(navs, index=dates)
+
+
+def test_round_trip_is_lossless():
+    nav = _random_walk_nav(5000)
+
+    decoded = decode_nav_series(encode_nav(nav))
+
+    assert decoded.index.equals(nav.index)
+    assert np.array_equal(decoded.to_numpy(), nav.to_numpy())
+    assert decoded.index.name == "净值日期"
+
+
+def test_four_decimal_navs_take_under_two_bytes_each():
+    nav = _random_walk_nav(5000)
+
+    assert len(encode_nav(nav)) < 2 * len(nav)
+
+
+def test_values_without_short_decimal_form_fall_back_to_raw_floats():
+    nav = pd.Series(
+        [1 / 3, 2 / 3, np.pi],
+        index=pd.to_datetime(["2024-01-01", "2024-01-02", "2024-03-01"]),
+    )
+
+    days, values = decode_nav(encode_nav(nav))
+
+    assert np.array_equal(values, nav.to_numpy())
+    assert days[-1] == np.datetime64("2024-03-01")
+
+
+@pytest.mark.parametrize("periods", [0, 1])
+def test_short_series_round_trip(periods):
+    nav = _random_walk_nav(periods)
+
+    decoded = decode_nav_series(encode_nav(nav))
+
+    assert len(decoded) == periods
+    assert np.array_equal(decoded.to_numpy(), nav.to_numpy())
+
+
+def test_unencodable_input_is_rejected():
+    dates = pd.to_datetime(["2024-01-02", "2024-01-01"])
+    with pytest.raises(ValueError):
+        encode_nav(pd.Series([1.0, 1.1], index=dates))
+    with pytest.raises(ValueError):
+        encode_nav(pd.Series([1.0, np.nan], index=dates[::-1]))
+    with pytest.raises(ValueError):
+        decode_nav(b"not a codec blob" * 2)
@@ -0,0 +1,111 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import core.data
+from core.data import get_fund_data, rebuild_nav_panel
+from core.nav_panel import build_nav_panel, open_nav_panel
+from core.trading_calendar import CN_TZ
+
+from .mock_data import mock_fund_name_em, mock_fund_open_fund_info_em
+
+
+def _fill_store(codes):
+    with patch(
+        "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+    ):
+        for code in codes:
+            core.data.load_fund_nav(code)
+
+
+def test_select_reads_requested_codes_from_their_first_nav(
+    isolated_nav_store, tmp_path
+):
+    _fill_store(["000001", "000002"])
+    panel = build_nav_panel(isolated_nav_store, tmp_path / "panel")
+
+    frame = panel.select(["000002"])
+    assert np.shares_memory(frame["000002"].to_numpy(), panel.values)
+    expected = isolated_nav_store.load("000002").resample("ME").last()
+    np.testing.assert_array_equal(frame["000002"].to_numpy(), expected.to_numpy())
+    assert panel.last_period("000002") == pd.Timestamp("2023-04-30")
+
+    window = panel.select(
+        ["000002", "000001"], pd.Timestamp("2023-02-01"), pd.Timestamp("2023-03-31")
+    )
+    assert list(window.columns) == ["000002", "000001"]
+    assert list(window.index) == list(pd.to_datetime(["2023-02-28", "2023-03-31"]))
+
+
+def test_get_fund_data_reads_current_funds_from_panel():
+    with (
+        patch("akshare.fund_name_em", return_value=mock_fund_name_em()),
+        patch(
+            "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+        ),
+    ):
+        expected, _, _ = get_fund_data(["000001", "000002"], None, None, 0.02)
+
+    rebuild_nav_panel()
+    with patch("akshare.fund_open_fund_info_em", side_effect=AssertionError):
+        df, _, _ = get_fund_data(["000001", "000002"], None, None, 0.02)
+
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+
+def test_funds_refreshed_after_the_build_keep_reading_the_panel(isolated_nav_store):
+    _fill_store(["000001", "000002"])
+    rebuild_nav_panel()
+    new_days = pd.date_range("2023-04-02", "2023-05-10", freq="D")
+    isolated_nav_store.append(
+        "000001",
+        pd.Series(1.01 * np.arange(91, 91 + len(new_days)), index=new_days),
+        checked_at=datetime.now(CN_TZ),
+    )
+    with (
+        patch("akshare.fund_name_em", return_value=mock_fund_name_em()),
+        patch("core.data.get_nav_panel", return_value=None),
+    ):
+        expected, _, _ = get_fund_data(["000001", "000002"], None, None, 0.02)
+
+    with (
+        patch("akshare.fund_open_fund_info_em", side_effect=AssertionError),
+        patch("core.data._cached_aligned_panel", return_value=None),
+        patch.object(isolated_nav_store, "last_date", side_effect=AssertionError),
+        patch.object(isolated_nav_store, "checked_at", side_effect=AssertionError),
+        patch.object(isolated_nav_store, "load", wraps=isolated_nav_store.load) as load,
+    ):
+        df, _, _ = get_fund_data(["000001", "000002"], None, None, 0.02)
+
+    # Only the month ends newer than the panel's were read from the store.
+    assert [call.kwargs.get("since") for call in load.call_args_list] == [
+        pd.Timestamp("2023-04-30")
+    ]
+    assert df.index[-1] == pd.Timestamp("2023-05-31")
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+
+def test_panel_frame_ends_with_the_selected_funds(isolated_nav_store):
+    now = datetime.now(CN_TZ)
+    for code, end in (("000001", "2023-06-30"), ("000002", "2024-12-31")):
+        days = pd.date_range("2023-01-01", end, freq="D")
+        isolated_nav_store.append(
+            code,
+            pd.Series(1.0 + 0.001 * np.arange(len(days)), index=days),
+            checked_at=now,
+        )
+    with patch("akshare.fund_name_em", return_value=mock_fund_name_em()):
+        expected, _, _ = get_fund_data(["000001"], None, None, None)
+        rebuild_nav_panel()
+        with patch("core.data._cached_aligned_panel", return_value=None):
+            df, _, _ = get_fund_data(["000001"], None, None, None)
+
+    # No flat months forward-filled up to the other fund's last NAV.
+    assert df.index[-1] == pd.Timestamp("2023-06-30")
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+
+def test_open_nav_panel_without_manifest_returns_none(tmp_path):
+    assert open_nav_panel(tmp_path / "missing") is None
@@ -0,0 +1,165 @@
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from core.data import load_fund_nav
+from core.nav_store import NavStore
+
+from .mock_data import mock_fund_open_fund_info_em
+
+
+def _daily_nav(start, periods, base=1.0):
+    dates = pd.date_range(start=start, periods=periods, freq="D")
+    return pd.Series([base + 0.01 * i for i in range(periods)], index=dates)
+
+
+def test_append_only_writes_rows_after_last_stored_date(tmp_path):
+    store = NavStore(tmp_path / "nav.sqlite3")
+    assert (
+        store.append(
+            "000001", _daily_nav("2024-01-01", 10), checked_at=datetime(2024, 1, 10, 22)
+        )
+        == 10
+    )
+
+    # Re-sending the overlapping history only persists the new tail.
+    written = store.append(
+        "000001", _daily_nav("2024-01-01", 12), checked_at=datetime(2024, 1, 12, 22)
+    )
+    assert written == 2
+    assert store.last_date("000001") == date(2024, 1, 12)
+    assert store.checked_at("000001") == datetime(2024, 1, 12, 22)
+
+    loaded = store.load("000001")
+    assert len(loaded) == 12
+    assert loaded.index.is_monotonic_increasing
+    assert loaded.iloc[-1] == 1.11
+
+
+def test_load_missing_code_returns_none(tmp_path):
+    store = NavStore(tmp_path / "nav.sqlite3")
+    assert store.load("999999") is None
+    assert store.last_date("999999") is None
+
+
+def test_meta_reads_a_batch_of_codes_at_once(tmp_path):
+    store = NavStore(tmp_path / "nav.sqlite3")
+    store.append(
+        "000001", _daily_nav("2024-01-01", 10), checked_at=datetime(2024, 1, 10, 22)
+    )
+    store.append("000002", pd.Series(dtype=float), checked_at=datetime(2024, 1, 11))
+
+    assert store.meta(["000002", "000001", "999999", "000001"]) == {
+        "000002": (None, datetime(2024, 1, 11)),
+        "000001": (date(2024, 1, 10), datetime(2024, 1, 10, 22)),
+        "999999": (None, None),
+    }
+
+
+def test_month_end_load_since_reads_only_later_periods(tmp_path):
+    store = NavStore(tmp_path / "nav.sqlite3")
+    store.append(
+        "000001", _daily_nav("2024-01-01", 100), checked_at=datetime(2024, 4, 9, 22)
+    )
+
+    tail = store.load("000001", "ME", since=pd.Timestamp("2024-02-29"))
+    pd.testing.assert_series_equal(tail, store.load("000001", "ME").iloc[1:])
+    assert store.load("000001", "ME", since=pd.Timestamp("2024-05-31")) is None
+
+
+def test_load_fund_nav_skips_upstream_while_fresh():
+    with patch(
+        "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+    ) as upstream:
+        first = load_fund_nav("000001")
+        second = load_fund_nav("000001")
+
+    assert upstream.call_count == 1
+    pd.testing.assert_series_equal(first, second)
+
+
+def test_weekly_and_month_end_series_match_resampling_after_incremental_appends(
+    tmp_path,
+):
+    store = NavStore(tmp_path / "nav.sqlite3")
+    dates = pd.bdate_range("2024-01-03", "2024-06-20")
+    # Drop March entirely so a month (and several weeks) have no NAV at all.
+    dates = dates[(dates.month != 3)]
+    full = pd.Series([1.0 + 0.001 * i for i in range(len(dates))], index=dates)
+
+    for cut in [20, 21, 60, len(full)]:
+        store.append("000001", full.iloc[:cut], checked_at=datetime(2024, 6, 20, 22))
+
+    for freq in ["W", "ME"]:
+        expected = full.resample(freq).last()
+        loaded = store.load("000001", freq)
+        pd.testing.assert_series_equal(
+            loaded, expected, check_names=False, check_freq=False
+        )
+        assert loaded.isna().any()
+
+
+def test_existing_store_is_backfilled_with_resampled_series(tmp_path):
+    path = tmp_path / "nav.sqlite3"
+    NavStore(path).append(
+        "000001", _daily_nav("2024-01-01", 70), checked_at=datetime(2024, 3, 10, 22)
+    )
+    with closing(sqlite3.connect(path)) as conn, conn:
+        conn.execute("DELETE FROM nav_resampled")
+
+    reopened = NavStore(path)
+
+    assert len(reopened.load("000001", "ME")) == 3
+    with pytest.raises(ValueError):
+        reopened.load("000001", "QE")
+
+
+def test_legacy_row_table_is_packed_into_blobs(tmp_path):
+    path = tmp_path / "nav.sqlite3"
+    with closing(sqlite3.connect(path)) as conn, conn:
+        conn.executescript(
+            "CREATE TABLE nav (code TEXT NOT NULL, nav_date TEXT NOT NULL, "
+            "nav REAL NOT NULL, PRIMARY KEY (code, nav_date)) WITHOUT ROWID;"
+            "CREATE TABLE nav_meta (code TEXT PRIMARY KEY, last_date TEXT, "
+            "checked_at TEXT NOT NULL);"
+        )
+        conn.executemany(
+            "INSERT INTO nav VALUES ('000001', ?, ?)",
+            [("2024-01-01", 1.0), ("2024-01-02", 1.0123), ("2024-02-01", 1.05)],
+        )
+        conn.execute(
+            "INSERT INTO nav_meta VALUES ('000001', '2024-02-01', '2024-02-01T22:00:00')"
+        )
+
+    store = NavStore(path)
+
+    loaded = store.load("000001")
+    assert list(loaded) == [1.0, 1.0123, 1.05]
+    assert loaded.index[-1] == pd.Timestamp("2024-02-01")
+    assert list(store.load("000001", "ME")) == [1.0123, 1.05]
+    with closing(sqlite3.connect(path)) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    assert "nav" not in tables
+
+
+def test_load_fund_nav_serves_frequencies_without_resampling():
+    with patch(
+        "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+    ):
+        daily = load_fund_nav("000001")
+
+    with patch.object(pd.Series, "resample", side_effect=AssertionError):
+        weekly = load_fund_nav("000001", "W")
+        monthly = load_fund_nav("000001", "ME")
+
+    assert weekly.iloc[-1] == daily.iloc[-1]
+    assert list(monthly.index.strftime("%Y-%m-%d")) == [
+        "2023-01-31",
+        "2023-02-28",
+        "2023-03-31",
+        "2023-04-30",
+    ]
@@ -0,0 +1,104 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from core.nav_store import NavStore
+from core.nav_validation import (
+    DUPLICATE_DATE,
+    MISSING_MONTH,
+    SPIKE,
+    SPLIT_LIKE_JUMP,
+    ZERO_NAV,
+    validate_nav,
+)
+from main import app
+
+from .mock_data import mock_fund_name_em, mock_fund_open_fund_info_em
+
+client = TestClient(app)
+
+
+def _nav(values, start="2024-01-01", freq="D"):
+    return pd.Series(
+        values, index=pd.date_range(start, periods=len(values), freq=freq), dtype=float
+    )
+
+
+def _kinds(validation):
+    return {anomaly["kind"]: anomaly["dates"] for anomaly in validation.anomalies}
+
+
+def test_clean_series_has_no_anomalies():
+    validation = validate_nav(_nav(1 + 0.001 * np.arange(90)))
+
+    assert validation.mask.all()
+    assert validation.anomalies == []
+
+
+def test_zero_navs_and_one_day_spikes_are_masked():
+    validation = validate_nav(_nav([1.0, 0.0, 1.01, 5.0, 1.02, 1.03]))
+
+    assert list(validation.mask) == [True, False, True, False, True, True]
+    kinds = _kinds(validation)
+    assert kinds[ZERO_NAV] == ["2024-01-02"]
+    assert kinds[SPIKE] == ["2024-01-04"]
+    assert SPLIT_LIKE_JUMP not in kinds
+
+
+def test_level_shift_is_reported_but_kept():
+    validation = validate_nav(_nav([2.5, 2.52, 1.0, 1.01, 1.02]))
+
+    assert validation.mask.all()
+    assert _kinds(validation)[SPLIT_LIKE_JUMP] == ["2024-01-03"]
+
+
+def test_missing_months_are_reported():
+    nav = pd.concat([_nav([1.0] * 31), _nav([1.1] * 30, start="2024-04-01")])
+
+    validation = validate_nav(nav)
+
+    assert _kinds(validation)[MISSING_MONTH] == ["2024-02", "2024-03"]
+
+
+def test_store_masks_bad_points_and_keeps_the_report(tmp_path):
+    store = NavStore(tmp_path / "nav.sqlite3")
+    raw = _nav([1.0, 1.01, 0.0, 1.02])
+    raw = pd.concat([raw, raw.iloc[[1]]])
+
+    store.append("000001", raw, checked_at=datetime(2024, 1, 5, 22))
+
+    assert list(store.load("000001")) == [1.0, 1.01, 1.02]
+    assert len(store.load("000001", valid_only=False)) == 4
+    kinds = _kinds(store.validation("000001"))
+    assert kinds[ZERO_NAV] == ["2024-01-03"]
+    assert kinds[DUPLICATE_DATE] == ["2024-01-02"]
+
+    # A zero at month end must not become the month-end close.
+    store.append(
+        "000001", _nav([0.0], start="2024-01-31"), checked_at=datetime(2024, 2, 1, 22)
+    )
+    assert list(store.load("000001", "ME")) == [1.02]
+    assert _kinds(store.validation("000001"))[DUPLICATE_DATE] == ["2024-01-02"]
+
+
+def test_requests_surface_precomputed_quality_warnings():
+    # The mock history starts at a NAV of zero.
+    with (
+        patch("akshare.fund_name_em", return_value=mock_fund_name_em()),
+        patch(
+            "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+        ),
+    ):
+        response = client.post(
+            "/api/analyze", json={"fund_codes": ["000001", "000002"], "fund_fees": {}}
+        )
+        quality = client.get("/api/funds/000001/nav-quality")
+
+    assert response.status_code == 200
+    assert any("000001" in w and "2023-01-01" in w for w in response.json()["warnings"])
+    assert quality.status_code == 200
+    assert quality.json()["valid_points"] == quality.json()["points"] - 1
+    assert client.get("/api/funds/999999/nav-quality").status_code == 404
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import core.data
+from core.providers import FundDataError, LocalFileProvider
+from main import app
+
+client = TestClient(app)
+
+
+def _write_nav_csv(directory, code, drift, columns=("净值日期", "单位净值")):
+    dates = pd.date_range(start="2021-01-01", end="2023-12-31", freq="B")
+    nav = 1.0 + drift * pd.Series(range(len(dates)), dtype=float)
+    pd.DataFrame({columns[0]: dates, columns[1]: nav}).to_csv(
+        directory / f"{code}.csv", index=False
+    )
+
+
+def test_local_provider_reads_both_column_conventions(tmp_path):
+    _write_nav_csv(tmp_path, "000001", 0.001)
+    _write_nav_csv(tmp_path, "000002", 0.002, columns=("date", "nav"))
+    provider = LocalFileProvider(tmp_path)
+
+    first = provider.fetch_fund_nav("000001")
+    second = provider.fetch_fund_nav("000002")
+
+    assert isinstance(first.index, pd.DatetimeIndex)
+    assert first.index.is_monotonic_increasing
+    assert second.iloc[1] == pytest.approx(1.002)
+    assert list(provider.fetch_fund_list()["基金代码"]) == ["000001", "000002"]
+
+    with pytest.raises(FundDataError):
+        provider.fetch_fund_nav("999999")
+
+
+def test_analyze_runs_offline_against_local_provider(tmp_path, monkeypatch):
+    _write_nav_csv(tmp_path, "000001", 0.001)
+    _write_nav_csv(tmp_path, "000002", 0.0005)
+    pd.DataFrame(
+        {"基金代码": ["000001", "000002"], "基金简称": ["Alpha", "Beta"]}
+    ).to_csv(tmp_path / "fund_list.csv", index=False)
+    monkeypatch.setattr(core.data, "PROVIDER", LocalFileProvider(tmp_path))
+
+    response = client.post(
+        "/api/analyze",
+        json={
+            "fund_codes": ["000001", "000002"],
+            "fund_fees": {},
+            "start_date": "2021-01-01",
+            "end_date": "2023-12-31",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["fund_names"] == {"000001": "Alpha", "000002": "Beta"}
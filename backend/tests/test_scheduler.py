@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.scheduler import UpstreamScheduler
+from main import app
+
+from .mock_data import mock_fund_name_em
+
+
+def test_token_bucket_paces_calls_after_the_burst():
+    scheduler = UpstreamScheduler(rate=50, burst=2, max_concurrency=4)
+    started = time.perf_counter()
+    for _ in range(7):
+        scheduler.call("host", lambda: None)
+    elapsed = time.perf_counter() - started
+
+    # Two calls ride the burst, the other five wait 1/50 s each.
+    assert 0.08 <= elapsed < 0.5
+    assert scheduler.metrics()["host"]["requests"] == 7
+
+
+def test_concurrency_cap_is_per_host():
+    scheduler = UpstreamScheduler(rate=1000, burst=1000, max_concurrency=2)
+    lock = threading.Lock()
+    in_flight = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0}
+
+    def work(host):
+        with lock:
+            in_flight[host] += 1
+            peak[host] = max(peak[host], in_flight[host])
+        time.sleep(0.03)
+        with lock:
+            in_flight[host] -= 1
+
+    threads = [
+        threading.Thread(target=scheduler.call, args=(host, lambda h=host: work(h)))
+        for host in ["a", "b"] * 4
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == {"a": 2, "b": 2}
+    assert scheduler.metrics()["a"]["max_queue_depth"] >= 2
+
+
+def test_errors_slow_the_host_down_and_successes_recover():
+    scheduler = UpstreamScheduler(
+        rate=100, burst=10, max_concurrency=1, min_rate=10, recovery=20
+    )
+
+    def fail():
+        raise ConnectionError("429")
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            scheduler.call("host", fail)
+    metrics = scheduler.metrics()["host"]
+    assert metrics["rate_per_second"] == 12.5
+    assert metrics["errors"] == 3
+
+    started = time.perf_counter()
+    scheduler.call("host", lambda: None)
+    # The failure emptied the bucket: the next call waits a full interval.
+    assert time.perf_counter() - started >= 1 / 12.5 * 0.9
+    assert scheduler.metrics()["host"]["rate_per_second"] == 32.5
+
+    for _ in range(10):
+        with pytest.raises(ConnectionError):
+            scheduler.call("host", fail)
+    assert scheduler.metrics()["host"]["rate_per_second"] == 10
+
+
+def test_async_callers_share_the_concurrency_cap_and_report_queue_depth():
+    scheduler = UpstreamScheduler(rate=1000, burst=1000, max_concurrency=1)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(scheduler.call_async("host", lambda: time.sleep(0.02)) for _ in range(3))
+        )
+
+    started = time.perf_counter()
+    asyncio.run(scenario())
+
+    assert time.perf_counter() - started >= 0.06
+    metrics = scheduler.metrics()["host"]
+    assert metrics["max_queue_depth"] >= 2
+    assert metrics["queue_depth"] == 0
+    assert metrics["in_flight"] == 0
+    assert metrics["wait_seconds"] > 0
+
+
+def test_metrics_endpoint_reports_upstream_hosts():
+    with patch("akshare.fund_name_em", return_value=mock_fund_name_em()):
+        TestClient(app).get("/api/funds/search", params={"q": "Fund"})
+    body = TestClient(app).get("/api/upstream/metrics").json()
+
+    assert body["circuits"] == {"fund.eastmoney.com": "closed"}
+    assert body["hosts"]["fund.eastmoney.com"]["requests"] == 1
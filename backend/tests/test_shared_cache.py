@@ -0,0 +1,122 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+
+from core.data import fetch_fund_list, load_fund_nav, refresh_fund_nav
+from core.file_lock import FileLock
+from core.fund_list import FundListCache
+from core.nav_store import NavStore
+from core.providers import normalize_nav_frame
+from core.trading_calendar import CN_TZ
+
+from .mock_data import mock_fund_name_em, mock_fund_open_fund_info_em
+
+_TRY_LOCK = (
+    "import sys; from core.file_lock import FileLock; "
+    "print(FileLock(sys.argv[1]).acquire(blocking=False))"
+)
+
+
+def _try_lock_in_other_process(path):
+    result = subprocess.run(
+        [sys.executable, "-c", _TRY_LOCK, str(path)],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def _publish_from_other_worker(path, code):
+    """Store ``code`` the way another uvicorn worker would."""
+    nav = normalize_nav_frame(mock_fund_open_fund_info_em(code, "单位净值走势"))
+    NavStore(path).append(code, nav, checked_at=datetime.now(CN_TZ))
+
+
+def test_file_lock_excludes_other_processes(tmp_path):
+    path = tmp_path / "refresh.lock"
+
+    with FileLock(path):
+        assert _try_lock_in_other_process(path) == "False"
+        assert not FileLock(path).acquire(blocking=False)
+    assert _try_lock_in_other_process(path) == "True"
+
+
+def test_fund_stored_by_another_worker_is_served_without_upstream(
+    isolated_nav_store,
+):
+    _publish_from_other_worker(isolated_nav_store.path, "000001")
+
+    with patch("akshare.fund_open_fund_info_em", side_effect=AssertionError):
+        nav = load_fund_nav("000001")
+
+    assert nav.index[-1] == pd.Timestamp("2023-04-01")
+
+
+def test_refresh_waiting_on_another_worker_reuses_its_result(isolated_nav_store):
+    outcome = []
+    lock = isolated_nav_store.refresh_lock("000001")
+    lock.acquire()
+
+    def waiting_worker():
+        outcome.append(refresh_fund_nav("000001"))
+
+    with patch(
+        "akshare.fund_open_fund_info_em", side_effect=AssertionError
+    ) as upstream:
+        thread = threading.Thread(target=waiting_worker)
+        thread.start()
+        time.sleep(0.1)
+        _publish_from_other_worker(isolated_nav_store.path, "000001")
+        lock.release()
+        thread.join(timeout=5)
+
+    upstream.assert_not_called()
+    assert outcome == [0]
+
+
+def test_fund_list_refreshed_by_one_worker_is_adopted_by_the_others(tmp_path):
+    path = tmp_path / "fund_list.csv"
+    with patch("akshare.fund_name_em", return_value=mock_fund_name_em()):
+        FundListCache(path, ttl_seconds=3600, fetch=fetch_fund_list).get()
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    first = FundListCache(path, ttl_seconds=3600, fetch=fetch_fund_list)
+    second = FundListCache(path, ttl_seconds=3600, fetch=fetch_fund_list)
+    first.get()
+    second.get()
+
+    renamed = mock_fund_name_em()
+    renamed.loc[0, "基金简称"] = "Fund A2"
+    with patch("akshare.fund_name_em", return_value=renamed) as upstream:
+        first.refresh()
+        adopted = second.get()
+
+    assert upstream.call_count == 1
+    assert adopted.loc["000001", "基金简称"] == "Fund A2"
+
+
+def test_fund_list_refresh_waiting_on_another_worker_skips_upstream(tmp_path):
+    path = tmp_path / "fund_list.csv"
+    cache = FundListCache(path, ttl_seconds=3600, fetch=fetch_fund_list)
+    results = []
+    other_worker = FileLock(f"{path}.lock")
+    other_worker.acquire()
+
+    with patch("akshare.fund_name_em", side_effect=AssertionError) as upstream:
+        thread = threading.Thread(target=lambda: results.append(cache.refresh()))
+        thread.start()
+        time.sleep(0.1)
+        mock_fund_name_em().to_csv(path, index=False)
+        other_worker.release()
+        thread.join(timeout=5)
+
+    upstream.assert_not_called()
+    assert results[0].loc["000002", "基金简称"] == "Fund B"
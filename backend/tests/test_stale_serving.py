@@ -0,0 +1,141 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+import core.data
+from core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from core.data import get_fund_data, load_fund_nav
+from core.providers import AkshareProvider, FundDataError
+from core.trading_calendar import CN_TZ
+
+from .mock_data import mock_fund_name_em, mock_fund_open_fund_info_em
+
+
+def _seed_store(store, code, checked_days_ago):
+    nav = mock_fund_open_fund_info_em(code, "单位净值走势")
+    series = nav.set_index("净值日期")["单位净值"].astype(float)
+    checked_at = datetime.now(CN_TZ) - timedelta(days=checked_days_ago)
+    store.append(code, series, checked_at=checked_at)
+    return checked_at
+
+
+def test_slightly_stale_nav_is_served_and_revalidated_in_background(
+    isolated_nav_store,
+):
+    seeded_at = _seed_store(isolated_nav_store, "000001", checked_days_ago=3)
+    # Hold the background refresh until the response is built, otherwise it
+    # can land before the stale warning is computed.
+    response_built = threading.Event()
+
+    def _slow_upstream(symbol, indicator):
+        response_built.wait(5)
+        return mock_fund_open_fund_info_em(symbol, indicator)
+
+    with (
+        patch("akshare.fund_name_em", return_value=mock_fund_name_em()),
+        patch("akshare.fund_open_fund_info_em", side_effect=_slow_upstream) as upstream,
+    ):
+        df, _, warnings = get_fund_data(["000001"], None, None, None)
+        response_built.set()
+        assert not df.empty
+        assert any("000001" in warning and "缓存" in warning for warning in warnings)
+
+        # Wait for the revalidation to finish, not just to write, so its
+        # thread never outlives the mocks into the next test.
+        deadline = time.time() + 5
+        while (
+            isolated_nav_store.checked_at("000001") == seeded_at
+            or "000001" in core.data._REVALIDATING_CODES
+        ):
+            assert time.time() < deadline
+            time.sleep(0.01)
+
+    assert upstream.call_count == 1
+
+
+def test_very_stale_nav_is_still_served_when_refresh_fails(isolated_nav_store):
+    seeded_at = _seed_store(isolated_nav_store, "000001", checked_days_ago=30)
+
+    with (
+        patch("akshare.fund_open_fund_info_em", side_effect=ConnectionError("down")),
+    ):
+        nav = load_fund_nav("000001")
+
+    assert not nav.empty
+    assert isolated_nav_store.checked_at("000001") == seeded_at
+
+
+def test_open_circuit_fails_fast_without_calling_upstream(upstream_breakers):
+    with (
+        patch(
+            "akshare.fund_open_fund_info_em", side_effect=ConnectionError("down")
+        ) as upstream,
+    ):
+        for _ in range(upstream_breakers.failure_threshold):
+            with pytest.raises(ConnectionError):
+                core.data.fetch_fund_nav("000001")
+        calls_before_open = upstream.call_count
+
+        with pytest.raises(CircuitOpenError):
+            core.data.fetch_fund_nav("000001")
+
+    assert upstream_breakers.states() == {AkshareProvider.nav_host: "open"}
+    assert upstream.call_count == calls_before_open
+
+
+def test_unknown_codes_do_not_open_the_circuit(upstream_breakers):
+    codes = ["999991", "999992", "999993", "999994"]
+    with (
+        patch("akshare.fund_open_fund_info_em", return_value=pd.DataFrame()) as empty,
+    ):
+        for code in codes:
+            with pytest.raises(FundDataError):
+                core.data.fetch_fund_nav(code)
+    # An empty answer is final: no retries either.
+    assert empty.call_count == len(codes)
+
+    with (
+        patch(
+            "akshare.fund_open_fund_info_em", side_effect=KeyError("Data_netWorthTrend")
+        ),
+    ):
+        for code in codes:
+            with pytest.raises(FundDataError):
+                core.data.fetch_fund_nav(code)
+
+    assert upstream_breakers.states() == {AkshareProvider.nav_host: "closed"}
+    with patch(
+        "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+    ):
+        assert not core.data.fetch_fund_nav("000001").empty
+
+
+def test_calendar_failures_open_only_the_calendar_circuit(upstream_breakers):
+    with patch(
+        "akshare.tool_trade_date_hist_sina", side_effect=ConnectionError("down")
+    ):
+        for _ in range(upstream_breakers.failure_threshold):
+            assert core.data.refresh_trading_calendar() is False
+
+    assert upstream_breakers.get(AkshareProvider.calendar_host).state == "open"
+    with patch(
+        "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+    ):
+        assert not core.data.fetch_fund_nav("000001").empty
+    assert upstream_breakers.get(AkshareProvider.nav_host).state == "closed"
+
+
+def test_half_open_circuit_closes_after_successful_trial():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.01)
+    with pytest.raises(ValueError):
+        breaker.call(lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert breaker.state == "open"
+
+    time.sleep(0.02)
+    assert breaker.state == "half_open"
+    assert breaker.call(lambda: 42) == 42
+    assert breaker.state == "closed"
@@ -0,0 +1,244 @@
+import asyncio
+from multiprocessing.shared_memory import SharedMemory
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import core.sweep
+from core.backtest import SCENARIO_PARAMETERS, backtest_kelly_dca_batch
+from core.sweep import SweepPool, expand_sweep_grid, sweep_values
+from main import app
+
+from .mock_data import mock_fund_name_em, mock_fund_open_fund_info_em
+from .test_backtest_kernel import MIXED_WEIGHTS, _panel
+
+client = TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = SweepPool(workers=2, min_chunk=1)
+    yield pool
+    pool.close()
+
+
+def test_sweep_values_from_lists_and_ranges():
+    assert sweep_values("kelly_fraction", [0.5, 0.25, 0.5]) == [0.5, 0.25]
+    assert sweep_values("min_weight", {"start": 0.1, "stop": 0.3, "step": 0.1}) == [
+        0.1,
+        0.2,
+        0.3,
+    ]
+    assert sweep_values("ma_window", {"start": 3, "stop": 10, "step": 3}) == [
+        3.0,
+        6.0,
+        9.0,
+    ]
+
+
+@pytest.mark.parametrize(
+    "name, spec",
+    [
+        ("kelly_fraction", []),
+        ("kelly_fraction", {"start": 0.5, "stop": 0.1, "step": 0.1}),
+        ("kelly_fraction", {"start": 0.1, "stop": 0.5, "step": 0}),
+        ("ma_window", [3, 4.5]),
+    ],
+)
+def test_sweep_values_rejects_bad_specs(name, spec):
+    with pytest.raises(HTTPException) as error:
+        sweep_values(name, spec)
+    assert error.value.status_code == 400
+
+
+def test_expand_sweep_grid_keeps_base_for_unswept_parameters():
+    names, scenarios = expand_sweep_grid(
+        {"ma_window": [6, 12], "kelly_fraction": [0.25, 0.5, 1.0]},
+        dict(SCENARIO_PARAMETERS),
+    )
+
+    assert names == ["kelly_fraction", "ma_window"]
+    assert len(scenarios) == 6
+    assert scenarios[1] == {
+        **SCENARIO_PARAMETERS,
+        "kelly_fraction": 0.25,
+        "ma_window": 12,
+    }
+
+
+def test_expand_sweep_grid_rejects_unknown_and_oversized_grids():
+    with pytest.raises(HTTPException) as unknown:
+        expand_sweep_grid({"estimation_window": [12, 24]}, dict(SCENARIO_PARAMETERS))
+    assert unknown.value.status_code == 400
+
+    with patch("core.sweep.SWEEP_MAX_COMBINATIONS", 5):
+        with pytest.raises(HTTPException) as oversized:
+            expand_sweep_grid(
+                {"kelly_fraction": [0.1, 0.2, 0.3], "ma_window": [3, 6]},
+                dict(SCENARIO_PARAMETERS),
+            )
+    assert oversized.value.status_code == 400
+
+
+def test_pool_matches_a_single_batch(pool):
+    df_nav = _panel()
+    _, scenarios = expand_sweep_grid(
+        {"kelly_fraction": [0.25, 1.0], "min_weight": [0.0, 0.3], "ma_window": [3, 12]},
+        dict(SCENARIO_PARAMETERS),
+    )
+
+    rows = asyncio.run(
+        pool.run_async(df_nav, MIXED_WEIGHTS, 1000.0, scenarios, sell_fee={"F1": 0.005})
+    )
+
+    assert len(pool.chunks(scenarios)) == 2
+    assert rows == backtest_kelly_dca_batch(
+        df_nav, MIXED_WEIGHTS, 1000.0, scenarios, sell_fee={"F1": 0.005}
+    )
+
+
+def test_worker_errors_come_back_as_value_errors_and_keep_the_pool(pool):
+    df_nav = _panel()
+    _, scenarios = expand_sweep_grid(
+        {"kelly_fraction": [0.25, 1.0]}, dict(SCENARIO_PARAMETERS)
+    )
+
+    with pytest.raises(ValueError, match="outside the current analysis universe"):
+        asyncio.run(pool.run_async(df_nav, {"XX": 1.0}, 1000.0, scenarios))
+    executor = pool._executor
+
+    rows = asyncio.run(pool.run_async(df_nav, MIXED_WEIGHTS, 1000.0, scenarios))
+    assert len(rows) == 2
+    assert pool._executor is executor
+
+
+def test_cancelled_sweep_keeps_the_panel_until_started_chunks_finish(monkeypatch):
+    pool = SweepPool(workers=1, min_chunk=1)
+    executor = pool._get_executor()
+    submitted = []
+
+    class _RecordingExecutor:
+        def submit(self, *args):
+            future = executor.submit(*args)
+            submitted.append((args[1][0], future))
+            return future
+
+    monkeypatch.setattr(pool, "_get_executor", _RecordingExecutor)
+    # One scenario per chunk, so most are still queued when the sweep stops.
+    monkeypatch.setattr(pool, "chunks", lambda scenarios: [[s] for s in scenarios])
+    _, scenarios = expand_sweep_grid(
+        {"kelly_fraction": [0.1 * step for step in range(1, 9)]},
+        dict(SCENARIO_PARAMETERS),
+    )
+
+    async def cancel_part_way():
+        task = asyncio.create_task(
+            pool.run_async(_panel(months=120), MIXED_WEIGHTS, 1000.0, scenarios)
+        )
+        while not any(future.running() for _, future in submitted):
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    try:
+        asyncio.run(cancel_part_way())
+    finally:
+        pool.close()
+
+    started = [future for _, future in submitted if not future.cancelled()]
+    assert started and len(started) < len(submitted)
+    # Every chunk that reached a worker found the panel and completed.
+    assert all(future.done() and future.exception() is None for future in started)
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=submitted[0][0])
+
+
+def test_sweep_endpoint_returns_one_row_per_combination(pool, monkeypatch):
+    monkeypatch.setattr(core.sweep, "SWEEP_POOL", pool)
+    request_data = {
+        "fund_codes": ["000001", "000002"],
+        "weights": {"000001": 0.6, "000002": 0.4},
+        "fund_fees": {"000001": 0.015, "000002": 0.01},
+        "start_date": "2023-01-15",
+        "end_date": "2023-03-15",
+        "monthly_investment": 1000,
+        "risk_free_rate": 0.02,
+        "sweep": {
+            "kelly_fraction": [0.25, 0.5],
+            "max_weight": {"start": 0.6, "stop": 1.0, "step": 0.2},
+        },
+    }
+    with (
+        patch("akshare.fund_name_em", return_value=mock_fund_name_em()),
+        patch(
+            "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+        ),
+    ):
+        response = client.post("/api/sweep", json=request_data)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["combinations"] == 6
+    assert data["total_invested"] > 0
+    assert data["columns"] == [
+        "kelly_fraction",
+        "max_weight",
+        "annualized_return",
+        "max_drawdown",
+        "final_value",
+        "volatility",
+    ]
+    assert [row[:2] for row in data["rows"]] == [
+        [0.25, 0.6],
+        [0.25, 0.8],
+        [0.25, 1.0],
+        [0.5, 0.6],
+        [0.5, 0.8],
+        [0.5, 1.0],
+    ]
+    assert all(row[4] > 0 for row in data["rows"])
+
+
+def test_sweep_endpoint_rejects_weights_outside_the_funds(pool, monkeypatch):
+    monkeypatch.setattr(core.sweep, "SWEEP_POOL", pool)
+    request_data = {
+        "fund_codes": ["000001"],
+        "weights": {"000001": 0.6, "000009": 0.4},
+        "fund_fees": {},
+        "start_date": "2023-01-15",
+        "end_date": "2023-03-15",
+        "monthly_investment": 1000,
+        "sweep": {"kelly_fraction": [0.25, 0.5]},
+    }
+    with (
+        patch("akshare.fund_name_em", return_value=mock_fund_name_em()),
+        patch(
+            "akshare.fund_open_fund_info_em", side_effect=mock_fund_open_fund_info_em
+        ),
+    ):
+        response = client.post("/api/sweep", json=request_data)
+        assert response.status_code == 400
+        assert "000009" in response.json()["detail"]
+
+        request_data["weights"] = {"000001": 1.0}
+        assert client.post("/api/sweep", json=request_data).status_code == 200
+
+
+def test_sweep_endpoint_rejects_invalid_combinations_before_fetching():
+    request_data = {
+        "fund_codes": ["000001"],
+        "weights": {"000001": 1.0},
+        "fund_fees": {},
+        "start_date": "2023-01-15",
+        "end_date": "2023-03-15",
+        "monthly_investment": 1000,
+        "sweep": {"min_weight": [0.2, 0.9], "max_weight": [0.5]},
+    }
+    with patch("api.routes.get_fund_data_async") as fetch:
+        response = client.post("/api/sweep", json=request_data)
+
+    assert response.status_code == 400
+    fetch.assert_not_called()
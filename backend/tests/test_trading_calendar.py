@@ -0,0 +1,69 @@
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from core.trading_calendar import (
+    CN_TZ,
+    NavFreshnessPolicy,
+    TradingCalendar,
+    load_trading_calendar,
+    save_trading_calendar,
+)
+
+
+def _cn(*args):
+    return datetime(*args, tzinfo=CN_TZ)
+
+
+# 2024-10-01..07 is the National Day holiday; 2024-09-29 and 2024-10-12 are
+# make-up workdays but exchanges stay closed on weekends.
+TRADE_DATES = [
+    d.date()
+    for d in pd.bdate_range("2024-09-02", "2024-10-31")
+    if not (date(2024, 10, 1) <= d.date() <= date(2024, 10, 7))
+]
+
+
+def test_latest_publishable_date_respects_publish_window_and_holidays():
+    policy = NavFreshnessPolicy(TradingCalendar(TRADE_DATES))
+
+    assert policy.latest_publishable_date(_cn(2024, 9, 30, 17, 0)) == date(2024, 9, 27)
+    assert policy.latest_publishable_date(_cn(2024, 9, 30, 19, 0)) == date(2024, 9, 30)
+    assert policy.latest_publishable_date(_cn(2024, 10, 5, 21, 0)) == date(2024, 9, 30)
+    assert policy.latest_publishable_date(_cn(2024, 10, 8, 9, 0)) == date(2024, 9, 30)
+
+
+def test_series_holding_latest_nav_stays_fresh_through_holiday():
+    policy = NavFreshnessPolicy(TradingCalendar(TRADE_DATES))
+    checked_at = _cn(2024, 9, 30, 23, 40)
+
+    for day in range(1, 8):
+        assert policy.is_fresh(date(2024, 9, 30), checked_at, _cn(2024, 10, day, 20))
+    assert not policy.is_fresh(date(2024, 9, 30), checked_at, _cn(2024, 10, 8, 23, 45))
+
+
+def test_publish_window_rechecks_on_interval_then_waits_for_next_day():
+    policy = NavFreshnessPolicy(
+        TradingCalendar(), recheck_interval=timedelta(minutes=30)
+    )
+    friday = date(2024, 9, 27)
+    monday_evening = _cn(2024, 9, 30, 19, 0)
+
+    assert policy.is_fresh(friday, _cn(2024, 9, 30, 18, 45), monday_evening)
+    assert not policy.is_fresh(friday, _cn(2024, 9, 30, 18, 15), monday_evening)
+    # Checked after the window closed without a new NAV: no refetch until
+    # Tuesday's window opens.
+    assert policy.is_fresh(friday, _cn(2024, 9, 30, 23, 45), _cn(2024, 10, 1, 12))
+    assert not policy.is_fresh(friday, None, monday_evening)
+
+
+def test_weekday_fallback_and_snapshot_round_trip(tmp_path):
+    fallback = TradingCalendar()
+    assert fallback.is_trading_day(date(2024, 10, 1))
+    assert not fallback.is_trading_day(date(2024, 10, 5))
+
+    path = str(tmp_path / "trade_dates.csv")
+    save_trading_calendar(TRADE_DATES, path)
+    calendar = load_trading_calendar(path)
+    assert not calendar.is_trading_day(date(2024, 10, 1))
+    assert calendar.previous_trading_day(date(2024, 10, 6)) == date(2024, 9, 30)